@@ -0,0 +1,210 @@
+"""
+Buffered User Activity Logging for Smart Grocery Tracker
+
+Writing a UserActivityLog row inside the request path serializes page views
+on the database write lock.  This module queues activity events in memory
+and a background thread writes them with bulk_create once a batch fills up
+or the flush interval elapses.  The queue is bounded; when it is full the
+configured drop policy decides which event is discarded.
+
+Events still queued at interpreter exit are written by an atexit hook, but
+only to the database they were queued for: by then Django may have torn
+that connection down (the test runner destroys its test database first),
+and a reconnect would write them somewhere else.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('grocery_app')
+
+DEFAULT_BUFFER_SETTINGS = {
+    'ENABLED': True,
+    'MAX_QUEUE_SIZE': 10000,
+    'BATCH_SIZE': 100,
+    'FLUSH_INTERVAL': 2.0,
+    'DROP_POLICY': 'drop_oldest',  # or 'drop_newest'
+}
+
+
+class ActivityLogBuffer:
+    """
+    Bounded in-process queue of UserActivityLog rows flushed by a background thread
+    """
+
+    def __init__(self, max_queue_size=10000, batch_size=100, flush_interval=2.0, drop_policy='drop_oldest'):
+        if drop_policy not in ('drop_oldest', 'drop_newest'):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.drop_policy = drop_policy
+        self.dropped_count = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        # Database the queued events belong to (settings NAME at first enqueue)
+        self.database = None
+
+    def enqueue(self, entry):
+        """Queue an unsaved UserActivityLog instance for writing"""
+        if self.database is None:
+            self.database = connection.settings_dict.get('NAME')
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            if self.drop_policy == 'drop_newest':
+                self._record_drop()
+                return
+            try:
+                self._queue.get_nowait()
+                self._record_drop()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self._record_drop()
+
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def _record_drop(self):
+        """Count a discarded event, logging occasionally"""
+        self.dropped_count += 1
+        if self.dropped_count == 1 or self.dropped_count % 1000 == 0:
+            logger.warning(f"Activity log buffer full, dropped {self.dropped_count} events so far")
+
+    def flush(self):
+        """Write every queued event now; returns the number of rows written"""
+        from .models import UserActivityLog
+
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    break
+                try:
+                    UserActivityLog.objects.bulk_create(batch)
+                    written += len(batch)
+                except Exception as e:
+                    logger.error(f"Error writing {len(batch)} activity log entries: {e}")
+        return written
+
+    def _ensure_worker(self):
+        """Start the flush thread lazily, and again in forked worker processes"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Background loop: flush on batch size or time threshold"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            try:
+                self.flush()
+            finally:
+                # Don't hold a database connection between flushes
+                connection.close()
+
+    def stop(self, timeout=5.0):
+        """Stop the flush thread after its current flush (queued events stay queued)"""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread() and thread.is_alive():
+            thread.join(timeout)
+        self._thread = None
+        self._stopping = False
+
+    def pending(self):
+        """Number of queued events"""
+        return self._queue.qsize()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_activity_buffer():
+    """Get the process-wide activity log buffer, or None when buffering is disabled"""
+    global _buffer
+    options = {**DEFAULT_BUFFER_SETTINGS, **getattr(settings, 'ACTIVITY_LOG_BUFFER', {})}
+    if not options['ENABLED']:
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ActivityLogBuffer(
+                    max_queue_size=options['MAX_QUEUE_SIZE'],
+                    batch_size=options['BATCH_SIZE'],
+                    flush_interval=options['FLUSH_INTERVAL'],
+                    drop_policy=options['DROP_POLICY'],
+                )
+    return _buffer
+
+
+def log_activity(user, action, description='', ip_address=None, user_agent='', metadata=None):
+    """
+    Record a user activity without blocking the request on a database write
+
+    Falls back to a synchronous insert when buffering is disabled.
+    """
+    from .models import UserActivityLog
+
+    entry = UserActivityLog(
+        user=user,
+        action=action,
+        description=description,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        metadata=metadata if metadata is not None else {},
+    )
+
+    buffer = get_activity_buffer()
+    if buffer is None:
+        entry.save()
+    else:
+        buffer.enqueue(entry)
+
+
+@atexit.register
+def flush_activity_buffer():
+    """Write any queued events on interpreter shutdown, if their database is still the configured one"""
+    if _buffer is None:
+        return
+    _buffer.stop()
+    if not _buffer.pending():
+        return
+    if connection.settings_dict.get('NAME') != _buffer.database:
+        logger.warning(f"Discarding {_buffer.pending()} activity log entries queued for a database "
+                       f"that is no longer configured")
+        return
+    try:
+        _buffer.flush()
+    except Exception as e:
+        logger.error(f"Error flushing activity log buffer on shutdown: {e}")
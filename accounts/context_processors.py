@@ -33,19 +33,11 @@ def user_context(request):
             mongo_manager = MongoDBUserManager()
             user_stats = mongo_manager.get_user_data_stats(str(request.user.id))
             
-            # Get quick stats for navbar badges
-            from grocery_app.django_models import GroceryItemManager
+            # Get quick stats for navbar badges (cached, invalidated on every write)
+            from grocery_app.alerts import cached_badge_counts
             
-            # For now, get all items (will be filtered by user later)
-            all_items = GroceryItemManager.get_all()
-            expiring_items = GroceryItemManager.get_expiring_items(days=3)
-            low_stock_items = GroceryItemManager.get_low_stock_items(threshold=5)
-            
-            context.update({
-                'expiring_count': len(expiring_items),
-                'low_stock_count': len(low_stock_items),
-                'total_items_count': len(all_items),
-            })
+            # Read from the precomputed alerts (user's EssentialSettings thresholds)
+            context.update(cached_badge_counts(request.user))
             
         except Exception as e:
             logger.error(f"Error in user context processor: {e}")
@@ -72,8 +64,14 @@ def app_context(request):
     """
     Add application-wide context data
     """
+    from django.core.handlers.asgi import ASGIRequest
+    from grocery_app.events import event_settings
+
     return {
         'app_name': 'Smart Grocery Tracker',
         'app_version': '1.0.0',
         'support_email': 'support@smartgrocery.com',
+        # Live updates stream only under ASGI; WSGI pages poll the badge counters
+        'live_updates': 'stream' if isinstance(request, ASGIRequest) else 'poll',
+        'live_updates_poll_ms': event_settings()['poll_seconds'] * 1000,
     }
@@ -8,7 +8,7 @@ import logging
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib.auth.models import AnonymousUser
-from .models import UserActivityLog
+from .activity import log_activity
 
 logger = logging.getLogger('grocery_app')
 
@@ -62,7 +62,7 @@ class UserDataFilterMiddleware:
                 ]
                 
                 if any(request.path.startswith(path) for path in important_paths):
-                    UserActivityLog.objects.create(
+                    log_activity(
                         user=request.user,
                         action='page_visit',
                         description=f'Visited {request.path}',
@@ -145,8 +145,12 @@ class SecurityMiddleware:
         
         # Add user-specific cache control
         if hasattr(request, 'user') and request.user.is_authenticated:
-            response['Cache-Control'] = 'private, no-cache, no-store, must-revalidate'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
+            if response.has_header('ETag') and response.status_code in (200, 304):
+                # Keep a private copy but revalidate it on every use (conditional GET)
+                response['Cache-Control'] = 'private, no-cache'
+            else:
+                response['Cache-Control'] = 'private, no-cache, no-store, must-revalidate'
+                response['Pragma'] = 'no-cache'
+                response['Expires'] = '0'
         
         return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_usersettings_user_essentialsettings_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useractivitylog',
+            name='action',
+            field=models.CharField(choices=[('login', 'User Login'), ('logout', 'User Logout'), ('item_added', 'Item Added'), ('item_updated', 'Item Updated'), ('item_deleted', 'Item Deleted'), ('items_imported', 'Items Imported'), ('profile_updated', 'Profile Updated'), ('list_shared', 'List Shared'), ('export_data', 'Data Exported')], max_length=20),
+        ),
+    ]
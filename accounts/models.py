@@ -276,8 +276,12 @@ class MongoDBUserManager:
         """Establish MongoDB connection"""
         try:
             if pymongo and MONGODB_SETTINGS:
-                connection_string = f"mongodb://{MONGODB_SETTINGS['host']}:{MONGODB_SETTINGS['port']}/"
-                self.client = pymongo.MongoClient(connection_string)
+                # Shared process-wide client; instantiating the manager per request is cheap
+                from grocery_app import mongo_pool
+                client = mongo_pool.get_client(mongo_pool.build_connection_string(MONGODB_SETTINGS))
+                # Raises at once while MongoDB is marked down, so page renders don't wait on it
+                mongo_pool.ensure_available(client)
+                self.client = client
                 self.db = self.client[MONGODB_SETTINGS['db_name']]
                 logger.info("MongoDB connection established for user operations")
             else:
@@ -290,13 +294,16 @@ class MongoDBUserManager:
         Create user-specific collections and indexes
         """
         try:
-            if not self.db:
+            if self.db is None:
                 logger.warning("MongoDB not connected, skipping collection creation")
                 return False
 
+            # grocery_items carries the compound per-user and text indexes
+            from grocery_app.models import GroceryItem as MongoGroceryItem
+            MongoGroceryItem.ensure_indexes(self.db[MongoGroceryItem.COLLECTION_NAME])
+
             # Create indexes for user-specific collections
             collections = [
-                'grocery_items',
                 'user_preferences',
                 'activity_logs',
                 'shared_lists'
@@ -319,6 +326,9 @@ class MongoDBUserManager:
         Get statistics about user's data
         """
         try:
+            if self.db is None:
+                return {}
+
             stats = {}
             
             # Count grocery items
@@ -341,6 +351,10 @@ class MongoDBUserManager:
         Clean up user data when account is deleted
         """
         try:
+            if self.db is None:
+                logger.warning("MongoDB not connected, skipping user data cleanup")
+                return False
+
             collections = ['grocery_items', 'user_preferences', 'activity_logs', 'shared_lists']
             
             for collection_name in collections:
@@ -365,6 +379,7 @@ class UserActivityLog(models.Model):
         ('item_added', 'Item Added'),
         ('item_updated', 'Item Updated'),
         ('item_deleted', 'Item Deleted'),
+        ('items_imported', 'Items Imported'),
         ('profile_updated', 'Profile Updated'),
         ('list_shared', 'List Shared'),
         ('export_data', 'Data Exported'),
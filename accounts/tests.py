@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from . import activity
+from .activity import ActivityLogBuffer, get_activity_buffer, log_activity
+from .models import UserActivityLog
+
+
+class ActivityLogBufferTests(TestCase):
+    """Queued activity events are batched, bounded and never written to the wrong database"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('shopper')
+        self.buffer = ActivityLogBuffer(max_queue_size=2, batch_size=10, flush_interval=60)
+        self.addCleanup(self.buffer.stop)
+
+    def entry(self, description):
+        return UserActivityLog(user=self.user, action='login', description=description, metadata={})
+
+    def test_full_queue_drops_oldest(self):
+        for description in ('first', 'second', 'third'):
+            self.buffer.enqueue(self.entry(description))
+        self.assertEqual(self.buffer.dropped_count, 1)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(sorted(UserActivityLog.objects.values_list('description', flat=True)), ['second', 'third'])
+
+    def test_tests_write_synchronously(self):
+        self.assertIsNone(get_activity_buffer())
+        log_activity(self.user, 'login', 'direct')
+        self.assertTrue(UserActivityLog.objects.filter(description='direct').exists())
+
+    def test_shutdown_flush_skips_other_database(self):
+        self.buffer.enqueue(self.entry('queued'))
+        self.buffer.database = 'torn-down-test-database'
+        with mock.patch.object(activity, '_buffer', self.buffer):
+            activity.flush_activity_buffer()
+        self.assertEqual(self.buffer.pending(), 1)
+        self.assertFalse(UserActivityLog.objects.filter(description='queued').exists())
@@ -21,6 +21,7 @@ import json
 import logging
 
 from .models import UserProfile, MongoDBUserManager, UserActivityLog, EssentialSettings
+from .activity import log_activity
 from .forms import (
     UserRegistrationForm, UserProfileForm, LoginForm, PasswordChangeForm,
     EssentialSettingsForm, UserUpdateForm, ComprehensiveProfileForm
@@ -55,7 +56,7 @@ def login_view(request):
                     request.session.set_expiry(0)  # Browser session
                 
                 # Log the activity
-                UserActivityLog.objects.create(
+                log_activity(
                     user=user,
                     action='login',
                     description='User logged in',
@@ -97,7 +98,7 @@ def register_view(request):
                 mongo_manager.create_user_collections(str(user.id))
                 
                 # Log the activity
-                UserActivityLog.objects.create(
+                log_activity(
                     user=user,
                     action='register',
                     description='User registered',
@@ -127,7 +128,7 @@ def logout_view(request):
     user_name = request.user.first_name or request.user.username
 
     # Log the activity
-    UserActivityLog.objects.create(
+    log_activity(
         user=request.user,
         action='logout',
         description='User logged out',
@@ -182,7 +183,7 @@ def profile_view(request):
             profile_form.save()
 
             # Log the activity
-            UserActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='profile_updated',
                 description='Profile information updated',
@@ -236,23 +237,23 @@ def user_dashboard(request):
     ).order_by('-timestamp')[:10]
     
     # Get user-specific grocery data (this will be enhanced with MongoDB integration)
-    from grocery_app.django_models import GroceryItemManager
+    from grocery_app.alerts import EXPIRING, LOW_STOCK, alert_items
+    from grocery_app.inventory import get_inventory_snapshot
     
     # For now, get all items (will be filtered by user later)
-    all_items = GroceryItemManager.get_all()
-    expiring_items = GroceryItemManager.get_expiring_items(days=profile.expiry_reminder_days)
-    low_stock_items = GroceryItemManager.get_low_stock_items(threshold=5)
+    inventory = get_inventory_snapshot(request)
+    expiring_items = alert_items(request.user, EXPIRING)
+    low_stock_items = alert_items(request.user, [LOW_STOCK])
     
-    # Calculate user-specific statistics using improved calculation
-    from grocery_app.utils import calculate_inventory_statistics
-    inventory_stats = calculate_inventory_statistics(all_items)
+    # Calculate user-specific statistics
+    inventory_stats = inventory.statistics()
 
     dashboard_stats = {
-        'total_items': len(all_items),
+        'total_items': inventory.count(),
         'expiring_soon': len(expiring_items),
         'low_stock': len(low_stock_items),
         'total_value': inventory_stats['active_value'],  # Only count active inventory
-        'categories_count': len(set(item.get('category') for item in all_items)),
+        'categories_count': len(inventory.categories_stats()),
     }
     
     context = {
@@ -335,7 +336,7 @@ def password_change_view(request):
             form.save()
 
             # Log the activity
-            UserActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='password_changed',
                 description='User changed password',
@@ -369,7 +370,7 @@ def session_extend_view(request):
             request.session.set_expiry(1800)  # 30 minutes
 
             # Log the activity
-            UserActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='session_extended',
                 description='User extended session',
@@ -448,7 +449,7 @@ def essential_settings(request):
             form.save()
 
             # Log the activity
-            UserActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='settings_updated',
                 description='Essential settings updated',
@@ -590,7 +591,7 @@ def comprehensive_profile(request):
             form.save()
 
             # Log the activity
-            UserActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='profile_updated',
                 description='Profile information updated',
@@ -0,0 +1,79 @@
+"""
+Background alert scanner for Smart Grocery Tracker
+
+AlertScanner rescans every alert threshold set in use (alerts.scan_all) now
+and then at each scan window boundary, including local midnight.  Run it as
+its own process with ``manage.py scan_alerts --loop``.  A single-process
+server can instead run it as a daemon thread by turning on
+INVENTORY_ALERT_SCANNER['autostart']; the WSGI/ASGI entry points call
+start_scanner().  Leave autostart off with several worker processes: each
+would start its own scanner.
+
+This module only imports the alerts module (and with it the models) when a
+scan runs, so the entry points can import it before Django is set up.
+"""
+
+from typing import Optional
+import logging
+import threading
+
+logger = logging.getLogger('grocery_app')
+
+
+class AlertScanner:
+    """
+    Daemon thread rescanning every threshold set's alerts at each scan window boundary
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the scanner thread (no-op when already running)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='inventory-alert-scanner', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask the scanner to stop and wait for it"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_forever(self) -> None:
+        """Scan now, then at every window boundary until stopped"""
+        from django.db import close_old_connections
+        from django.utils import timezone
+
+        from .alerts import next_scan_at, scan_all
+
+        while not self._stop.is_set():
+            try:
+                close_old_connections()
+                scan_all()
+            except Exception as e:
+                logger.error(f"Error scanning inventory alerts: {e}")
+            finally:
+                close_old_connections()
+            delay = (next_scan_at() - timezone.now()).total_seconds()
+            self._stop.wait(max(delay, 1))
+
+
+scanner = AlertScanner()
+
+
+def start_scanner() -> bool:
+    """Start the in-process scanner if settings allow it; returns whether it runs"""
+    from .alerts import scanner_settings
+
+    if not scanner_settings()['autostart']:
+        return False
+    scanner.start()
+    return True
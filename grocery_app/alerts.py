@@ -0,0 +1,309 @@
+"""
+Precomputed inventory alerts for Smart Grocery Tracker
+
+Expiring, low-stock and stale items used to be detected on demand by every
+page and API that shows them.  Instead, the alerts are written to the
+InventoryAlert table.  The Django inventory is shared, so a user's alerts
+depend only on their EssentialSettings thresholds: alerts are stored once
+per threshold set (InventoryAlertScan) and every user with those
+thresholds reads the same rows.  Views read the table with a single query.
+
+A scan is current for a *stamp*: the inventory version and the scan window
+(the day, split into windows of interval_seconds starting at local
+midnight).  Stamps are kept on the InventoryAlertScan row, so every process
+sees them.  Readers check the stamp and rescan their threshold set when it
+is out of date: after an inventory write, at a window boundary, or for a
+threshold set nobody has used yet.  AlertScanner rescans every threshold set
+in use at each window boundary, so items turn "expiring" at midnight without
+a request having to compute it (see alert_scanner.py).
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import rollups
+from .django_models import GroceryItem, InventoryAlert, InventoryAlertScan
+from .inventory_cache import get_badge_counts, get_inventory_version
+from .notifications import (
+    DEFAULT_EXPIRY_WARNING_DAYS, DEFAULT_LOW_STOCK_THRESHOLD, LOW_STOCK, STALE, URGENT, WARNING,
+    build_notifications, classify_items, user_thresholds,
+)
+from .serialization import serialize_values
+
+logger = logging.getLogger('grocery_app')
+
+EXPIRING = (URGENT, WARNING)
+ALERT_KINDS = (URGENT, WARNING, LOW_STOCK, STALE)
+
+DEFAULT_THRESHOLDS = (DEFAULT_LOW_STOCK_THRESHOLD, DEFAULT_EXPIRY_WARNING_DAYS)
+
+DEFAULT_SCANNER_SETTINGS = {
+    'interval_seconds': 900,
+    'autostart': False,
+}
+
+Thresholds = Tuple[int, int]
+
+# Serializes scans within the process (requests and the scanner thread)
+_scan_lock = threading.RLock()
+
+
+def scanner_settings() -> Dict[str, Any]:
+    """Alert scanner settings with defaults filled in"""
+    configured = getattr(settings, 'INVENTORY_ALERT_SCANNER', {}) or {}
+    return {**DEFAULT_SCANNER_SETTINGS, **configured}
+
+
+def scan_window(now: Optional[datetime] = None) -> Tuple[str, int]:
+    """(local date, window number within the day) that alerts computed at now belong to"""
+    local = timezone.localtime(now or timezone.now())
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    interval = max(1, scanner_settings()['interval_seconds'])
+    return local.date().isoformat(), int((local - midnight).total_seconds() // interval)
+
+
+def _window_label(now: Optional[datetime] = None) -> str:
+    day, window = scan_window(now)
+    return f"{day}/{window}"
+
+
+def next_scan_at(now: Optional[datetime] = None) -> datetime:
+    """Start of the next scan window (never later than the next local midnight)"""
+    local = timezone.localtime(now or timezone.now())
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    interval = max(1, scanner_settings()['interval_seconds'])
+    _, window = scan_window(now)
+    return min(midnight + timedelta(seconds=(window + 1) * interval), midnight + timedelta(days=1))
+
+
+def alert_stamp(user=None, now: Optional[datetime] = None) -> Tuple[Any, ...]:
+    """Everything besides the inventory version that a user's alerts depend on"""
+    return (*user_thresholds(user), _window_label(now))
+
+
+def alert_vary_on(request) -> Tuple[Any, ...]:
+    """Conditional GET vary_on for responses built from the alerts (see conditional.py)"""
+    return alert_stamp(request.user)
+
+
+def _scan_row(thresholds: Thresholds) -> InventoryAlertScan:
+    """The InventoryAlertScan of a threshold set, created (never scanned) if missing"""
+    lookup = {'low_stock_threshold': thresholds[0], 'expiry_warning_days': thresholds[1]}
+    scan = InventoryAlertScan.objects.filter(**lookup).first()
+    if scan is not None:
+        return scan
+    try:
+        with transaction.atomic():
+            return InventoryAlertScan.objects.create(**lookup)
+    except IntegrityError:
+        # Another process created it first
+        return InventoryAlertScan.objects.get(**lookup)
+
+
+def _store_alerts(scan: InventoryAlertScan, buckets: Dict[str, List[Dict[str, Any]]],
+                  now: datetime) -> Tuple[int, Set[Tuple[int, str]]]:
+    """
+    Replace a threshold set's alert rows with the classified buckets
+
+    Call inside a transaction.
+
+    Returns:
+        (number of rows created, updated or deleted, (item id, kind) of the created rows)
+    """
+    today = timezone.localdate(now)
+    wanted: Dict[Tuple[int, str], Optional[int]] = {}
+    for kind in ALERT_KINDS:
+        for row in buckets[kind]:
+            expiry_date = row['expiry_date']
+            wanted[(row['id'], kind)] = (timezone.localdate(expiry_date) - today).days if expiry_date else None
+
+    existing: Dict[Tuple[int, str], InventoryAlert] = {}
+    stale_ids = []
+    for alert in scan.alerts.only('id', 'item_id', 'kind', 'days_until_expiry'):
+        key = (alert.item_id, alert.kind)
+        if key in wanted:
+            existing[key] = alert
+        else:
+            stale_ids.append(alert.id)
+    created = [
+        InventoryAlert(scan=scan, item_id=item_id, kind=kind, days_until_expiry=days)
+        for (item_id, kind), days in wanted.items() if (item_id, kind) not in existing
+    ]
+    changed = []
+    for key, days in wanted.items():
+        alert = existing.get(key)
+        if alert is not None and alert.days_until_expiry != days:
+            alert.days_until_expiry = days
+            changed.append(alert)
+
+    if stale_ids:
+        InventoryAlert.objects.filter(id__in=stale_ids).delete()
+    if created:
+        # A concurrent scan of the same set may have inserted some of them already
+        InventoryAlert.objects.bulk_create(created, ignore_conflicts=True)
+    if changed:
+        InventoryAlert.objects.bulk_update(changed, ['days_until_expiry'])
+    return len(stale_ids) + len(created) + len(changed), {(alert.item_id, alert.kind) for alert in created}
+
+
+def _user_ids_with(thresholds: Thresholds) -> List[int]:
+    """Active users whose alerts use these thresholds"""
+    from django.contrib.auth.models import User
+
+    match = Q(essentialsettings__low_stock_threshold=thresholds[0],
+              essentialsettings__expiry_warning_days=thresholds[1])
+    if tuple(thresholds) == DEFAULT_THRESHOLDS:
+        match |= Q(essentialsettings__isnull=True)
+    return list(User.objects.filter(match, is_active=True).values_list('id', flat=True))
+
+
+def _publish_new_expiry_alerts(thresholds: Thresholds, buckets: Dict[str, List[Dict[str, Any]]],
+                               created: Set[Tuple[int, str]], now: datetime) -> None:
+    """Push newly raised expiry alerts to the live event streams of the users they apply to"""
+    from . import events
+
+    new = {kind: [row for row in buckets[kind] if (row['id'], kind) in created] for kind in EXPIRING}
+    if not any(new.values()):
+        return
+    notifications = build_notifications({**new, LOW_STOCK: [], STALE: []}, now)
+    for user_id in _user_ids_with(thresholds):
+        for notification in notifications:
+            transaction.on_commit(
+                lambda notification=notification, user_id=user_id: events.publish(events.EXPIRY_ALERT, notification, user_id)
+            )
+
+
+def scan_thresholds(thresholds: Thresholds, now: Optional[datetime] = None) -> int:
+    """
+    Recompute the alerts of one threshold set
+
+    Returns:
+        Number of alert rows changed
+    """
+    now = now or timezone.now()
+    with _scan_lock:
+        # Read before classifying: a write during the scan leaves the stamp behind
+        version = get_inventory_version()
+        buckets = classify_items(*thresholds, now)
+        with transaction.atomic():
+            scan = _scan_row(thresholds)
+            changes, created = _store_alerts(scan, buckets, now)
+            scan.inventory_version = version
+            scan.window = _window_label(now)
+            scan.scanned_at = now
+            scan.save(update_fields=['inventory_version', 'window', 'scanned_at'])
+            _publish_new_expiry_alerts(thresholds, buckets, created, now)
+    return changes
+
+
+def scan_user(user=None, now: Optional[datetime] = None) -> int:
+    """Recompute the alerts of a user's threshold set (anonymous/None: the defaults)"""
+    return scan_thresholds(user_thresholds(user), now)
+
+
+def scan_all(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Recompute the alerts of every threshold set in use and drop unused ones
+
+    Returns:
+        Dictionary with users, threshold_sets (one classification query each) and changes
+    """
+    from django.contrib.auth.models import User
+
+    now = now or timezone.now()
+    groups = {DEFAULT_THRESHOLDS}
+    users = 0
+    for low_stock_threshold, expiry_warning_days in User.objects.filter(is_active=True).values_list(
+            'essentialsettings__low_stock_threshold', 'essentialsettings__expiry_warning_days'):
+        users += 1
+        if low_stock_threshold is not None:
+            groups.add((low_stock_threshold, expiry_warning_days))
+
+    changes = sum(scan_thresholds(thresholds, now) for thresholds in sorted(groups))
+
+    in_use = Q()
+    for low_stock_threshold, expiry_warning_days in groups:
+        in_use |= Q(low_stock_threshold=low_stock_threshold, expiry_warning_days=expiry_warning_days)
+    InventoryAlertScan.objects.exclude(in_use).delete()
+
+    logger.info(f"Scanned inventory alerts for {users} users ({len(groups)} threshold sets, {changes} changes)")
+    return {'users': users, 'threshold_sets': len(groups), 'changes': changes}
+
+
+def ensure_alerts(user=None) -> Optional[int]:
+    """
+    Make sure the alerts for the user's thresholds are current, rescanning them if not
+
+    Returns:
+        The InventoryAlertScan id to filter InventoryAlert by (None if it could not be created)
+    """
+    thresholds = user_thresholds(user)
+    scan = InventoryAlertScan.objects.filter(
+        low_stock_threshold=thresholds[0], expiry_warning_days=thresholds[1]
+    ).only('id', 'inventory_version', 'window').first()
+    if scan is None or (scan.inventory_version, scan.window) != (get_inventory_version(), _window_label()):
+        try:
+            scan_thresholds(thresholds)
+            scan = _scan_row(thresholds)
+        except Exception as e:
+            # Serve the previous alerts rather than fail the page
+            logger.error(f"Error refreshing inventory alerts: {e}")
+    return scan.id if scan is not None else None
+
+
+def alert_counts(user=None) -> Dict[str, int]:
+    """Number of alerts per kind, plus 'expiring' (urgent + warning)"""
+    scan_id = ensure_alerts(user)
+    counts = {kind: 0 for kind in ALERT_KINDS}
+    rows = InventoryAlert.objects.filter(scan_id=scan_id).values('kind').annotate(count=Count('id')).order_by()
+    for row in rows:
+        counts[row['kind']] = row['count']
+    counts['expiring'] = counts[URGENT] + counts[WARNING]
+    return counts
+
+
+def alert_items(user=None, kinds: Iterable[str] = EXPIRING, profile: str = 'detail') -> List[Dict[str, Any]]:
+    """Items with an alert of the given kinds, serialized in a serialization profile"""
+    scan_id = ensure_alerts(user)
+    queryset = GroceryItem.objects.filter(alerts__scan_id=scan_id, alerts__kind__in=list(kinds)).distinct()
+    return serialize_values(queryset.order_by('name', 'id'), profile)
+
+
+def alert_buckets(user=None) -> Dict[str, List[Dict[str, Any]]]:
+    """Alerts grouped like notifications.classify_items(), read with one query"""
+    scan_id = ensure_alerts(user)
+    buckets: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in ALERT_KINDS}
+    rows = InventoryAlert.objects.filter(scan_id=scan_id).order_by('item__name', 'item_id').values(
+        'kind', 'item_id', 'item__name', 'item__quantity', 'item__unit', 'item__expiry_date'
+    )
+    for row in rows:
+        buckets[row['kind']].append({
+            'id': row['item_id'],
+            'name': row['item__name'],
+            'quantity': row['item__quantity'],
+            'unit': row['item__unit'],
+            'expiry_date': row['item__expiry_date'],
+        })
+    return buckets
+
+
+def badge_counts(user=None) -> Dict[str, int]:
+    """Navbar badge counters computed from the alerts"""
+    counts = alert_counts(user)
+    return {
+        'expiring_count': counts['expiring'],
+        'low_stock_count': counts[LOW_STOCK],
+        'total_items_count': sum(entry['count'] for entry in rollups.category_stats()),
+    }
+
+
+def cached_badge_counts(user) -> Dict[str, int]:
+    """Navbar badge counters, cached per inventory version and alert stamp"""
+    return get_badge_counts(user.id, lambda: badge_counts(user), vary=alert_stamp(user))
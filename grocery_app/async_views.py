@@ -0,0 +1,290 @@
+"""
+Async views for Smart Grocery Tracker
+
+Async variants of the read-heavy JSON endpoints, for deployments served over
+ASGI (smart_grocery_tracker/asgi.py).  They return the same payloads as
+their counterparts in views.py.
+
+Independent database queries run concurrently with asyncio.gather, so a
+request takes as long as its slowest query rather than the sum of all of
+them.  Django's async ORM methods (acount, aget, async for) all hop onto the
+one thread-sensitive executor and would still run back to back, so each
+independent query instead runs on a small bounded pool of worker threads
+(settings.ASYNC_QUERY_WORKERS).  The pool threads keep their database
+connections between requests: opening and closing a connection per query
+cost more than the overlap saved (on SQLite every open also re-reads the
+schema and takes the file lock again).  A query that fails closes its
+thread's connections so the next one reconnects.  Single sequential reads
+use the async ORM interface directly.
+
+api_events_stream pushes live inventory events (events.py) to the browser
+as server-sent events.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from .django_models import AnalyticsModel, GroceryItemManager
+from . import events, rollups
+from .alerts import alert_items, cached_badge_counts, ensure_alerts
+from .conditional import inventory_condition
+from .json_response import JsonResponse, dumps
+from .pagination import KeysetPage, apaginate_queryset, parse_page_size
+from .notifications import LOW_STOCK, STALE, get_notifications
+from .views import build_suggestions
+
+logger = logging.getLogger('grocery_app')
+
+
+DEFAULT_QUERY_WORKERS = 4
+
+_query_executor = None
+_query_executor_lock = threading.Lock()
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """The process-wide pool of threads that run concurrent queries"""
+    global _query_executor
+    if _query_executor is None:
+        with _query_executor_lock:
+            if _query_executor is None:
+                workers = getattr(settings, 'ASYNC_QUERY_WORKERS', DEFAULT_QUERY_WORKERS)
+                _query_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='async-query')
+    return _query_executor
+
+
+def _on_pool_connection(func: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a query function to reuse the pool thread's connection, dropping it if the query fails"""
+    def run():
+        try:
+            return func()
+        except Exception:
+            connections.close_all()
+            raise
+    return run
+
+
+async def gather_queries(**queries: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    Run independent synchronous query functions concurrently
+
+    Args:
+        queries: name -> zero-argument callable doing the database work
+
+    Returns:
+        name -> result
+    """
+    results = await asyncio.gather(*(
+        sync_to_async(_on_pool_connection(query), thread_sensitive=False, executor=get_query_executor())()
+        for query in queries.values()
+    ))
+    return dict(zip(queries, results))
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def api_search_items_async(request):
+    """
+    Async variant of api_search_items
+    """
+    try:
+        query = request.GET.get('q', '').strip()
+        category = request.GET.get('category', '')
+        limit = parse_page_size(request.GET.get('limit'), default=10)
+
+        if query:
+            # Ranked top matches from the search index
+            items = await sync_to_async(GroceryItemManager.search_items)(query, limit=limit,
+                                                                         category=category or None)
+            page = KeysetPage(items, total_count=len(items) if request.GET.get('with_total') == '1' else None)
+        else:
+            queryset = GroceryItemManager.filter_queryset()
+            if category:
+                queryset = queryset.filter(category__iexact=category)
+
+            page = await apaginate_queryset(
+                queryset,
+                cursor=request.GET.get('cursor'),
+                ordering=('name', 'id'),
+                page_size=limit,
+                with_total=request.GET.get('with_total') == '1'
+            )
+            items = page.object_list
+
+        return JsonResponse({
+            'success': True,
+            'items': items,
+            'count': len(items),
+            'query': query,
+            'pagination': page.to_dict()
+        })
+
+    except Exception as e:
+        logger.error(f"Error in async search API: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+@inventory_condition()
+async def api_analytics_async(request):
+    """
+    Async variant of api_analytics
+    """
+    try:
+        results = await gather_queries(
+            category_stats=rollups.category_stats,
+            spending_analytics=lambda: AnalyticsModel.get_spending_analytics(days=30),
+            expiring_today=lambda: GroceryItemManager.count_expiring_items(days=0),
+            expiring_week=lambda: GroceryItemManager.count_expiring_items(days=7),
+        )
+
+        return JsonResponse({
+            'success': True,
+            'total_items': sum(entry['count'] for entry in results['category_stats']),
+            **results
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting async analytics: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def api_notifications_async(request):
+    """
+    Async variant of api_notifications
+    """
+    try:
+        # A single classification query, so there is nothing to run concurrently
+        payload = await sync_to_async(get_notifications)(request.user)
+        return JsonResponse({'success': True, **payload})
+
+    except Exception as e:
+        logger.error(f"Error getting async notifications: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def api_get_suggestions_async(request):
+    """
+    Async variant of api_get_suggestions
+    """
+    try:
+        user = await request.auser()
+        await sync_to_async(ensure_alerts)(user)
+        results = await gather_queries(
+            low_stock=lambda: alert_items(user, [LOW_STOCK]),
+            stale=lambda: alert_items(user, [STALE]),
+        )
+
+        return JsonResponse({
+            'success': True,
+            'suggestions': build_suggestions(results['low_stock'], results['stale'])
+        })
+
+    except Exception as e:
+        logger.error(f"Error getting async suggestions: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+def _sse(event_type: str, data: Any) -> bytes:
+    """Encode one server-sent event"""
+    return b'event: ' + event_type.encode() + b'\ndata: ' + dumps(data) + b'\n\n'
+
+
+def _current_badges(user) -> Dict[str, int]:
+    """Refresh the user's alerts (publishing newly raised expiry alerts) and read the badge counters"""
+    ensure_alerts(user)
+    return cached_badge_counts(user)
+
+
+async def _event_stream(user, streaming: bool):
+    """
+    Server-sent events for one client
+
+    Subscribes on first iteration, so the subscription belongs to the loop
+    that consumes the response.  Sends the current badge counts, then every
+    item change and expiry alert for the user, followed by the badge-count
+    delta.  Refreshing the alerts after a change raises the expiry alerts it
+    causes (alerts.py publishes them).  Without streaming (WSGI) it returns
+    after the first batch of events and the client reconnects (long polling).
+    The bus does not replay, so events published between two long polls are
+    lost; that is why smooth-navbar.js only opens this stream on pages served
+    over ASGI and polls /api/badges/ (conditional GET) otherwise.
+    """
+    config = events.event_settings()
+    loop = asyncio.get_running_loop()
+    subscription = events.bus.subscribe(user.id, max_queued=config['max_queued'])
+    compute_badges = sync_to_async(_current_badges)
+
+    try:
+        yield f"retry: {config['retry_ms']}\n\n".encode()
+        counts = await compute_badges(user)
+        yield _sse(events.BADGES, {'counts': counts, 'delta': {}})
+
+        deadline = loop.time() + (config['max_stream_seconds'] if streaming else config['long_poll_seconds'])
+        while (remaining := deadline - loop.time()) > 0:
+            batch = await subscription.next_batch(min(config['heartbeat_seconds'], remaining))
+            if not batch and not subscription.overflowed:
+                if streaming:
+                    yield b': keep-alive\n\n'
+                continue
+
+            for event in batch:
+                yield _sse(event['type'], event['data'])
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield _sse(events.RESYNC, {})
+
+            # Coalesce a burst of changes into one badge recount (cached per inventory version)
+            new_counts = await compute_badges(user)
+            if new_counts != counts:
+                delta = {key: new_counts[key] - counts.get(key, 0) for key in new_counts}
+                counts = new_counts
+                yield _sse(events.BADGES, {'counts': counts, 'delta': delta})
+
+            if not streaming:
+                # Alerts raised by the recount are already queued
+                for event in subscription.drain():
+                    yield _sse(event['type'], event['data'])
+                break
+    finally:
+        events.bus.unsubscribe(subscription)
+
+
+@require_http_methods(["GET"])
+async def api_events_stream(request):
+    """
+    Live inventory events as text/event-stream
+
+    Events: badges, item, expiry, resync (reload everything).
+    """
+    try:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+
+        response = StreamingHttpResponse(
+            _event_stream(user, streaming=isinstance(request, ASGIRequest)),
+            content_type='text/event-stream'
+        )
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    except Exception as e:
+        logger.error(f"Error opening event stream: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -0,0 +1,92 @@
+"""
+Conditional GET for the polled inventory APIs
+
+The frontend polls the notifications and analytics APIs, and most polls
+find nothing changed.  inventory_condition() wraps such a view with
+Django's condition() decorator: the ETag is derived from the inventory
+version counters (bumped on every write and kept in the database, so every
+worker process agrees on them; see inventory_cache.py), and Last-Modified
+from the time of the last write.  A matching If-None-Match
+or If-Modified-Since is answered with 304 Not Modified before the view
+runs, so none of its queries are executed.
+
+Expiry and staleness buckets also move with the clock, so validators
+additionally change once per settings.INVENTORY_ETAG_WINDOW seconds.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, Tuple
+import hashlib
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.views.decorators.http import condition
+
+from .inventory_cache import get_inventory_stamps
+
+DEFAULT_ETAG_WINDOW = 600
+
+
+def inventory_validators(request, vary_on: Optional[Callable[[Any], Iterable[Any]]] = None) -> Tuple[str, datetime]:
+    """
+    (etag, last_modified) for the inventory as seen by this request's user
+
+    Computed once per request and reused by both validator functions.
+
+    Args:
+        vary_on: Callable returning extra values the response depends on
+                 (e.g. the user's notification thresholds)
+    """
+    validators = getattr(request, '_inventory_validators', None)
+    if validators is not None:
+        return validators
+
+    user_id = request.user.id if request.user.is_authenticated else None
+    window = max(1, getattr(settings, 'INVENTORY_ETAG_WINDOW', DEFAULT_ETAG_WINDOW))
+    window_start = int(time.time() // window) * window
+
+    stamps = get_inventory_stamps(user_id)
+    modified = [stamps['modified']]
+    parts = [user_id, window_start, stamps['version']]
+    if user_id is not None:
+        modified.append(stamps['user_modified'])
+        parts.append(stamps['user_version'])
+    if vary_on is not None:
+        parts.extend(vary_on(request))
+
+    etag = hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()
+    last_modified = datetime.fromtimestamp(max(modified + [window_start]), tz=dt_timezone.utc)
+    request._inventory_validators = (etag, last_modified)
+    return request._inventory_validators
+
+
+def inventory_condition(vary_on: Optional[Callable[[Any], Iterable[Any]]] = None):
+    """
+    Decorator adding ETag/Last-Modified and 304 responses to an inventory read API
+
+    Works on sync and async views.  condition() calls the validator functions
+    synchronously, so for async views the validators (which read the
+    database) are computed off the event loop first and then found cached.
+
+    Args:
+        vary_on: Callable returning extra values the response depends on
+    """
+    conditional = condition(
+        etag_func=lambda request, *args, **kwargs: inventory_validators(request, vary_on)[0],
+        last_modified_func=lambda request, *args, **kwargs: inventory_validators(request, vary_on)[1],
+    )
+
+    def decorator(view):
+        conditional_view = conditional(view)
+        if not iscoroutinefunction(view):
+            return conditional_view
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            await sync_to_async(inventory_validators)(request, vary_on)
+            return await conditional_view(request, *args, **kwargs)
+        return async_view
+
+    return decorator
@@ -4,13 +4,20 @@ Django ORM Models for Smart Grocery Tracker
 This module defines Django models using SQLite database for easy setup.
 """
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional, Any
 import json
 
+from .inventory_cache import bump_inventory_version
+from . import events
+from .serialization import serialize_instance, serialize_values
+from . import rollups
+
 logger = logging.getLogger('grocery_app')
 
 
@@ -77,6 +84,25 @@ class GroceryItem(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['category']),
             models.Index(fields=['expiry_date']),
+            # Compound/partial indexes matched to the GroceryItemManager hot queries
+            # (verify with: manage.py explain_queries)
+            models.Index(
+                fields=['expiry_date', 'name'],
+                name='grocery_expiry_name_idx',
+                condition=models.Q(expiry_date__isnull=False),
+            ),
+            models.Index(fields=['quantity', 'name'], name='grocery_quantity_name_idx'),
+            models.Index(fields=['category', 'name'], name='grocery_category_name_idx'),
+            models.Index(
+                fields=['last_purchased', 'category'],
+                name='grocery_purchased_idx',
+                condition=models.Q(last_purchased__isnull=False, price__gt=0),
+            ),
+            models.Index(fields=['updated_at', 'id'], name='grocery_updated_idx'),
+            # Stale-item range in the notifications classification query
+            models.Index(fields=['last_purchased'], name='grocery_last_purchased_idx'),
+            # Case-insensitive name lookups (import de-duplication)
+            models.Index(Lower('name'), name='grocery_name_lower_idx'),
         ]
     
     def __str__(self):
@@ -103,26 +129,155 @@ class GroceryItem(models.Model):
     
     def to_dict(self):
         """Convert model instance to dictionary"""
-        return {
-            'id': str(self.id),
-            'name': self.name,
-            'category': self.category,
-            'quantity': self.quantity,
-            'unit': self.unit,
-            'price': float(self.price) if self.price else None,
-            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else None,
-            'last_purchased': self.last_purchased.isoformat() if self.last_purchased else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'notes': self.notes,
-            'barcode': self.barcode,
-            'brand': self.brand,
-            'store': self.store,
-            'nutritional_info': self.nutritional_info,
-            'days_until_expiry': self.days_until_expiry,
-            'is_expiring_soon': self.is_expiring_soon,
-            'is_low_stock': self.is_low_stock,
-        }
+        return serialize_instance(self)
+
+
+class InventoryVersion(models.Model):
+    """
+    Write counter for the shared inventory or one user's items, bumped by
+    grocery_app.inventory_cache.bump_inventory_version
+    """
+
+    key = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class GroceryItemTombstone(models.Model):
+    """
+    ID of a deleted grocery item, so incremental consumers such as the search
+    index can drop it without diffing every live ID
+    """
+
+    item_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    @classmethod
+    def record(cls, item_ids):
+        """Add tombstones for deleted items (call inside the deleting transaction)"""
+        now = timezone.now()
+        cls.objects.bulk_create([cls(item_id=item_id, deleted_at=now) for item_id in item_ids])
+
+    def __str__(self):
+        return f"Deleted item {self.item_id}"
+
+
+class CategoryRollup(models.Model):
+    """
+    Running per-category inventory totals, kept current by grocery_app.rollups
+
+    The Django inventory is shared, so its rows have user=None.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
+    category = models.CharField(max_length=50)
+    item_count = models.IntegerField(default=0)
+    total_quantity = models.BigIntegerField(default=0)
+    priced_count = models.IntegerField(default=0)
+    active_count = models.IntegerField(default=0)
+    zero_quantity_count = models.IntegerField(default=0)
+    total_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    active_value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['category']
+        # NULLs never collide in a unique index, so the shared (user=None)
+        # rows need their own partial constraint
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category'], condition=models.Q(user__isnull=False),
+                                    name='grocery_catrollup_user_uniq'),
+            models.UniqueConstraint(fields=['category'], condition=models.Q(user__isnull=True),
+                                    name='grocery_catrollup_shared_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.category}: {self.item_count} items"
+
+
+class DailySpendRollup(models.Model):
+    """
+    Spending per category and purchase day, kept current by grocery_app.rollups
+
+    Mirrors utils.calculate_spending_analytics: each item with a positive
+    price counts once, on the day of its last purchase, for price * quantity.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
+    category = models.CharField(max_length=50)
+    day = models.DateField()
+    purchase_count = models.IntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day', 'category']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'category', 'day'], condition=models.Q(user__isnull=False),
+                                    name='grocery_spend_user_uniq'),
+            models.UniqueConstraint(fields=['category', 'day'], condition=models.Q(user__isnull=True),
+                                    name='grocery_spend_shared_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'day'], name='grocery_spend_user_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category}: {self.total_spent}"
+
+
+class InventoryAlertScan(models.Model):
+    """
+    One alert threshold set and the stamp its InventoryAlert rows are current for
+
+    Users whose EssentialSettings have the same thresholds share a scan (the
+    Django inventory is shared, so their alerts are identical).
+    """
+
+    low_stock_threshold = models.IntegerField()
+    expiry_warning_days = models.IntegerField()
+    inventory_version = models.BigIntegerField(default=0)
+    window = models.CharField(max_length=20, blank=True)
+    scanned_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [('low_stock_threshold', 'expiry_warning_days')]
+
+    def __str__(self):
+        return f"Alerts for low stock <= {self.low_stock_threshold}, expiry within {self.expiry_warning_days} days"
+
+
+class InventoryAlert(models.Model):
+    """
+    Precomputed expiry, low-stock and stale alerts, written by grocery_app.alerts
+
+    One row per (threshold set, item, kind).
+    """
+
+    KIND_CHOICES = [
+        ('urgent', 'Expires Today'),
+        ('warning', 'Expiring Soon'),
+        ('low_stock', 'Low Stock'),
+        ('stale', 'Not Purchased Recently'),
+    ]
+
+    scan = models.ForeignKey(InventoryAlertScan, on_delete=models.CASCADE, related_name='alerts')
+    item = models.ForeignKey(GroceryItem, on_delete=models.CASCADE, related_name='alerts')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    days_until_expiry = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [('scan', 'item', 'kind')]
+        indexes = [
+            models.Index(fields=['scan', 'kind'], name='grocery_alert_scan_kind_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.item_id}"
 
 
 class GroceryItemManager:
@@ -132,8 +287,8 @@ class GroceryItemManager:
     
     @staticmethod
     def get_all(filters=None):
-        """Get all grocery items with optional filters - optimized"""
-        queryset = GroceryItem.objects.select_related().all()
+        """Get all grocery items with optional filters, in the 'list' field profile"""
+        queryset = GroceryItem.objects.all()
 
         if filters:
             if 'category' in filters:
@@ -141,11 +296,80 @@ class GroceryItemManager:
             if 'name' in filters:
                 queryset = queryset.filter(name__icontains=filters['name'])
 
-        # Use only() to fetch only required fields for better performance
-        queryset = queryset.only('id', 'name', 'category', 'quantity', 'unit', 'price', 'expiry_date', 'last_purchased', 'notes')
-
-        return [item.to_dict() for item in queryset]
+        # One values_list() query; no model instances or deferred-field loads
+        return serialize_values(queryset, 'list')
     
+    @staticmethod
+    def filter_queryset(filters=None):
+        """Build the queryset for the list filters used by views and APIs"""
+        queryset = GroceryItem.objects.all()
+
+        if filters:
+            if filters.get('category'):
+                queryset = queryset.filter(category=filters['category'])
+            if filters.get('name'):
+                queryset = queryset.filter(name__icontains=filters['name'])
+            if filters.get('search'):
+                queryset = GroceryItemManager._search_filter(queryset, filters['search'])
+            if filters.get('in_stock'):
+                queryset = queryset.filter(quantity__gt=0)
+
+        return queryset
+
+    @staticmethod
+    def _search_filter(queryset, text):
+        """Restrict a queryset to items matching a search, via FTS5 when available"""
+        from django.db.models.expressions import RawSQL
+        from .fulltext import build_match_query, fts_available, match_ids_sql
+
+        match = build_match_query(text)
+        if match and fts_available():
+            return queryset.filter(id__in=RawSQL(*match_ids_sql(match)))
+        return queryset.filter(name__icontains=text)
+
+    @staticmethod
+    def get_page(filters=None, cursor=None, page_size=12, with_total=False):
+        """Get one page of grocery items ordered by (name, id) using keyset pagination"""
+        from .pagination import paginate_queryset
+
+        queryset = GroceryItemManager.filter_queryset(filters)
+        return paginate_queryset(queryset, cursor=cursor, ordering=('name', 'id'),
+                                 page_size=page_size, with_total=with_total)
+
+    @staticmethod
+    def expiring_queryset(days=7):
+        """Queryset of items expiring within specified days"""
+        now = timezone.now()
+        # Soonest first: walks grocery_expiry_name_idx without a sort
+        return GroceryItem.objects.filter(
+            expiry_date__lte=now + timedelta(days=days),
+            expiry_date__gte=now
+        ).order_by('expiry_date', 'name')
+
+    @staticmethod
+    def low_stock_queryset(threshold=3):
+        """Queryset of items with low stock"""
+        # Lowest first: walks grocery_quantity_name_idx without a sort
+        return GroceryItem.objects.filter(quantity__lte=threshold).order_by('quantity', 'name')
+
+    @staticmethod
+    def purchases_queryset(days=30):
+        """Queryset of priced items purchased within the last N days"""
+        return GroceryItem.objects.filter(
+            last_purchased__gte=timezone.now() - timedelta(days=days),
+            price__gt=0,
+        )
+
+    @staticmethod
+    def count_expiring_items(days=7):
+        """Count items expiring within specified days"""
+        return GroceryItemManager.expiring_queryset(days).count()
+
+    @staticmethod
+    def count_low_stock_items(threshold=3):
+        """Count items with low stock"""
+        return GroceryItemManager.low_stock_queryset(threshold).count()
+
     @staticmethod
     def get_by_id(item_id):
         """Get grocery item by ID"""
@@ -165,7 +389,11 @@ class GroceryItemManager:
             if 'last_purchased' in item_data and isinstance(item_data['last_purchased'], str):
                 item_data['last_purchased'] = datetime.fromisoformat(item_data['last_purchased'])
             
-            item = GroceryItem.objects.create(**item_data)
+            with transaction.atomic():
+                item = GroceryItem.objects.create(**item_data)
+                rollups.apply_item_changes([(None, rollups.item_state(item))])
+            bump_inventory_version()
+            events.publish_item_change(events.CREATED, items=[item])
             logger.info(f"Created grocery item: {item.name}")
             return str(item.id)
         except Exception as e:
@@ -177,6 +405,7 @@ class GroceryItemManager:
         """Update grocery item"""
         try:
             item = GroceryItem.objects.get(id=item_id)
+            old_state = rollups.item_state(item)
             
             # Handle datetime fields
             if 'expiry_date' in update_data and isinstance(update_data['expiry_date'], str):
@@ -187,7 +416,11 @@ class GroceryItemManager:
             for key, value in update_data.items():
                 setattr(item, key, value)
             
-            item.save()
+            with transaction.atomic():
+                item.save()
+                rollups.apply_item_changes([(old_state, rollups.item_state(item))])
+            bump_inventory_version()
+            events.publish_item_change(events.UPDATED, items=[item])
             logger.info(f"Updated grocery item: {item.name}")
             return True
         except GroceryItem.DoesNotExist:
@@ -203,7 +436,14 @@ class GroceryItemManager:
         try:
             item = GroceryItem.objects.get(id=item_id)
             item_name = item.name
-            item.delete()
+            item_pk = item.pk
+            old_state = rollups.item_state(item)
+            with transaction.atomic():
+                item.delete()
+                rollups.apply_item_changes([(old_state, None)])
+                GroceryItemTombstone.record([item_pk])
+            bump_inventory_version()
+            events.publish_item_change(events.DELETED, item_ids=[item_id])
             logger.info(f"Deleted grocery item: {item_name}")
             return True
         except GroceryItem.DoesNotExist:
@@ -214,55 +454,197 @@ class GroceryItemManager:
             return False
     
     @staticmethod
-    def search_items(query):
-        """Search grocery items by name - optimized"""
-        items = GroceryItem.objects.filter(name__icontains=query).only(
-            'id', 'name', 'category', 'quantity', 'unit', 'price', 'expiry_date', 'notes'
-        )[:20]  # Limit results for performance
-        return [item.to_dict() for item in items]
+    def _parse_ids(item_ids):
+        """Pair each requested ID with its integer primary key (None if malformed)"""
+        parsed = []
+        for item_id in item_ids:
+            try:
+                parsed.append((item_id, int(item_id)))
+            except (TypeError, ValueError):
+                parsed.append((item_id, None))
+        return parsed
+
+    @staticmethod
+    def _bulk_results(parsed_ids, affected_ids):
+        """Per-ID results in the order the IDs were requested"""
+        return [
+            {'item_id': item_id, 'success': pk is not None and pk in affected_ids}
+            for item_id, pk in parsed_ids
+        ]
+
+    @staticmethod
+    def bulk_delete(item_ids):
+        """Delete many grocery items in one statement and transaction"""
+        parsed_ids = GroceryItemManager._parse_ids(item_ids)
+        pks = {pk for _, pk in parsed_ids if pk is not None}
+        try:
+            with transaction.atomic():
+                old_states = rollups.fetch_item_states(pks)
+                existing = set(old_states)
+                GroceryItem.objects.filter(id__in=existing).delete()
+                rollups.apply_item_changes((state, None) for state in old_states.values())
+                GroceryItemTombstone.record(existing)
+            if existing:
+                bump_inventory_version()
+                events.publish_item_change(events.DELETED, item_ids=sorted(existing))
+            logger.info(f"Bulk deleted {len(existing)} grocery items")
+        except Exception as e:
+            logger.error(f"Error bulk deleting grocery items: {e}")
+            existing = set()
+        return GroceryItemManager._bulk_results(parsed_ids, existing)
+
+    @staticmethod
+    def bulk_update(item_ids, update_data):
+        """Apply the same field values to many grocery items in one statement and transaction"""
+        parsed_ids = GroceryItemManager._parse_ids(item_ids)
+        pks = {pk for _, pk in parsed_ids if pk is not None}
+        update_data = dict(update_data)
+        try:
+            # Handle datetime fields
+            if 'expiry_date' in update_data and isinstance(update_data['expiry_date'], str):
+                update_data['expiry_date'] = datetime.fromisoformat(update_data['expiry_date'])
+            if 'last_purchased' in update_data and isinstance(update_data['last_purchased'], str):
+                update_data['last_purchased'] = datetime.fromisoformat(update_data['last_purchased'])
+
+            # QuerySet.update() skips auto_now, so stamp updated_at explicitly
+            update_data['updated_at'] = timezone.now()
+
+            with transaction.atomic():
+                old_states = rollups.fetch_item_states(pks)
+                existing = set(old_states)
+                GroceryItem.objects.filter(id__in=existing).update(**update_data)
+                if set(update_data) & set(rollups.ROLLUP_FIELDS):
+                    new_states = rollups.fetch_item_states(existing)
+                    rollups.apply_item_changes(
+                        (old_states[pk], new_states.get(pk)) for pk in existing
+                    )
+            if existing:
+                bump_inventory_version()
+                events.publish_item_change(events.UPDATED, item_ids=sorted(existing))
+            logger.info(f"Bulk updated {len(existing)} grocery items")
+        except Exception as e:
+            logger.error(f"Error bulk updating grocery items: {e}")
+            existing = set()
+        return GroceryItemManager._bulk_results(parsed_ids, existing)
+
+    @staticmethod
+    def bulk_mark_purchased(item_ids):
+        """Mark many grocery items as purchased (and consumed) in one statement"""
+        return GroceryItemManager.bulk_update(item_ids, {
+            'last_purchased': timezone.now(),
+            'quantity': 0  # Mark as consumed
+        })
+
+    @staticmethod
+    def search_items(query, limit=20, category=None):
+        """
+        Search grocery items by name, brand, category and notes
+
+        On SQLite the FTS5 table ranks word and prefix matches with BM25;
+        when that finds nothing (usually a typo) or is unavailable, the
+        in-memory trigram index is used.  Each item carries a 'relevance'
+        score from 0 to 100.
+        """
+        from .fulltext import fts_available, fts_search
+        from .search_index import get_grocery_search_index
+
+        ranked = fts_search(query, limit=limit, category=category) if fts_available() else []
+        if not ranked:
+            ranked = get_grocery_search_index().search(query, limit=limit, category=category)
+        items = GroceryItem.objects.in_bulk([item_id for item_id, _ in ranked])
+        results = []
+        for item_id, relevance in ranked:
+            if item_id in items:
+                item = items[item_id].to_dict()
+                item['relevance'] = relevance
+                results.append(item)
+        return results
     
     @staticmethod
     def get_expiring_items(days=7):
         """Get items expiring within specified days"""
-        cutoff_date = timezone.now() + timedelta(days=days)
-        items = GroceryItem.objects.filter(
-            expiry_date__lte=cutoff_date,
-            expiry_date__gte=timezone.now()
-        )
-        return [item.to_dict() for item in items]
+        return serialize_values(GroceryItemManager.expiring_queryset(days), 'detail')
     
     @staticmethod
     def get_low_stock_items(threshold=3):
         """Get items with low stock"""
-        items = GroceryItem.objects.filter(quantity__lte=threshold)
-        return [item.to_dict() for item in items]
+        return serialize_values(GroceryItemManager.low_stock_queryset(threshold), 'detail')
     
     @staticmethod
     def get_categories_stats():
-        """Get statistics by category"""
-        from django.db.models import Count, Sum
-        
-        stats = GroceryItem.objects.values('category').annotate(
-            count=Count('id'),
-            total_quantity=Sum('quantity')
-        )
-        
-        return list(stats)
+        """Get statistics by category (from the CategoryRollup table)"""
+        return rollups.category_stats()
 
 
 class AnalyticsModel:
     """Analytics model for grocery data"""
     
+    @staticmethod
+    def calculate_spending(days=30):
+        """
+        Calculate spending analytics for the last N days inside the database
+        
+        Returns the same dictionary shape as utils.calculate_spending_analytics.
+        Per-category totals come from the DailySpendRollup table, so the cost
+        depends on categories x days rather than on the number of items.
+        """
+        try:
+            now = timezone.now()
+            
+            # Items with a price that were purchased within the period
+            purchases = GroceryItemManager.purchases_queryset(days)
+            
+            # For spending analytics, we assume the full quantity was purchased
+            # on the last_purchased date (this is a simplification)
+            category_breakdown = rollups.spending_by_category(days)
+            total_spent = sum(row['total_spent'] for row in category_breakdown)
+            items_purchased = sum(row['item_count'] for row in category_breakdown)
+            
+            # Most recent purchases for detailed view
+            recent_rows = purchases.order_by('-last_purchased').values(
+                'name', 'category', 'price', 'quantity', 'last_purchased'
+            )[:10]
+            recent_purchases = []
+            for row in recent_rows:
+                price = float(row['price'])
+                recent_purchases.append({
+                    'name': row['name'],
+                    'category': row['category'],
+                    'price': price,
+                    'quantity': row['quantity'],
+                    'total_cost': price * row['quantity'],
+                    'purchase_date': row['last_purchased'],
+                    'days_ago': (now - row['last_purchased']).days,
+                })
+            
+            return {
+                'total_spent': round(total_spent, 2),
+                'category_breakdown': category_breakdown,
+                'period_days': days,
+                'avg_daily_spending': round(total_spent / days, 2) if days > 0 else 0.0,
+                'items_purchased': items_purchased,
+                'avg_item_cost': round(total_spent / items_purchased, 2) if items_purchased > 0 else 0.0,
+                'spending_by_week': [],
+                'recent_purchases': recent_purchases,
+            }
+        
+        except Exception as e:
+            logger.error(f"Error calculating spending analytics: {e}")
+            return {
+                'total_spent': 0.0,
+                'category_breakdown': [],
+                'period_days': days,
+                'avg_daily_spending': 0.0,
+                'items_purchased': 0,
+                'avg_item_cost': 0.0,
+                'spending_by_week': [],
+                'recent_purchases': []
+            }
+    
     @staticmethod
     def get_spending_analytics(days=30):
         """Get comprehensive spending analytics for the last N days"""
-        from .utils import calculate_spending_analytics
-
-        # Get all items and use the enhanced calculation function
-        all_items = GroceryItemManager.get_all()
-
-        # Use the enhanced spending analytics function
-        spending_data = calculate_spending_analytics(all_items, days=days)
+        spending_data = AnalyticsModel.calculate_spending(days=days)
 
         # Maintain backward compatibility with existing template structure
         return {
@@ -0,0 +1,202 @@
+"""
+Live inventory events for Smart Grocery Tracker
+
+An in-process publish/subscribe bus.  Write paths (GroceryItemManager and the
+MongoDB GroceryItem model) publish item changes; the server-sent events view
+(async_views.api_events_stream) subscribes one queue per connected client and
+pushes the events, along with badge-count and expiry-alert updates derived
+from them.
+
+publish() may be called from any thread: each subscription belongs to the
+event loop that created it and is fed through call_soon_threadsafe.  A
+subscriber that falls behind is not allowed to grow without bound; once its
+queue is full further events are dropped and the subscription is flagged so
+the stream can tell the client to resynchronize.
+
+The bus only reaches clients connected to the same process.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+import asyncio
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger('grocery_app')
+
+# Event types
+ITEM_CHANGED = 'item'
+EXPIRY_ALERT = 'expiry'
+BADGES = 'badges'
+RESYNC = 'resync'
+
+# Item change actions
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+DEFAULT_MAX_QUEUED = 100
+
+DEFAULT_EVENT_SETTINGS = {
+    'heartbeat_seconds': 15,      # keep-alive comment interval on idle streams
+    'max_stream_seconds': 600,    # streams end after this long; EventSource reconnects
+    'long_poll_seconds': 25,      # /api/events/ under WSGI: wait this long for one batch of events
+    'retry_ms': 3000,             # client reconnect delay
+    'poll_seconds': 60,           # badge polling interval for pages not served over ASGI
+    'max_queued': DEFAULT_MAX_QUEUED,
+}
+
+# Item fields included in item-change events (enough for expiry alerts)
+EVENT_ITEM_FIELDS = ('id', 'name', 'quantity', 'unit', 'expiry_date')
+
+
+def event_settings() -> Dict[str, Any]:
+    """Live event settings with defaults filled in"""
+    configured = getattr(settings, 'INVENTORY_EVENTS', {}) or {}
+    return {**DEFAULT_EVENT_SETTINGS, **configured}
+
+
+class Subscription:
+    """
+    One subscriber's bounded event queue, owned by an event loop
+    """
+
+    def __init__(self, user_id: Optional[Any] = None, max_queued: int = DEFAULT_MAX_QUEUED):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def wants(self, user_id: Optional[Any]) -> bool:
+        """Whether an event for user_id (None: everyone) goes to this subscriber"""
+        return user_id is None or str(user_id) == str(self.user_id)
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event (runs on the subscriber's loop)"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def next_batch(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Wait up to timeout seconds for an event, then drain whatever else is queued
+
+        Returns:
+            The events in publish order (empty on timeout)
+        """
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return [first] + self.drain()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Take every event already queued without waiting"""
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+
+class EventBus:
+    """
+    Thread-safe in-process fan-out of inventory events
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Set[Subscription] = set()
+        self.published = 0
+
+    def subscribe(self, user_id: Optional[Any] = None, max_queued: int = DEFAULT_MAX_QUEUED) -> Subscription:
+        """Register a subscriber; must be called from a running event loop"""
+        subscription = Subscription(user_id, max_queued)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber (safe to call twice)"""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event_type: str, data: Dict[str, Any], user_id: Optional[Any] = None) -> int:
+        """
+        Send an event to every matching subscriber
+
+        Args:
+            event_type: One of the event type constants
+            data: JSON-serializable payload
+            user_id: Only deliver to this user's subscribers; None delivers to everyone
+
+        Returns:
+            Number of subscribers the event was handed to
+        """
+        event = {'type': event_type, 'data': data}
+        with self._lock:
+            targets = [subscription for subscription in self._subscriptions if subscription.wants(user_id)]
+            self.published += 1
+
+        delivered = 0
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+                delivered += 1
+            except RuntimeError:
+                # The subscriber's loop has closed
+                self.unsubscribe(subscription)
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscriber and event counters"""
+        with self._lock:
+            return {'subscribers': len(self._subscriptions), 'published': self.published}
+
+
+bus = EventBus()
+
+
+def publish(event_type: str, data: Dict[str, Any], user_id: Optional[Any] = None) -> None:
+    """Publish an event on the process bus; never raises into the caller's write path"""
+    try:
+        bus.publish(event_type, data, user_id)
+    except Exception as e:
+        logger.error(f"Error publishing {event_type} event: {e}")
+
+
+def _event_item(item: Any) -> Dict[str, Any]:
+    """Slim item dictionary for an event payload (model instance or dictionary)"""
+    get = item.get if isinstance(item, dict) else lambda field: getattr(item, field, None)
+    data = {field: get(field) for field in EVENT_ITEM_FIELDS}
+    if data['id'] is None and isinstance(item, dict):
+        data['id'] = item.get('_id')
+    data['id'] = str(data['id']) if data['id'] is not None else None
+    return data
+
+
+def publish_item_change(action: str, item_ids: Iterable[Any] = (), items: Iterable[Any] = (),
+                        user_id: Optional[Any] = None, source: str = 'sqlite') -> None:
+    """
+    Publish an item-change event once the surrounding transaction commits
+
+    Args:
+        action: CREATED, UPDATED or DELETED
+        item_ids: IDs of the affected items
+        items: Affected items (model instances or dictionaries) to include in the event
+        user_id: Owner of the items (MongoDB); None broadcasts to every user
+        source: 'sqlite' or 'mongodb'
+    """
+    data = {
+        'action': action,
+        'source': source,
+        'item_ids': [str(item_id) for item_id in item_ids],
+        'items': [_event_item(item) for item in items],
+        'timestamp': timezone.now(),
+    }
+    if not data['item_ids']:
+        data['item_ids'] = [item['id'] for item in data['items'] if item['id'] is not None]
+    transaction.on_commit(lambda: publish(ITEM_CHANGED, data, user_id))
@@ -0,0 +1,150 @@
+"""
+Streaming data export for Smart Grocery Tracker
+
+Exports are produced by generators that read the database in fixed-size
+chunks (QuerySet.iterator on the Django side, a batched server-side cursor
+on the MongoDB side) and encode one row at a time, so memory use stays flat
+however large the export is.  Views wrap the generators in a
+StreamingHttpResponse.
+
+On SQLite an open cursor keeps the database read-locked, which would block
+every writer for as long as a download takes, so there the chunks are read
+as separate id-keyed queries instead.
+
+Under ASGI Django would buffer a synchronous iterator completely before
+sending it, so views hand it to aiter_encoded(), which pulls one chunk of
+lines at a time through sync_to_async.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Sequence
+import csv
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from .serialization import FIELD_PROFILES
+
+logger = logging.getLogger('grocery_app')
+
+# Rows fetched per database round trip
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+ITEM_EXPORT_FIELDS = FIELD_PROFILES['export']
+
+ACTIVITY_EXPORT_FIELDS = (
+    'id', 'action', 'description', 'ip_address', 'user_agent', 'timestamp', 'metadata',
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value: Any) -> Any:
+    """Flatten a value for a CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    return value
+
+
+def iter_csv(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[str]:
+    """Encode rows as CSV lines, header first"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([_csv_cell(row.get(field)) for field in fields])
+
+
+def iter_jsonl(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[str]:
+    """Encode rows as JSON Lines"""
+    for row in rows:
+        yield json.dumps({field: row.get(field) for field in fields}, cls=DjangoJSONEncoder) + '\n'
+
+
+def encode_rows(rows: Iterable[Dict[str, Any]], fields: Sequence[str], export_format: str) -> Iterator[str]:
+    """Encode rows in the requested format ('csv' or 'jsonl')"""
+    if export_format == 'csv':
+        return iter_csv(rows, fields)
+    return iter_jsonl(rows, fields)
+
+
+def iterate_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Stream a values() queryset ordered by id, chunk_size rows per query"""
+    if connection.vendor != 'sqlite':
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    last_id = None
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        rows = list(chunk[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]['id']
+
+
+def django_item_rows(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Every Django grocery item, read in chunks"""
+    from .django_models import GroceryItem
+
+    queryset = GroceryItem.objects.order_by('id').values(*ITEM_EXPORT_FIELDS)
+    yield from iterate_rows(queryset, chunk_size)
+
+
+def mongo_item_rows(collection, user_id: str, batch_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """A user's MongoDB grocery items through a batched server-side cursor"""
+    projection = {field: 1 for field in ITEM_EXPORT_FIELDS if field != 'id'}
+    cursor = collection.find({'user_id': user_id}, projection).sort('_id', 1).batch_size(batch_size)
+    try:
+        for document in cursor:
+            document['id'] = str(document.pop('_id'))
+            yield document
+    finally:
+        cursor.close()
+
+
+def activity_rows(user, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """A user's activity log in insertion order, read in chunks"""
+    from accounts.models import UserActivityLog
+
+    queryset = UserActivityLog.objects.filter(user=user).order_by('id').values(*ACTIVITY_EXPORT_FIELDS)
+    yield from iterate_rows(queryset, chunk_size)
+
+
+async def aiter_encoded(lines: Iterator[str], lines_per_chunk: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[str]:
+    """
+    Serve encoded export lines as an async iterator (for ASGI)
+
+    Each step runs the synchronous generator in Django's sync thread, so its
+    database reads stay on one connection, and sends lines_per_chunk lines.
+    """
+    def next_chunk():
+        return ''.join(islice(lines, lines_per_chunk))
+
+    try:
+        while chunk := await sync_to_async(next_chunk)():
+            yield chunk
+    finally:
+        # Release the database or MongoDB cursor if the client goes away early
+        await sync_to_async(lines.close)()
@@ -0,0 +1,153 @@
+"""
+SQLite FTS5 full-text search for Smart Grocery Tracker
+
+Migration 0003 creates an external-content FTS5 table mirroring the
+GroceryItem name, brand, category and notes columns, kept in sync by
+triggers.  Searches become indexed token/prefix lookups ranked by BM25
+instead of LIKE '%q%' scans.  On other databases (or SQLite builds without
+FTS5) fts_available() is False and callers fall back to the trigram index.
+
+SQLite drops a table's triggers whenever Django rebuilds it (most AlterField
+and RemoveField operations on GroceryItem), which would silently leave the
+index stale.  fts_available() therefore also checks the triggers and
+recreates any that are missing, rebuilding the index from the item table.
+"""
+
+from typing import List, Optional, Tuple
+import logging
+import re
+
+from django.db import connection, OperationalError
+
+logger = logging.getLogger('grocery_app')
+
+FTS_TABLE = 'grocery_app_groceryitem_fts'
+
+# BM25 column weights, in FTS_COLUMNS order
+FTS_COLUMNS = ('name', 'brand', 'category', 'notes')
+BM25_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Same definitions as migration 0003; recreated when a table rebuild dropped them
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, brand, category, notes)
+        VALUES (new.id, new.name, new.brand, new.category, new.notes);
+    END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, brand, category, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.category, old.notes);
+    END
+    """,
+    f'{FTS_TABLE}_au': f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, brand, category, notes
+    ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, brand, category, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.category, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, name, brand, category, notes)
+        VALUES (new.id, new.name, new.brand, new.category, new.notes);
+    END
+    """,
+}
+
+_available = {}
+
+
+def fts_available() -> bool:
+    """Whether the FTS5 table exists on the default database (checked once per process)"""
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _available:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                available = cursor.fetchone() is not None
+            if available:
+                ensure_fts_triggers()
+            _available[connection.alias] = available
+        except Exception as e:
+            logger.error(f"Error checking for the full-text search table: {e}")
+            return False
+    return _available[connection.alias]
+
+
+def ensure_fts_triggers() -> List[str]:
+    """
+    Recreate sync triggers dropped by a table rebuild, then rebuild the index
+
+    Returns:
+        Names of the triggers that had to be recreated
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'grocery_app_groceryitem'")
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in FTS_TRIGGERS if name not in existing]
+        if missing:
+            logger.warning(f"Full-text search triggers missing ({', '.join(missing)}); recreating and rebuilding the index")
+            for name in missing:
+                cursor.execute(FTS_TRIGGERS[name])
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return missing
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn user input into an FTS5 MATCH expression
+
+    Every word becomes a quoted prefix term ("mil"*) and all of them must
+    match, so partially typed words work for type-ahead and no FTS5 syntax
+    from the user is ever interpreted.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def match_ids_sql(match: str) -> Tuple[str, List[str]]:
+    """SQL and params selecting the ids of matching items, for use as a subquery"""
+    return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+
+
+def fts_search(text: str, limit: int = 10, category: Optional[str] = None) -> List[Tuple[int, float]]:
+    """
+    Rank items against a query with BM25
+
+    Returns:
+        (item id, relevance) pairs, best first; relevance runs from 0 to 100
+    """
+    match = build_match_query(text)
+    if match is None:
+        return []
+
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    sql = (
+        f"SELECT {FTS_TABLE}.rowid, bm25({FTS_TABLE}, {weights}) AS rank "
+        f"FROM {FTS_TABLE} "
+        f"JOIN grocery_app_groceryitem ON grocery_app_groceryitem.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s"
+    )
+    params = [match]
+    if category:
+        sql += " AND lower(grocery_app_groceryitem.category) = lower(%s)"
+        params.append(category)
+    sql += " ORDER BY rank LIMIT %s"
+    params.append(limit)
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    except OperationalError as e:
+        logger.error(f"Error running full-text search: {e}")
+        return []
+
+    if not rows:
+        return []
+    # bm25() is negative, lower is better; scale so the best hit scores 100
+    best = rows[0][1]
+    return [(item_id, round(100 * rank / best, 1) if best else 100.0) for item_id, rank in rows]
@@ -0,0 +1,162 @@
+"""
+Request-scoped inventory snapshot for Smart Grocery Tracker
+
+Views, context processors and template tags all need the same handful of
+inventory views (all items, expiring, low stock, per-category stats).  This
+module loads the grocery rows once per request and serves every one of those
+views from memory.  Aggregate statistics come from a columnar InventoryFrame,
+which does not need full model rows at all.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+import logging
+
+from django.utils import timezone
+
+from .django_models import GroceryItem
+from .inventory_frame import HAS_NUMPY, InventoryFrame
+
+logger = logging.getLogger('grocery_app')
+
+# Attribute used to memoize the snapshot on the request object
+REQUEST_ATTR = '_inventory_snapshot'
+
+
+class InventorySnapshot:
+    """
+    In-memory view over the grocery inventory, loaded with a single query
+    """
+
+    def __init__(self, queryset=None):
+        self._queryset = queryset if queryset is not None else GroceryItem.objects.all()
+        self._items: Optional[List[GroceryItem]] = None
+        self._dicts: Optional[Dict[int, Dict[str, Any]]] = None
+        self._frame: Optional[InventoryFrame] = None
+        self.now = timezone.now()
+
+    def _load(self) -> List[GroceryItem]:
+        """Fetch the rows on first use"""
+        if self._items is None:
+            self._items = list(self._queryset)
+            self._dicts = {}
+        return self._items
+
+    def _to_dict(self, item: GroceryItem) -> Dict[str, Any]:
+        """Serialize an item once and reuse the dictionary afterwards"""
+        data = self._dicts.get(item.pk)
+        if data is None:
+            data = item.to_dict()
+            self._dicts[item.pk] = data
+        return data
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All items, same shape as GroceryItem.to_dict()"""
+        return [self._to_dict(item) for item in self._load()]
+
+    def frame(self) -> InventoryFrame:
+        """
+        Columnar view of the inventory (requires numpy)
+
+        Reuses rows that are already loaded; otherwise reads just the
+        statistics columns with values_list.
+        """
+        if self._frame is None:
+            if self._items is not None:
+                self._frame = InventoryFrame.from_instances(self._items)
+            else:
+                self._frame = InventoryFrame.from_queryset(self._queryset)
+        return self._frame
+
+    def count(self) -> int:
+        """Total number of items"""
+        if self._items is None and HAS_NUMPY:
+            return len(self.frame())
+        return len(self._load())
+
+    def expiring_count(self, days: int = 7) -> int:
+        """Number of items expiring within the next N days"""
+        if HAS_NUMPY:
+            return self.frame().expiring_count(self.now, days)
+        return len(self.expiring(days))
+
+    def low_stock_count(self, threshold: int = 3) -> int:
+        """Number of items with quantity at or below the threshold"""
+        if HAS_NUMPY:
+            return self.frame().low_stock_count(threshold)
+        return len(self.low_stock(threshold))
+
+    def statistics(self) -> Dict[str, Any]:
+        """Inventory statistics, same shape as utils.calculate_inventory_statistics()"""
+        if HAS_NUMPY:
+            return self.frame().inventory_statistics()
+        from .utils import calculate_inventory_statistics
+        return calculate_inventory_statistics(self.all())
+
+    def expiring(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Items expiring within the next N days"""
+        cutoff_date = self.now + timedelta(days=days)
+        return [
+            self._to_dict(item) for item in self._load()
+            if item.expiry_date and self.now <= item.expiry_date <= cutoff_date
+        ]
+
+    def low_stock(self, threshold: int = 3) -> List[Dict[str, Any]]:
+        """Items with quantity at or below the threshold"""
+        return [self._to_dict(item) for item in self._load() if item.quantity <= threshold]
+
+    def stale(self, days: int = 30) -> List[Dict[str, Any]]:
+        """Items last purchased more than N days ago"""
+        cutoff_date = self.now - timedelta(days=days)
+        return [
+            self._to_dict(item) for item in self._load()
+            if item.last_purchased and item.last_purchased < cutoff_date
+        ]
+
+    def by_category(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Items grouped by category"""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for item in self._load():
+            groups.setdefault(item.category, []).append(self._to_dict(item))
+        return groups
+
+    def categories_stats(self) -> List[Dict[str, Any]]:
+        """Per-category statistics, same shape as GroceryItemManager.get_categories_stats()"""
+        if HAS_NUMPY:
+            return [
+                {'category': entry['category'], 'count': entry['count'], 'total_quantity': entry['total_quantity']}
+                for entry in self.frame().category_summary()
+            ]
+
+        stats: Dict[str, Dict[str, Any]] = {}
+        for item in self._load():
+            entry = stats.setdefault(item.category, {
+                'category': item.category,
+                'count': 0,
+                'total_quantity': 0,
+            })
+            entry['count'] += 1
+            entry['total_quantity'] += item.quantity
+        return list(stats.values())
+
+
+def get_inventory_snapshot(request=None) -> InventorySnapshot:
+    """
+    Get the inventory snapshot for this request, creating it on first access
+
+    Without a request a fresh, unshared snapshot is returned.
+    """
+    if request is None:
+        return InventorySnapshot()
+
+    snapshot = getattr(request, REQUEST_ATTR, None)
+    if snapshot is None:
+        snapshot = InventorySnapshot()
+        setattr(request, REQUEST_ATTR, snapshot)
+    return snapshot
+
+
+def invalidate_inventory_snapshot(request) -> None:
+    """Drop the request's snapshot after a write so later reads reload"""
+    if request is not None and hasattr(request, REQUEST_ATTR):
+        delattr(request, REQUEST_ATTR)
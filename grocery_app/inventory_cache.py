@@ -0,0 +1,138 @@
+"""
+Inventory cache helpers for Smart Grocery Tracker
+
+Keeps the navbar badge counters in Django's cache framework.  Cache keys
+embed an inventory version number; every write bumps the version, so a
+single O(1) increment invalidates every cached counter that depends on it.
+Each bump also records the time of the write, which conditional GET uses
+for Last-Modified (see conditional.py).
+
+The version counters live in the InventoryVersion table rather than in the
+cache, so a write in one worker process is seen by every other process even
+with the default per-process locmem cache.  Only the derived counters are
+cached; their backend (locmem, file, Redis, ...) is chosen through
+settings.CACHES.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger('grocery_app')
+
+VERSION_KEY = 'inventory'
+USER_VERSION_KEY = 'inventory:user:{user_id}'
+BADGE_COUNTS_KEY = 'badge_counts:{user_id}:{version}:{user_version}:{vary}'
+
+# (version, Unix time of the last write) for a key nothing has been written under
+NO_WRITES = (0, 0.0)
+
+
+def _version_key(user_id: Optional[Any] = None) -> str:
+    return VERSION_KEY if user_id is None else USER_VERSION_KEY.format(user_id=user_id)
+
+
+def _read_versions(*keys: str) -> Dict[str, Tuple[int, float]]:
+    """(version, last write time) for each key, in one query"""
+    from .django_models import InventoryVersion
+
+    found = {
+        key: (version, modified_at.timestamp())
+        for key, version, modified_at in
+        InventoryVersion.objects.filter(key__in=keys).values_list('key', 'version', 'modified_at')
+    }
+    return {key: found.get(key, NO_WRITES) for key in keys}
+
+
+def get_inventory_version(user_id: Optional[Any] = None) -> int:
+    """
+    Get the current inventory version
+
+    Args:
+        user_id: Return the per-user version instead of the shared one
+    """
+    key = _version_key(user_id)
+    return _read_versions(key)[key][0]
+
+
+def get_inventory_last_modified(user_id: Optional[Any] = None) -> float:
+    """
+    Get the Unix time of the last inventory write (0.0 before the first one)
+
+    Args:
+        user_id: Return the per-user time instead of the shared one
+    """
+    key = _version_key(user_id)
+    return _read_versions(key)[key][1]
+
+
+def get_inventory_stamps(user_id: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Shared and (optionally) per-user versions and write times in one query
+
+    Returns:
+        Dictionary with version and modified, plus user_version and
+        user_modified when user_id is given
+    """
+    keys = [VERSION_KEY] + ([_version_key(user_id)] if user_id is not None else [])
+    versions = _read_versions(*keys)
+    stamps = {'version': versions[VERSION_KEY][0], 'modified': versions[VERSION_KEY][1]}
+    if user_id is not None:
+        stamps['user_version'], stamps['user_modified'] = versions[keys[1]]
+    return stamps
+
+
+def bump_inventory_version(user_id: Optional[Any] = None) -> None:
+    """
+    Invalidate cached counters after an inventory write
+
+    Args:
+        user_id: Only invalidate this user's counters (MongoDB items are per user);
+                 when omitted every user's counters are invalidated
+    """
+    from .django_models import InventoryVersion
+
+    key = _version_key(user_id)
+    try:
+        now = timezone.now()
+        if InventoryVersion.objects.filter(key=key).update(version=F('version') + 1, modified_at=now):
+            return
+        try:
+            with transaction.atomic():
+                InventoryVersion.objects.create(key=key, version=1, modified_at=now)
+        except IntegrityError:
+            # Another writer created the row first
+            InventoryVersion.objects.filter(key=key).update(version=F('version') + 1, modified_at=now)
+    except Exception as e:
+        logger.error(f"Error bumping inventory version: {e}")
+
+
+def get_badge_counts(user_id: Any, compute: Callable[[], Dict[str, int]], vary: Iterable[Any] = ()) -> Dict[str, int]:
+    """
+    Get the navbar badge counters for a user, computing them on a cache miss
+
+    Args:
+        user_id: User the counters belong to
+        compute: Callable returning the counters dictionary
+        vary: Extra values the counters depend on besides the inventory versions
+
+    Returns:
+        Dictionary with expiring_count, low_stock_count and total_items_count
+    """
+    try:
+        stamps = get_inventory_stamps(user_id)
+        key = BADGE_COUNTS_KEY.format(user_id=user_id, version=stamps['version'], user_version=stamps['user_version'],
+                                      vary=':'.join(str(value) for value in vary))
+        counts = cache.get(key)
+        if counts is None:
+            counts = compute()
+            cache.set(key, counts, timeout=settings.BADGE_COUNTS_CACHE_TIMEOUT)
+        return counts
+    except Exception as e:
+        logger.error(f"Error reading cached badge counts: {e}")
+        return compute()
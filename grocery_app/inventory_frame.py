@@ -0,0 +1,168 @@
+"""
+Columnar inventory statistics for Smart Grocery Tracker
+
+Inventory statistics used to walk a list of item dictionaries once per
+metric, coercing price and quantity on every visit.  InventoryFrame converts
+the inventory once into parallel NumPy arrays (price, quantity, category
+code, expiry, last purchase) and answers every statistic with vectorized
+reductions: masks, sums and bincount by category.
+
+NumPy is optional; HAS_NUMPY is False without it and callers keep their
+pure-Python paths.
+"""
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Sequence
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger('grocery_app')
+
+HAS_NUMPY = np is not None
+
+# Columns read from the database, in row-tuple order
+COLUMNS = ('price', 'quantity', 'category', 'expiry_date', 'last_purchased')
+
+
+def _to_datetime64(value: Any):
+    """Naive-UTC numpy datetime64 for a datetime/date/ISO string, NaT when missing"""
+    if value is None or value == '':
+        return np.datetime64('NaT')
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    elif isinstance(value, date):
+        value = datetime(value.year, value.month, value.day)
+    return np.datetime64(value, 'us')
+
+
+def _to_float(value: Any) -> float:
+    """Float for a price/quantity value, NaN when missing or invalid"""
+    if value is None:
+        return float('nan')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class InventoryFrame:
+    """
+    Parallel column arrays over the grocery inventory
+
+    Missing prices and quantities are NaN, missing dates NaT.  Categories are
+    stored as integer codes into self.categories (first-seen order).
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        if not HAS_NUMPY:
+            raise ImportError('InventoryFrame requires numpy')
+
+        prices, quantities, codes, expiries, purchases = [], [], [], [], []
+        category_codes: Dict[Any, int] = {}
+        for price, quantity, category, expiry_date, last_purchased in rows:
+            prices.append(_to_float(price))
+            quantities.append(_to_float(quantity))
+            code = category_codes.get(category)
+            if code is None:
+                code = category_codes[category] = len(category_codes)
+            codes.append(code)
+            expiries.append(_to_datetime64(expiry_date))
+            purchases.append(_to_datetime64(last_purchased))
+
+        self.categories: List[Any] = list(category_codes)
+        self.price = np.array(prices, dtype=np.float64)
+        self.quantity = np.array(quantities, dtype=np.float64)
+        self.category_code = np.array(codes, dtype=np.int64)
+        self.expiry_date = np.array(expiries, dtype='datetime64[us]')
+        self.last_purchased = np.array(purchases, dtype='datetime64[us]')
+
+    def __len__(self):
+        return len(self.price)
+
+    @classmethod
+    def from_queryset(cls, queryset) -> 'InventoryFrame':
+        """Build from a GroceryItem queryset with a single values_list query"""
+        return cls(queryset.values_list(*COLUMNS))
+
+    @classmethod
+    def from_instances(cls, items: Iterable[Any]) -> 'InventoryFrame':
+        """Build from already loaded GroceryItem instances"""
+        return cls((item.price, item.quantity, item.category, item.expiry_date, item.last_purchased)
+                   for item in items)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> 'InventoryFrame':
+        """Build from item dictionaries (to_dict() or MongoDB documents)"""
+        return cls((item.get('price'), item.get('quantity'), item.get('category'),
+                    item.get('expiry_date'), item.get('last_purchased'))
+                   for item in items)
+
+    def _whole_quantity(self):
+        """Quantities truncated to whole units, 0 where missing (matches int(quantity))"""
+        return np.trunc(np.nan_to_num(self.quantity, nan=0.0))
+
+    def total_value(self, include_zero_quantity: bool = False) -> float:
+        """Same result as utils.calculate_total_value"""
+        quantity = self._whole_quantity()
+        mask = ~np.isnan(self.quantity) & (self.price > 0)
+        if not include_zero_quantity:
+            mask &= quantity > 0
+        return round(float(np.dot(self.price[mask], quantity[mask])), 2)
+
+    def inventory_statistics(self) -> Dict[str, Any]:
+        """Same dictionary as utils.calculate_inventory_statistics"""
+        quantity = self._whole_quantity()
+        has_price = self.price > 0
+        value = np.where(has_price, self.price, 0.0) * quantity
+        active = has_price & (quantity > 0)
+
+        total_value = float(value.sum())
+        active_value = float(value[active].sum())
+        active_count = int(active.sum())
+        items_with_price = int(has_price.sum())
+        unpriced_zero = ~has_price & ~np.isnan(self.quantity) & (self.quantity <= 0)
+
+        return {
+            'total_items': len(self),
+            'active_items': active_count,
+            'total_value': round(total_value, 2),
+            'active_value': round(active_value, 2),
+            'items_with_price': items_with_price,
+            'items_without_price': len(self) - items_with_price,
+            'zero_quantity_items': int((has_price & ~active).sum() + unpriced_zero.sum()),
+            'categories': sum(1 for category in self.categories if category),
+            'average_item_value': round(active_value / active_count, 2) if active_count else 0.0,
+        }
+
+    def category_summary(self) -> List[Dict[str, Any]]:
+        """Per-category count, total and average quantity, in first-seen order"""
+        size = len(self.categories)
+        counts = np.bincount(self.category_code, minlength=size)
+        totals = np.bincount(self.category_code, weights=np.nan_to_num(self.quantity, nan=0.0), minlength=size)
+        return [
+            {
+                'category': category,
+                'count': int(counts[code]),
+                'total_quantity': int(totals[code]),
+                'avg_quantity': round(float(totals[code]) / int(counts[code]), 2),
+            }
+            for code, category in enumerate(self.categories)
+            if counts[code]
+        ]
+
+    def expiring_count(self, now: datetime, days: int = 7) -> int:
+        """Number of items with now <= expiry_date <= now + days"""
+        start = _to_datetime64(now)
+        end = _to_datetime64(now + timedelta(days=days))
+        return int(((self.expiry_date >= start) & (self.expiry_date <= end)).sum())
+
+    def low_stock_count(self, threshold: int = 3) -> int:
+        """Number of items with quantity at or below the threshold"""
+        return int((self.quantity <= threshold).sum())
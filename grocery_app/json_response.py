@@ -0,0 +1,99 @@
+"""
+Fast JSON responses for Smart Grocery Tracker
+
+JsonResponse here is a drop-in replacement for django.http.JsonResponse
+that encodes with orjson (or msgspec) when installed and falls back to the
+standard library otherwise.  Every backend encodes the types our payloads
+carry the same way:
+
+    datetime, date, time   ISO 8601 string
+    Decimal                JSON number (like GroceryItem.to_dict's price)
+    ObjectId, UUID         string
+
+so views can hand MongoDB documents and model values over without
+converting each field by hand.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+import json
+import logging
+
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+logger = logging.getLogger('grocery_app')
+
+
+def _default(obj: Any) -> Any:
+    """Convert values the JSON backends don't encode natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID) or (ObjectId is not None and isinstance(obj, ObjectId)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+    # Non-string keys are coerced like the stdlib does; naive datetimes stay naive
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(data: Any) -> bytes:
+        """Encode data as UTF-8 JSON bytes"""
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+elif msgspec is not None:
+    JSON_BACKEND = 'msgspec'
+    try:
+        _encoder = msgspec.json.Encoder(enc_hook=_default, decimal_format='number')
+    except TypeError:
+        _encoder = msgspec.json.Encoder(enc_hook=_default)
+
+    def dumps(data: Any) -> bytes:
+        """Encode data as UTF-8 JSON bytes"""
+        return _encoder.encode(data)
+
+else:
+    JSON_BACKEND = 'json'
+
+    def dumps(data: Any) -> bytes:
+        """Encode data as UTF-8 JSON bytes"""
+        return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class JsonResponse(HttpResponse):
+    """
+    HttpResponse with a JSON body, encoded with the fastest available backend
+
+    Takes the same data/safe arguments as django.http.JsonResponse.
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                'In order to allow non-dict objects to be serialized set the '
+                'safe parameter to False.'
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
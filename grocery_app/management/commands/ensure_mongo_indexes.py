@@ -0,0 +1,32 @@
+"""
+MongoDB index bootstrap
+
+Creates the grocery_items indexes declared on the MongoDB GroceryItem model
+and backfills the name_lower prefix-search field on older documents.
+Idempotent, so it can run on every deploy.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from grocery_app.models import GroceryItem as MongoGroceryItem, MongoDBConnection
+
+
+class Command(BaseCommand):
+    help = 'Create the MongoDB grocery_items indexes and backfill search fields'
+
+    def handle(self, *args, **options):
+        try:
+            collection = MongoDBConnection().get_collection(MongoGroceryItem.COLLECTION_NAME)
+        except Exception as e:
+            raise CommandError(f"Could not connect to MongoDB: {e}")
+
+        names = MongoGroceryItem.ensure_indexes(collection)
+        if not names:
+            raise CommandError('Index creation failed, see the grocery_app log for details')
+
+        for name in names:
+            self.stdout.write(f"  {name}")
+        self.stdout.write(self.style.SUCCESS(f"{len(names)} grocery_items indexes in place"))
+
+        backfilled = MongoGroceryItem.backfill_search_fields(collection)
+        self.stdout.write(f"Backfilled search fields on {backfilled} documents")
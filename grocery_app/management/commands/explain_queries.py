@@ -0,0 +1,92 @@
+"""
+Query planner audit for GroceryItemManager
+
+Runs the database's EXPLAIN (EXPLAIN QUERY PLAN on SQLite) for every hot
+GroceryItemManager query and exits with an error if any of them reads the
+whole grocery item table instead of searching an index.
+
+A few queries read the table in index order on purpose: the full inventory
+list and the first LIMITed page of an ordering.  Those are marked as ordered
+walks; for them an index scan is accepted (it replaces the sort and stops at
+the LIMIT), but a scan of the table itself or a separate sort step still
+fails the audit.
+"""
+
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from grocery_app.django_models import GroceryItem, GroceryItemManager
+from grocery_app.notifications import notification_queryset
+from grocery_app.pagination import _keyset_filter
+
+# Plan lines that mean every row (of the table or of an index) is visited
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?grocery_app_groceryitem\b'),
+    'postgresql': re.compile(r'Seq Scan on grocery_app_groceryitem'),
+    # Tab-separated EXPLAIN rows: id, select_type, table, partitions, type
+    'mysql': re.compile(r'\tgrocery_app_groceryitem\t[^\t]*\t(?:ALL|index)\t'),
+}
+
+# Plan lines that mean the table itself is scanned, without any index
+TABLE_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?grocery_app_groceryitem\b(?! USING)'),
+    'postgresql': re.compile(r'Seq Scan on grocery_app_groceryitem'),
+    'mysql': re.compile(r'\tgrocery_app_groceryitem\t[^\t]*\tALL\t'),
+}
+
+# Plan lines that mean the rows are sorted after being read
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR ORDER BY'),
+    'postgresql': re.compile(r'^\s*(?:->\s*)?Sort\b', re.MULTILINE),
+    'mysql': re.compile(r'Using filesort'),
+}
+
+
+def audited_queries():
+    """The (label, queryset, ordered walk) triples issued by GroceryItemManager and notification hot paths"""
+    return [
+        ('get_all', GroceryItem.objects.all(), True),
+        ('get_page', GroceryItemManager.filter_queryset().order_by('name', 'id')[:13], True),
+        ('get_page (after cursor)', GroceryItemManager.filter_queryset().filter(
+            _keyset_filter(('name', 'id'), ('Milk', 1), True)).order_by('name', 'id')[:13], False),
+        ('get_page (category)', GroceryItemManager.filter_queryset({'category': 'Other'}).order_by('name', 'id')[:13],
+         False),
+        ('get_expiring_items', GroceryItemManager.expiring_queryset(7), False),
+        ('get_low_stock_items', GroceryItemManager.low_stock_queryset(3), False),
+        ('calculate_spending (recent)', GroceryItemManager.purchases_queryset(30).order_by('-last_purchased')[:10],
+         False),
+        ('recently updated', GroceryItem.objects.order_by('-updated_at', '-id')[:12], True),
+        ('notifications', notification_queryset(), False),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN every GroceryItemManager query and fail if any performs a full table scan'
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Query plan audit is not supported on {vendor}")
+
+        failures = []
+        for label, queryset, ordered_walk in audited_queries():
+            plan = queryset.explain()
+            if ordered_walk:
+                failed = bool(TABLE_SCAN_PATTERNS[vendor].search(plan) or SORT_PATTERNS[vendor].search(plan))
+                passed = self.style.WARNING('ordered index walk')
+            else:
+                failed = bool(FULL_SCAN_PATTERNS[vendor].search(plan))
+                passed = self.style.SUCCESS('ok')
+            status = self.style.ERROR('FULL SCAN') if failed else passed
+            self.stdout.write(f"{label}: {status}")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+            if failed:
+                failures.append(label)
+
+        if failures:
+            raise CommandError(f"Full table scan in: {', '.join(failures)}")
+
+        self.stdout.write(self.style.SUCCESS('All GroceryItemManager queries use an index'))
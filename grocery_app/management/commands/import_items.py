@@ -0,0 +1,59 @@
+"""
+Bulk import grocery items from a CSV or JSON Lines file
+
+The file is streamed, validated and written in batches (see
+grocery_app.imports), so large receipt dumps import without loading the
+whole file into memory.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from grocery_app.imports import DEFAULT_BATCH_SIZE, ItemImporter, detect_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = 'Import grocery items from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file to import')
+        parser.add_argument('--format', choices=('csv', 'jsonl'),
+                            help='Input format (default: guessed from the file extension)')
+        parser.add_argument('--target', choices=('sqlite', 'mongodb'), default='sqlite',
+                            help='Inventory to import into (default: sqlite)')
+        parser.add_argument('--user-id', help='Owner of the imported items (required for mongodb)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows validated and written per batch (default: {DEFAULT_BATCH_SIZE})')
+        parser.add_argument('--show-rejected', action='store_true',
+                            help='Print every rejected row with its errors')
+
+    def handle(self, *args, **options):
+        import_format = options['format'] or detect_format(options['path'])
+        try:
+            importer = ItemImporter(target=options['target'], user_id=options['user_id'],
+                                    batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                report = importer.run(iter_rows(stream, import_format))
+        except OSError as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        if options['show_rejected']:
+            for rejection in report['rejected']:
+                self.stdout.write(f"  line {rejection['line']}: {'; '.join(rejection['errors'])}")
+
+        self.stdout.write(
+            f"Processed {report['processed']} rows in {report['elapsed_seconds']}s "
+            f"({report['rows_per_second']} rows/s)"
+        )
+        self.stdout.write(
+            f"Rejected {report['rejected_count']}, skipped {report['duplicates']} duplicates, "
+            f"{report['warnings']} warnings"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Imported {report['imported']} items"))
+        if options['verbosity'] > 1:
+            self.stdout.write(json.dumps(report, indent=2))
@@ -0,0 +1,20 @@
+"""
+Rebuild the analytics rollup tables
+
+Recomputes CategoryRollup and DailySpendRollup from the GroceryItem table.
+Use after bulk loads or any writes that bypassed GroceryItemManager.
+"""
+
+from django.core.management.base import BaseCommand
+
+from grocery_app.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the CategoryRollup and DailySpendRollup tables from scratch'
+
+    def handle(self, *args, **options):
+        categories, days = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {categories} category rollups and {days} daily spend rollups"
+        ))
@@ -0,0 +1,35 @@
+"""
+Scan the inventory for expiry, low-stock and stale alerts
+
+Rewrites the InventoryAlert table for every alert threshold set in use (see
+grocery_app.alerts).  With --loop it keeps running and rescans at every
+scan window boundary, including midnight (see grocery_app.alert_scanner).
+"""
+
+from django.core.management.base import BaseCommand
+
+from grocery_app.alert_scanner import AlertScanner
+from grocery_app.alerts import scan_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute the InventoryAlert table for every threshold set in use'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running and rescan at every scan window boundary')
+
+    def handle(self, *args, **options):
+        if options['loop']:
+            self.stdout.write('Scanning inventory alerts until interrupted')
+            try:
+                AlertScanner().run_forever()
+            except KeyboardInterrupt:
+                pass
+            return
+
+        result = scan_all()
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned alerts for {result['users']} users in {result['threshold_sets']} threshold sets "
+            f"({result['changes']} changes)"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(condition=models.Q(('expiry_date__isnull', False)), fields=['expiry_date', 'name'], name='grocery_expiry_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(fields=['quantity', 'name'], name='grocery_quantity_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(fields=['category', 'name'], name='grocery_category_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(condition=models.Q(('last_purchased__isnull', False), ('price__gt', 0)), fields=['last_purchased', 'category'], name='grocery_purchased_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(fields=['updated_at', 'id'], name='grocery_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations, OperationalError
+
+# NOTE: SQLite drops these triggers whenever Django rebuilds grocery_app_groceryitem
+# (most AlterField/RemoveField migrations do).  fulltext.fts_available() recreates
+# missing triggers and rebuilds the index on first use; keep fulltext.FTS_TRIGGERS
+# in step with the definitions below.
+
+FTS_TABLE = 'grocery_app_groceryitem_fts'
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, brand, category, notes,
+        content='grocery_app_groceryitem', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, brand, category, notes)
+        VALUES (new.id, new.name, new.brand, new.category, new.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, brand, category, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.category, old.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, brand, category, notes
+    ON grocery_app_groceryitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, brand, category, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.category, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, name, brand, category, notes)
+        VALUES (new.id, new.name, new.brand, new.category, new.notes);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def create_fts(apps, schema_editor):
+    """SQLite only; builds without FTS5 keep using the trigram index"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+    except OperationalError:
+        # "no such module: fts5"
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0002_grocery_item_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_rollups(apps, schema_editor):
+    from grocery_app.rollups import rebuild_rollups
+
+    rebuild_rollups(
+        apps.get_model('grocery_app', 'GroceryItem'),
+        apps.get_model('grocery_app', 'CategoryRollup'),
+        apps.get_model('grocery_app', 'DailySpendRollup'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0003_grocery_item_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50)),
+                ('item_count', models.IntegerField(default=0)),
+                ('total_quantity', models.BigIntegerField(default=0)),
+                ('priced_count', models.IntegerField(default=0)),
+                ('active_count', models.IntegerField(default=0)),
+                ('zero_quantity_count', models.IntegerField(default=0)),
+                ('total_value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('active_value', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['category'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'category'), name='grocery_catrollup_user_uniq'), models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('category',), name='grocery_catrollup_shared_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySpendRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('purchase_count', models.IntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day', 'category'],
+                'indexes': [models.Index(fields=['user', 'day'], name='grocery_spend_user_day_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'category', 'day'), name='grocery_spend_user_uniq'), models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('category', 'day'), name='grocery_spend_shared_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0004_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(fields=['last_purchased'], name='grocery_last_purchased_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0005_grocery_item_last_purchased_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryAlertScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('low_stock_threshold', models.IntegerField()),
+                ('expiry_warning_days', models.IntegerField()),
+                ('inventory_version', models.BigIntegerField(default=0)),
+                ('window', models.CharField(blank=True, max_length=20)),
+                ('scanned_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('low_stock_threshold', 'expiry_warning_days')},
+            },
+        ),
+        migrations.CreateModel(
+            name='InventoryAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('urgent', 'Expires Today'), ('warning', 'Expiring Soon'), ('low_stock', 'Low Stock'), ('stale', 'Not Purchased Recently')], max_length=20)),
+                ('days_until_expiry', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='grocery_app.groceryitem')),
+                ('scan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='grocery_app.inventoryalertscan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scan', 'kind'], name='grocery_alert_scan_kind_idx')],
+                'unique_together': {('scan', 'item', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:06
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0006_inventory_alerts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groceryitem',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='grocery_name_lower_idx'),
+        ),
+    ]
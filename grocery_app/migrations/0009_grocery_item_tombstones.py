@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grocery_app', '0008_inventory_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroceryItemTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
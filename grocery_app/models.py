@@ -12,20 +12,28 @@ from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional, Any
 import json
-from pymongo import MongoClient
+import re
+from pymongo import InsertOne, UpdateOne, DeleteOne, IndexModel, ASCENDING, DESCENDING, TEXT
+from pymongo.errors import BulkWriteError, OperationFailure
 from bson import ObjectId
 
 logger = logging.getLogger('grocery_app')
 
 # Import the Django models
 from .django_models import GroceryItem, GroceryItemManager, AnalyticsModel
+from .inventory_cache import bump_inventory_version
+from . import events
+from . import mongo_pool
 
 
 class MongoDBConnection:
-    """Singleton MongoDB connection manager"""
+    """Singleton MongoDB connection manager (clients come from the shared mongo_pool registry)"""
     _instance = None
     _client = None
     _db = None
+    _generation = None
+
+    FALLBACK_URI = 'mongodb://localhost:27017/'
 
     def __new__(cls):
         if cls._instance is None:
@@ -33,34 +41,32 @@ class MongoDBConnection:
         return cls._instance
 
     def __init__(self):
-        if self._client is None:
+        if self._client is None or self._generation != mongo_pool.registry.generation:
             self.connect()
 
     def connect(self):
-        """Establish MongoDB connection"""
+        """Establish MongoDB connection (raises MongoUnavailable at once while the circuit breaker is open)"""
+        self._generation = mongo_pool.registry.generation
+        self._client = self._db = None
+        mongo_settings = settings.MONGODB_SETTINGS
+        connection_string = mongo_pool.build_connection_string(mongo_settings)
         try:
-            mongo_settings = settings.MONGODB_SETTINGS
-
-            # Build connection string
-            if mongo_settings['username'] and mongo_settings['password']:
-                connection_string = f"mongodb://{mongo_settings['username']}:{mongo_settings['password']}@{mongo_settings['host']}:{mongo_settings['port']}/{mongo_settings['db_name']}"
-            else:
-                connection_string = f"mongodb://{mongo_settings['host']}:{mongo_settings['port']}"
-
-            self._client = MongoClient(connection_string)
-            self._db = self._client[mongo_settings['db_name']]
-
-            # Test connection
-            self._client.admin.command('ping')
+            client = mongo_pool.get_client(connection_string)
+            mongo_pool.ensure_available(client)
+            self._client, self._db = client, client[mongo_settings['db_name']]
             logger.info("Successfully connected to MongoDB")
 
         except Exception as e:
+            # No fallback while the breaker is open (it logged the outage) or when the fallback is the same server
+            if mongo_pool.registry.breaker.state != mongo_pool.CircuitBreaker.CLOSED \
+                    or connection_string.rstrip('/') == self.FALLBACK_URI.rstrip('/'):
+                raise
             logger.error(f"Failed to connect to MongoDB: {e}")
             # Fallback to local MongoDB without auth
             try:
-                self._client = MongoClient('mongodb://localhost:27017/')
-                self._db = self._client['smart_grocery_tracker']
-                self._client.admin.command('ping')
+                client = mongo_pool.get_client(self.FALLBACK_URI)
+                mongo_pool.ensure_available(client)
+                self._client, self._db = client, client['smart_grocery_tracker']
                 logger.info("Connected to local MongoDB without authentication")
             except Exception as fallback_error:
                 logger.error(f"Fallback connection also failed: {fallback_error}")
@@ -68,8 +74,10 @@ class MongoDBConnection:
 
     def get_database(self):
         """Get database instance"""
-        if self._db is None:
+        if self._db is None or self._generation != mongo_pool.registry.generation:
             self.connect()
+        else:
+            mongo_pool.ensure_available(self._client)
         return self._db
 
     def get_collection(self, collection_name: str):
@@ -126,33 +134,155 @@ class GroceryItem:
         'packages', 'boxes', 'cans', 'bottles'
     ]
 
+    # Default number of operations sent per bulk_write call
+    BULK_BATCH_SIZE = 1000
+
+    # Fields rendered by the list pages and JSON APIs; heavy fields such as
+    # nutritional_info stay on the server until the item is opened
+    LIST_PROJECTION = {
+        'name': 1, 'category': 1, 'quantity': 1, 'unit': 1,
+        'expiry_date': 1, 'last_purchased': 1, 'price': 1,
+        'brand': 1, 'store': 1, 'notes': 1,
+        'created_at': 1, 'updated_at': 1,
+    }
+
+    # Every per-user query leads with user_id so it narrows to one user's
+    # documents before filtering or sorting
+    INDEXES = [
+        IndexModel([('user_id', ASCENDING), ('updated_at', DESCENDING), ('_id', DESCENDING)],
+                   name='user_updated_idx'),
+        IndexModel([('user_id', ASCENDING), ('expiry_date', ASCENDING)], name='user_expiry_idx'),
+        IndexModel([('user_id', ASCENDING), ('quantity', ASCENDING)], name='user_quantity_idx'),
+        IndexModel([('user_id', ASCENDING), ('last_purchased', DESCENDING)], name='user_purchased_idx'),
+        IndexModel([('user_id', ASCENDING), ('name_lower', ASCENDING)], name='user_name_prefix_idx'),
+        IndexModel([('name', TEXT), ('brand', TEXT), ('category', TEXT), ('notes', TEXT)],
+                   weights={'name': 10, 'brand': 5, 'category': 3, 'notes': 1},
+                   default_language='english', name='item_text_idx'),
+    ]
+
+    _indexes_ensured = False
+
+    # Search tuning: prefix (type-ahead) matches rank above word matches of
+    # equal text score, and a single search never returns more than this
+    PREFIX_MATCH_SCORE = 10.0
+    SEARCH_LIMIT = 50
+
     def __init__(self):
         self.db_connection = MongoDBConnection()
         self.collection = self.db_connection.get_collection(self.COLLECTION_NAME)
+        if not GroceryItem._indexes_ensured:
+            self.ensure_indexes(self.collection)
+
+    @classmethod
+    def ensure_indexes(cls, collection=None) -> List[str]:
+        """
+        Create the grocery_items indexes if they are missing
+
+        Safe to call repeatedly: MongoDB treats an identical index definition
+        as a no-op.  Runs once per process from __init__.
+
+        Returns:
+            Names of the indexes that are in place
+        """
+        if collection is None:
+            collection = MongoDBConnection().get_collection(cls.COLLECTION_NAME)
+        try:
+            names = collection.create_indexes(cls.INDEXES)
+            cls._indexes_ensured = True
+            return names
+        except OperationFailure as e:
+            # An index with the same name but different keys/options already exists
+            cls._indexes_ensured = True
+            logger.error(f"Error creating grocery item indexes: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Error creating grocery item indexes: {e}")
+            return []
 
-    def create(self, item_data: Dict[str, Any]) -> str:
-        """Create a new grocery item"""
+    @classmethod
+    def backfill_search_fields(cls, collection=None) -> int:
+        """
+        Fill in name_lower on documents written before prefix search existed
+
+        Returns:
+            Number of documents updated
+        """
+        if collection is None:
+            collection = MongoDBConnection().get_collection(cls.COLLECTION_NAME)
         try:
-            # Add timestamps
-            now = datetime.utcnow()
-            item_data['created_at'] = now
-            item_data['updated_at'] = now
+            result = collection.update_many(
+                {'name_lower': {'$exists': False}, 'name': {'$type': 'string'}},
+                [{'$set': {'name_lower': {'$toLower': '$name'}}}]
+            )
+            return result.modified_count
+        except Exception as e:
+            logger.error(f"Error backfilling grocery item search fields: {e}")
+            return 0
+
+    @staticmethod
+    def _normalize_name(name: Any) -> str:
+        """Lowercased, whitespace-collapsed name used for prefix matching"""
+        return ' '.join(str(name).split()).lower()
+
+    @staticmethod
+    def _text_search_terms(search_term: str) -> str:
+        """Search words with $text operators removed (quotes make phrases, a leading '-' negates)"""
+        words = (word.lstrip('-') for word in str(search_term).replace('"', ' ').split())
+        return ' '.join(word for word in words if word)
+
+    @staticmethod
+    def _prepare_new_item(item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a new item and fill in timestamps and date fields"""
+        # Add timestamps
+        now = datetime.utcnow()
+        item_data['created_at'] = now
+        item_data['updated_at'] = now
+
+        # Validate required fields
+        required_fields = ['name', 'category', 'quantity', 'unit']
+        for field in required_fields:
+            if field not in item_data or not item_data[field]:
+                raise ValueError(f"Required field '{field}' is missing or empty")
+
+        # Convert date strings to datetime objects if needed
+        if 'expiry_date' in item_data and isinstance(item_data['expiry_date'], str):
+            item_data['expiry_date'] = datetime.fromisoformat(item_data['expiry_date'])
+
+        if 'last_purchased' in item_data and isinstance(item_data['last_purchased'], str):
+            item_data['last_purchased'] = datetime.fromisoformat(item_data['last_purchased'])
+
+        item_data['name_lower'] = GroceryItem._normalize_name(item_data['name'])
+
+        return item_data
 
-            # Validate required fields
-            required_fields = ['name', 'category', 'quantity', 'unit']
-            for field in required_fields:
-                if field not in item_data or not item_data[field]:
-                    raise ValueError(f"Required field '{field}' is missing or empty")
+    @staticmethod
+    def _prepare_update(update_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Stamp updated_at and convert date fields of an update"""
+        # Add updated timestamp
+        update_data['updated_at'] = datetime.utcnow()
 
-            # Convert date strings to datetime objects if needed
-            if 'expiry_date' in item_data and isinstance(item_data['expiry_date'], str):
-                item_data['expiry_date'] = datetime.fromisoformat(item_data['expiry_date'])
+        # Convert date strings to datetime objects if needed
+        if 'expiry_date' in update_data and isinstance(update_data['expiry_date'], str):
+            update_data['expiry_date'] = datetime.fromisoformat(update_data['expiry_date'])
 
-            if 'last_purchased' in item_data and isinstance(item_data['last_purchased'], str):
-                item_data['last_purchased'] = datetime.fromisoformat(item_data['last_purchased'])
+        if 'last_purchased' in update_data and isinstance(update_data['last_purchased'], str):
+            update_data['last_purchased'] = datetime.fromisoformat(update_data['last_purchased'])
+
+        if update_data.get('name'):
+            update_data['name_lower'] = GroceryItem._normalize_name(update_data['name'])
+
+        return update_data
+
+    def create(self, item_data: Dict[str, Any]) -> str:
+        """Create a new grocery item"""
+        try:
+            self._prepare_new_item(item_data)
 
             # Insert item
             result = self.collection.insert_one(item_data)
+            bump_inventory_version(item_data.get('user_id'))
+            events.publish_item_change(events.CREATED, items=[item_data], user_id=item_data.get('user_id'),
+                                       source='mongodb')
             logger.info(f"Created grocery item: {item_data['name']}")
             return str(result.inserted_id)
 
@@ -172,31 +302,37 @@ class GroceryItem:
             logger.error(f"Error getting grocery item by ID {item_id}: {e}")
             return None
 
-    def get_all(self, user_id: Optional[str] = None, filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
-        """Get all grocery items with optional filtering"""
-        try:
-            query = {}
+    def _build_query(self, user_id: Optional[str] = None, filters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Build the find() filter for the list filters"""
+        query = {}
 
-            # Add user filter if provided
-            if user_id:
-                query['user_id'] = user_id
+        # Add user filter if provided
+        if user_id:
+            query['user_id'] = user_id
 
-            # Add additional filters
-            if filters:
-                if 'category' in filters and filters['category']:
-                    query['category'] = filters['category']
+        # Add additional filters
+        if filters:
+            if 'category' in filters and filters['category']:
+                query['category'] = filters['category']
 
-                if 'search' in filters and filters['search']:
-                    query['name'] = {'$regex': filters['search'], '$options': 'i'}
+            if 'search' in filters and filters['search']:
+                query['name'] = {'$regex': re.escape(filters['search']), '$options': 'i'}
 
-                if 'expiring_soon' in filters and filters['expiring_soon']:
-                    # Items expiring in next 7 days
-                    from datetime import timedelta
-                    next_week = datetime.utcnow() + timedelta(days=7)
-                    query['expiry_date'] = {'$lte': next_week, '$gte': datetime.utcnow()}
+            if 'expiring_soon' in filters and filters['expiring_soon']:
+                # Items expiring in next 7 days
+                from datetime import timedelta
+                next_week = datetime.utcnow() + timedelta(days=7)
+                query['expiry_date'] = {'$lte': next_week, '$gte': datetime.utcnow()}
+
+        return query
+
+    def get_all(self, user_id: Optional[str] = None, filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """Get all grocery items with optional filtering"""
+        try:
+            query = self._build_query(user_id, filters)
 
             # Sort by updated_at descending
-            items = list(self.collection.find(query).sort("updated_at", -1))
+            items = list(self.collection.find(query, self.LIST_PROJECTION).sort("updated_at", -1))
 
             # Convert ObjectId to string and rename _id to id
             for item in items:
@@ -209,25 +345,49 @@ class GroceryItem:
             logger.error(f"Error getting grocery items: {e}")
             return []
 
-    def update(self, item_id: str, update_data: Dict[str, Any]) -> bool:
-        """Update grocery item"""
+    def get_page(self, user_id: Optional[str] = None, filters: Optional[Dict] = None,
+                 cursor: Optional[str] = None, page_size: int = 12, with_total: bool = False):
+        """Get one page of grocery items ordered by (updated_at, _id) descending using keyset pagination"""
+        from .pagination import KeysetPage, paginate_collection
+
         try:
-            # Add updated timestamp
-            update_data['updated_at'] = datetime.utcnow()
+            page = paginate_collection(
+                self.collection,
+                self._build_query(user_id, filters),
+                cursor=cursor,
+                sort=(('updated_at', -1), ('_id', -1)),
+                page_size=page_size,
+                projection=self.LIST_PROJECTION,
+                with_total=with_total
+            )
 
-            # Convert date strings to datetime objects if needed
-            if 'expiry_date' in update_data and isinstance(update_data['expiry_date'], str):
-                update_data['expiry_date'] = datetime.fromisoformat(update_data['expiry_date'])
+            # Convert ObjectId to string and rename _id to id
+            for item in page:
+                item['id'] = str(item['_id'])
+                del item['_id']
+
+            return page
 
-            if 'last_purchased' in update_data and isinstance(update_data['last_purchased'], str):
-                update_data['last_purchased'] = datetime.fromisoformat(update_data['last_purchased'])
+        except Exception as e:
+            logger.error(f"Error getting grocery items page: {e}")
+            return KeysetPage([])
 
-            result = self.collection.update_one(
+    def update(self, item_id: str, update_data: Dict[str, Any]) -> bool:
+        """Update grocery item"""
+        try:
+            self._prepare_update(update_data)
+
+            # Read the owner back in the same round trip so only their caches are invalidated
+            previous = self.collection.find_one_and_update(
                 {"_id": ObjectId(item_id)},
-                {"$set": update_data}
+                {"$set": update_data},
+                projection={'user_id': 1}
             )
 
-            if result.modified_count > 0:
+            if previous is not None:
+                owner = previous.get('user_id')
+                bump_inventory_version(owner)
+                events.publish_item_change(events.UPDATED, item_ids=[item_id], user_id=owner, source='mongodb')
                 logger.info(f"Updated grocery item: {item_id}")
                 return True
             return False
@@ -239,8 +399,11 @@ class GroceryItem:
     def delete(self, item_id: str) -> bool:
         """Delete grocery item"""
         try:
-            result = self.collection.delete_one({"_id": ObjectId(item_id)})
-            if result.deleted_count > 0:
+            deleted = self.collection.find_one_and_delete({"_id": ObjectId(item_id)}, projection={'user_id': 1})
+            if deleted is not None:
+                owner = deleted.get('user_id')
+                bump_inventory_version(owner)
+                events.publish_item_change(events.DELETED, item_ids=[item_id], user_id=owner, source='mongodb')
                 logger.info(f"Deleted grocery item: {item_id}")
                 return True
             return False
@@ -248,6 +411,123 @@ class GroceryItem:
             logger.error(f"Error deleting grocery item {item_id}: {e}")
             return False
 
+    def bulk_write_items(self, operations: List[Dict[str, Any]], user_id: Optional[str] = None,
+                         batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply many inserts, updates and deletes with unordered bulk_write calls
+
+        Args:
+            operations: List of {"op": "insert"|"update"|"delete", "item_id": str, "data": dict}
+            user_id: Owner stamped on inserts and required to match on updates/deletes
+            batch_size: Operations per bulk_write round trip (default: BULK_BATCH_SIZE)
+
+        Returns:
+            Dictionary with per-operation results and aggregate counts
+        """
+        batch_size = batch_size or self.BULK_BATCH_SIZE
+        results: List[Dict[str, Any]] = []
+        requests = []  # (result index, op, pymongo request, target _id for updates/deletes)
+
+        # Validate and translate every operation up front
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                results.append({'index': index, 'op': None, 'item_id': None, 'success': False,
+                                'error': 'Operation must be an object'})
+                continue
+            op = operation.get('op')
+            result = {'index': index, 'op': op, 'item_id': operation.get('item_id'), 'success': False}
+            results.append(result)
+            try:
+                if op == 'insert':
+                    document = self._prepare_new_item(dict(operation.get('data') or {}))
+                    if user_id:
+                        document['user_id'] = user_id
+                    document['_id'] = ObjectId()
+                    result['item_id'] = str(document['_id'])
+                    requests.append((index, op, InsertOne(document), None))
+                elif op in ('update', 'delete'):
+                    selector = {'_id': ObjectId(operation.get('item_id'))}
+                    if user_id:
+                        selector['user_id'] = user_id
+                    if op == 'update':
+                        update_data = self._prepare_update(dict(operation.get('data') or {}))
+                        update_data.pop('_id', None)
+                        update_data.pop('user_id', None)
+                        requests.append((index, op, UpdateOne(selector, {'$set': update_data}), selector['_id']))
+                    else:
+                        requests.append((index, op, DeleteOne(selector), selector['_id']))
+                else:
+                    raise ValueError(f"Unknown operation '{op}'")
+            except Exception as e:
+                result['error'] = str(e)
+
+        counts = {'inserted': 0, 'matched': 0, 'modified': 0, 'deleted': 0}
+        for start in range(0, len(requests), batch_size):
+            batch = requests[start:start + batch_size]
+
+            # Updates and deletes of items that don't exist (or aren't the user's) fail individually
+            existing = self._existing_targets(batch, user_id)
+            for index, _, _, target in batch:
+                if target is not None and target not in existing:
+                    results[index]['error'] = 'Item not found or access denied'
+            batch = [entry for entry in batch if entry[3] is None or entry[3] in existing]
+            if not batch:
+                continue
+
+            failed = {}
+            try:
+                bulk_result = self.collection.bulk_write([request for _, _, request, _ in batch], ordered=False)
+                details = bulk_result.bulk_api_result
+            except BulkWriteError as e:
+                details = e.details
+                for write_error in details.get('writeErrors', []):
+                    failed[write_error['index']] = write_error.get('errmsg', 'Write failed')
+            except Exception as e:
+                logger.error(f"Error in grocery items bulk write: {e}")
+                failed = {position: str(e) for position in range(len(batch))}
+                details = {}
+
+            counts['inserted'] += details.get('nInserted', 0)
+            counts['matched'] += details.get('nMatched', 0)
+            counts['modified'] += details.get('nModified', 0)
+            counts['deleted'] += details.get('nRemoved', 0)
+
+            for position, (index, _, _, _) in enumerate(batch):
+                if position in failed:
+                    results[index]['error'] = failed[position]
+                else:
+                    results[index]['success'] = True
+
+            written = [op for position, (_, op, _, _) in enumerate(batch) if position not in failed]
+            if details and (details.get('nMatched', 0) < written.count('update')
+                            or details.get('nRemoved', 0) < written.count('delete')):
+                # A concurrent writer removed a target between the lookup and the write
+                logger.warning(f"Bulk write matched fewer items than were found: {details}")
+
+        if counts['inserted'] or counts['modified'] or counts['deleted']:
+            bump_inventory_version(user_id)
+            for op, action in (('insert', events.CREATED), ('update', events.UPDATED), ('delete', events.DELETED)):
+                item_ids = [result['item_id'] for result in results if result['success'] and result['op'] == op]
+                if item_ids:
+                    events.publish_item_change(action, item_ids=item_ids, user_id=user_id, source='mongodb')
+        logger.info(f"Bulk wrote grocery items: {counts}")
+
+        return {
+            'results': results,
+            'successful': sum(1 for result in results if result['success']),
+            **counts,
+        }
+
+    def _existing_targets(self, batch, user_id: Optional[str] = None) -> set:
+        """_ids of the batch's update/delete targets that exist (and belong to the user), in one query"""
+        target_ids = [target for _, _, _, target in batch if target is not None]
+        if not target_ids:
+            return set()
+        lookup = {'_id': {'$in': target_ids}}
+        if user_id:
+            lookup['user_id'] = user_id
+        return {doc['_id'] for doc in self.collection.find(lookup, {'_id': 1})}
+
     def get_expiring_items(self, days: int = 7, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get items expiring within specified days"""
         try:
@@ -263,7 +543,7 @@ class GroceryItem:
             if user_id:
                 query['user_id'] = user_id
 
-            items = list(self.collection.find(query).sort("expiry_date", 1))
+            items = list(self.collection.find(query, self.LIST_PROJECTION).sort("expiry_date", 1))
 
             # Convert ObjectId to string and rename _id to id
             for item in items:
@@ -284,7 +564,7 @@ class GroceryItem:
             if user_id:
                 query['user_id'] = user_id
 
-            items = list(self.collection.find(query).sort("quantity", 1))
+            items = list(self.collection.find(query, self.LIST_PROJECTION).sort("quantity", 1))
 
             # Convert ObjectId to string and rename _id to id
             for item in items:
@@ -325,22 +605,47 @@ class GroceryItem:
             logger.error(f"Error getting category statistics: {e}")
             return {}
 
-    def search_items(self, search_term: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search items by name, category, or brand"""
+    def search_items(self, search_term: str, user_id: Optional[str] = None, mode: str = 'auto',
+                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search items by name, category, brand, or notes
+
+        Full words are matched through the weighted text index; the start of
+        the item name is matched through the name_lower prefix index, so
+        type-ahead works on partial words.  User input is never used as a
+        regular expression, and quotes and leading '-' are stripped before
+        it reaches $text, so every word is a plain search term.
+
+        Args:
+            search_term: Text typed by the user
+            user_id: Restrict to this user's items
+            mode: 'text' (whole words), 'prefix' (name starts with) or 'auto' (both)
+            limit: Maximum number of results (default SEARCH_LIMIT)
+
+        Returns:
+            Items sorted by descending relevance, each with a 'score' key
+        """
         try:
-            query = {
-                "$or": [
-                    {"name": {"$regex": search_term, "$options": "i"}},
-                    {"category": {"$regex": search_term, "$options": "i"}},
-                    {"brand": {"$regex": search_term, "$options": "i"}},
-                    {"notes": {"$regex": search_term, "$options": "i"}}
-                ]
-            }
-
-            if user_id:
-                query["user_id"] = user_id
-
-            items = list(self.collection.find(query).sort("updated_at", -1))
+            limit = limit or self.SEARCH_LIMIT
+            scored: Dict[ObjectId, Dict[str, Any]] = {}
+
+            if mode in ('text', 'auto'):
+                try:
+                    for item in self._text_search(search_term, user_id, limit):
+                        scored[item['_id']] = item
+                except Exception as e:
+                    # Keep the prefix matches (e.g. while the text index is missing)
+                    logger.warning(f"Text search failed, using prefix matches only: {e}")
+
+            if mode in ('prefix', 'auto'):
+                for item in self._prefix_search(search_term, user_id, limit):
+                    if item['_id'] in scored:
+                        scored[item['_id']]['score'] += self.PREFIX_MATCH_SCORE
+                    else:
+                        item['score'] = self.PREFIX_MATCH_SCORE
+                        scored[item['_id']] = item
+
+            items = sorted(scored.values(), key=lambda item: (-item['score'], item.get('name', '')))[:limit]
 
             # Convert ObjectId to string and rename _id to id
             for item in items:
@@ -353,6 +658,35 @@ class GroceryItem:
             logger.error(f"Error searching items: {e}")
             return []
 
+    def _text_search(self, search_term: str, user_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Whole-word matches ranked by the text index score"""
+        terms = self._text_search_terms(search_term)
+        if not terms:
+            return []
+
+        query: Dict[str, Any] = {'$text': {'$search': terms}}
+        if user_id:
+            query['user_id'] = user_id
+
+        projection = {**self.LIST_PROJECTION, 'score': {'$meta': 'textScore'}}
+        return list(
+            self.collection.find(query, projection)
+            .sort([('score', {'$meta': 'textScore'})])
+            .limit(limit)
+        )
+
+    def _prefix_search(self, search_term: str, user_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Items whose normalized name starts with the search term, as an index range scan"""
+        prefix = self._normalize_name(search_term)
+        if not prefix:
+            return []
+
+        query: Dict[str, Any] = {'name_lower': {'$gte': prefix, '$lt': prefix + '\uffff'}}
+        if user_id:
+            query['user_id'] = user_id
+
+        return list(self.collection.find(query, self.LIST_PROJECTION).sort('name_lower', 1).limit(limit))
+
 
 class AnalyticsModel:
     """Analytics and AI-powered insights for grocery data"""
@@ -370,7 +704,7 @@ class AnalyticsModel:
                 query["user_id"] = user_id
 
             # Get purchase history
-            purchases = list(self.grocery_collection.find(query).sort("last_purchased", -1))
+            purchases = list(self.grocery_collection.find(query, {"last_purchased": 1}).sort("last_purchased", -1))
 
             if len(purchases) < 2:
                 return {"rate": 0, "prediction": None, "confidence": "low"}
@@ -0,0 +1,429 @@
+"""
+Process-wide MongoDB client registry for Smart Grocery Tracker
+
+A MongoClient owns a connection pool and background monitor threads, so it
+is meant to be created once per process and shared.  The registry keeps one
+client per connection string, built with the pool limits and timeouts from
+settings.MONGODB_POOL_SETTINGS, and hands it to MongoDBConnection and
+accounts.models.MongoDBUserManager alike.
+
+Clients must not cross a fork: the registry notices a changed PID (and
+os.register_at_fork resets it in the child), so gunicorn and uwsgi workers
+build their own clients.  Call reset_after_fork() from a server's post-fork
+hook to drop the inherited clients eagerly.
+
+Pool events are counted per server by a ConnectionPoolListener and exposed
+through pool_stats() for monitoring.
+
+A circuit breaker sits in front of every client.  Consecutive failed pings
+or server heartbeats open it; while open, ensure_available() raises
+MongoUnavailable immediately instead of waiting for server selection.  After
+the recovery timeout one caller is let through to probe with a short ping
+(half-open); success closes the breaker, failure re-opens it.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+import pymongo
+from pymongo import MongoClient
+from pymongo import monitoring
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+logger = logging.getLogger('grocery_app')
+
+DEFAULT_POOL_SETTINGS = {
+    'max_pool_size': 50,
+    'min_pool_size': 0,
+    'max_idle_time_ms': 60000,
+    'server_selection_timeout_ms': 5000,
+    'connect_timeout_ms': 5000,
+    'socket_timeout_ms': 20000,
+    'wait_queue_timeout_ms': 10000,
+}
+
+DEFAULT_BREAKER_SETTINGS = {
+    'failure_threshold': 3,
+    'recovery_timeout': 30,
+    'probe_timeout_ms': 1000,
+}
+
+# MONGODB_POOL_SETTINGS keys -> MongoClient keyword arguments
+CLIENT_OPTIONS = {
+    'max_pool_size': 'maxPoolSize',
+    'min_pool_size': 'minPoolSize',
+    'max_idle_time_ms': 'maxIdleTimeMS',
+    'server_selection_timeout_ms': 'serverSelectionTimeoutMS',
+    'connect_timeout_ms': 'connectTimeoutMS',
+    'socket_timeout_ms': 'socketTimeoutMS',
+    'wait_queue_timeout_ms': 'waitQueueTimeoutMS',
+}
+
+
+def pool_settings() -> Dict[str, Any]:
+    """Pool settings with defaults filled in"""
+    configured = getattr(settings, 'MONGODB_POOL_SETTINGS', {}) or {}
+    return {**DEFAULT_POOL_SETTINGS, **configured}
+
+
+def client_options() -> Dict[str, Any]:
+    """MongoClient keyword arguments for the configured pool"""
+    configured = pool_settings()
+    return {option: configured[key] for key, option in CLIENT_OPTIONS.items() if configured[key] is not None}
+
+
+def breaker_settings() -> Dict[str, Any]:
+    """Circuit breaker settings with defaults filled in"""
+    configured = getattr(settings, 'MONGODB_CIRCUIT_BREAKER', {}) or {}
+    return {**DEFAULT_BREAKER_SETTINGS, **configured}
+
+
+def build_connection_string(mongo_settings: Optional[Dict[str, Any]] = None) -> str:
+    """Connection string for settings.MONGODB_SETTINGS (credentials are optional)"""
+    mongo_settings = mongo_settings if mongo_settings is not None else settings.MONGODB_SETTINGS
+    host = mongo_settings.get('host', 'localhost')
+    port = mongo_settings.get('port', 27017)
+    if mongo_settings.get('username') and mongo_settings.get('password'):
+        return (f"mongodb://{mongo_settings['username']}:{mongo_settings['password']}"
+                f"@{host}:{port}/{mongo_settings.get('db_name', '')}")
+    return f"mongodb://{host}:{port}"
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events per server address"""
+
+    COUNTERS = ('created', 'closed', 'checked_out', 'checked_in', 'checkout_failed', 'pool_cleared')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.COUNTERS, 0))
+
+    def _count(self, event, counter: str) -> None:
+        address = '%s:%s' % event.address
+        with self._lock:
+            self._stats[address][counter] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Counters per server, plus connections currently open and in use"""
+        with self._lock:
+            return {
+                address: {
+                    **counters,
+                    'open': counters['created'] - counters['closed'],
+                    'in_use': counters['checked_out'] - counters['checked_in'],
+                }
+                for address, counters in self._stats.items()
+            }
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._count(event, 'pool_cleared')
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count(event, 'created')
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count(event, 'closed')
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count(event, 'checkout_failed')
+
+    def connection_checked_out(self, event):
+        self._count(event, 'checked_out')
+
+    def connection_checked_in(self, event):
+        self._count(event, 'checked_in')
+
+
+class MongoUnavailable(ConnectionFailure):
+    """MongoDB is marked down by the circuit breaker (or just failed a probe)"""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker shared by all MongoDB clients
+
+    failure_threshold consecutive failures open it; after recovery_timeout
+    seconds a single probe is allowed through.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._last_error = ''
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def acquire(self) -> str:
+        """
+        Admit a call: returns the state it was admitted in ('closed', or
+        'half_open' for the single probe); raises MongoUnavailable otherwise
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return state
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return state
+            retry_in = max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        raise MongoUnavailable(f"MongoDB unavailable (circuit open, retry in {retry_in:.0f}s): {self._last_error}")
+
+    def release_probe(self) -> None:
+        """End a half-open probe that neither succeeded nor failed, so the next call probes again"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("MongoDB reachable again, closing circuit breaker")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error: Any = '') -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error)[:200]
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN or self._probing:
+                    logger.error(f"MongoDB marked unavailable for {self.recovery_timeout}s: {self._last_error}")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+            self._last_error = ''
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'failure_threshold': self.failure_threshold,
+            'recovery_timeout': self.recovery_timeout,
+            'last_error': self._last_error,
+        }
+
+
+class HeartbeatListener(monitoring.ServerHeartbeatListener):
+    """Feeds the client's background heartbeats into the circuit breaker"""
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.breaker.record_success()
+
+    def failed(self, event):
+        self.breaker.record_failure(event.reply)
+
+
+class MongoClientRegistry:
+    """One MongoClient per connection string per process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, MongoClient] = {}
+        self._listeners: Dict[str, PoolStatsListener] = {}
+        # ids of clients that have answered a ping since they were created
+        self._verified = set()
+        self._pid = os.getpid()
+        self._breaker: Optional[CircuitBreaker] = None
+        self._breaker_lock = threading.Lock()
+        # Bumped whenever clients are dropped, so holders of a database handle know to refresh it
+        self.generation = 0
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """
+        The circuit breaker, built from settings on first use
+
+        Importing this module must not touch settings (wsgi.py imports it
+        before DJANGO_SETTINGS_MODULE is set).
+        """
+        if self._breaker is None:
+            with self._breaker_lock:
+                if self._breaker is None:
+                    configured = breaker_settings()
+                    self._breaker = CircuitBreaker(configured['failure_threshold'], configured['recovery_timeout'])
+        return self._breaker
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self.reset_after_fork()
+
+    def get_client(self, uri: Optional[str] = None) -> MongoClient:
+        """The shared client for uri (default: settings.MONGODB_SETTINGS), created on first use"""
+        self._check_pid()
+        uri = uri or build_connection_string()
+        client = self._clients.get(uri)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(uri)
+            if client is None:
+                listener = PoolStatsListener()
+                client = MongoClient(uri, event_listeners=[listener, HeartbeatListener(self.breaker)],
+                                     **client_options())
+                self._clients[uri] = client
+                self._listeners[uri] = listener
+                logger.info(f"Created MongoDB client for {self._redact(uri)}")
+            return client
+
+    def get_database(self, name: Optional[str] = None, uri: Optional[str] = None):
+        """Database handle on the shared client"""
+        return self.get_client(uri)[name or settings.MONGODB_SETTINGS['db_name']]
+
+    def ensure_available(self, client: MongoClient) -> None:
+        """
+        Fail fast unless MongoDB is believed reachable
+
+        Pings (with the short probe timeout) when the breaker is half-open or
+        the client has never been verified; otherwise costs a lock and a
+        set lookup.  Raises MongoUnavailable.
+        """
+        state = self.breaker.acquire()
+        try:
+            if state == CircuitBreaker.HALF_OPEN or id(client) not in self._verified:
+                self.ping(client)
+        finally:
+            if state == CircuitBreaker.HALF_OPEN:
+                # A probe that raised something other than PyMongoError must not block every later probe
+                self.breaker.release_probe()
+
+    def ping(self, client: MongoClient) -> None:
+        """Ping with the probe timeout and record the outcome on the breaker"""
+        try:
+            with pymongo.timeout(breaker_settings()['probe_timeout_ms'] / 1000):
+                client.admin.command('ping')
+        except PyMongoError as e:
+            self._verified.discard(id(client))
+            self.breaker.record_failure(e)
+            raise MongoUnavailable(f"MongoDB ping failed: {e}") from e
+        self._verified.add(id(client))
+        self.breaker.record_success()
+
+    def close_all(self) -> None:
+        """Close every client (process shutdown, tests)"""
+        with self._lock:
+            clients, self._clients, self._listeners = self._clients, {}, {}
+            self._verified = set()
+            self.generation += 1
+        for client in clients.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.error(f"Error closing MongoDB client: {e}")
+
+    def reset_after_fork(self) -> None:
+        """
+        Forget clients inherited from the parent process
+
+        Their sockets and monitor threads belong to the parent, so they are
+        dropped without close(); new clients are created on demand.
+        """
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._listeners = {}
+        self._verified = set()
+        self._pid = os.getpid()
+        if self._breaker is not None:
+            self._breaker.reset()
+        self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and per-client connection counters"""
+        self._check_pid()
+        with self._lock:
+            listeners = list(self._listeners.items())
+        return {
+            'pid': self._pid,
+            'settings': pool_settings(),
+            'circuit_breaker': self.breaker.stats(),
+            'clients': {self._redact(uri): listener.snapshot() for uri, listener in listeners},
+        }
+
+    @staticmethod
+    def _redact(uri: str) -> str:
+        """Connection string without the password"""
+        scheme, _, rest = uri.partition('://')
+        credentials, at, host = rest.rpartition('@')
+        if not at:
+            return uri
+        return f"{scheme}://{credentials.split(':', 1)[0]}:***@{host}"
+
+
+registry = MongoClientRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry.reset_after_fork)
+
+
+def get_client(uri: Optional[str] = None) -> MongoClient:
+    """Shared MongoClient for the configured (or given) server"""
+    return registry.get_client(uri)
+
+
+def get_database(name: Optional[str] = None, uri: Optional[str] = None):
+    """Database on the shared MongoClient"""
+    return registry.get_database(name, uri)
+
+
+def ensure_available(client: MongoClient) -> None:
+    """Raise MongoUnavailable at once while the circuit breaker is open"""
+    registry.ensure_available(client)
+
+
+def reset_after_fork() -> None:
+    """Drop inherited clients; call from gunicorn post_fork / uwsgi postfork hooks"""
+    registry.reset_after_fork()
+
+
+def close_clients() -> None:
+    """Close all shared clients"""
+    registry.close_all()
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool and circuit breaker statistics for monitoring"""
+    return registry.stats()
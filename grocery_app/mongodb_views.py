@@ -5,7 +5,7 @@ This module contains views that use MongoDB for data storage instead of Django O
 """
 
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
@@ -18,6 +18,9 @@ import logging
 from bson import ObjectId
 
 from .models import GroceryItem as MongoGroceryItem, AnalyticsModel
+from .json_response import JsonResponse
+from .mongo_pool import MongoUnavailable
+from .pagination import parse_page_size
 
 logger = logging.getLogger('grocery_app')
 
@@ -41,8 +44,14 @@ def grocery_list_mongodb(request):
         # Get user ID (convert to string for MongoDB)
         user_id = str(request.user.id)
         
-        # Get all items for the user
-        items = grocery_model.get_all(user_id=user_id, filters=filters)
+        # Get one page of items for the user
+        items = grocery_model.get_page(
+            user_id=user_id,
+            filters=filters,
+            cursor=request.GET.get('cursor'),
+            page_size=12,
+            with_total=True
+        )
         
         # Get categories for filter dropdown
         categories = MongoGroceryItem.CATEGORIES
@@ -65,7 +74,9 @@ def grocery_list_mongodb(request):
             'low_stock_items': low_stock_items,
             'selected_category': category_filter,
             'search_query': search_query,
-            'total_items': len(items),
+            'total_items': items.total_count,
+            'next_cursor': items.next_cursor,
+            'previous_cursor': items.previous_cursor,
             'using_mongodb': True,  # Flag to indicate MongoDB usage
         }
         
@@ -243,18 +254,10 @@ def get_item_mongodb(request, item_id):
         if not item or item.get('user_id') != str(request.user.id):
             return JsonResponse({'error': 'Item not found or access denied'}, status=404)
         
-        # Convert datetime objects to strings for JSON serialization
-        if item.get('expiry_date'):
-            item['expiry_date'] = item['expiry_date'].isoformat()
-        if item.get('last_purchased'):
-            item['last_purchased'] = item['last_purchased'].isoformat()
-        if item.get('created_at'):
-            item['created_at'] = item['created_at'].isoformat()
-        if item.get('updated_at'):
-            item['updated_at'] = item['updated_at'].isoformat()
-        
         return JsonResponse({'item': item})
         
+    except MongoUnavailable as e:
+        return JsonResponse({'error': str(e)}, status=503)
     except Exception as e:
         logger.error(f"Error getting item from MongoDB: {e}")
         return JsonResponse({'error': str(e)}, status=500)
@@ -267,25 +270,21 @@ def search_items_mongodb(request):
         if not search_term:
             return JsonResponse({'items': []})
         
+        mode = request.GET.get('mode', 'auto')
+        if mode not in ('auto', 'text', 'prefix'):
+            return JsonResponse({'error': 'mode must be auto, text or prefix'}, status=400)
+        limit = parse_page_size(request.GET.get('limit'), default=MongoGroceryItem.SEARCH_LIMIT)
+        
         grocery_model = MongoGroceryItem()
         user_id = str(request.user.id)
         
-        # Search items
-        items = grocery_model.search_items(search_term, user_id=user_id)
-        
-        # Convert datetime objects to strings for JSON serialization
-        for item in items:
-            if item.get('expiry_date'):
-                item['expiry_date'] = item['expiry_date'].isoformat()
-            if item.get('last_purchased'):
-                item['last_purchased'] = item['last_purchased'].isoformat()
-            if item.get('created_at'):
-                item['created_at'] = item['created_at'].isoformat()
-            if item.get('updated_at'):
-                item['updated_at'] = item['updated_at'].isoformat()
+        # Search items, best matches first
+        items = grocery_model.search_items(search_term, user_id=user_id, mode=mode, limit=limit)
         
         return JsonResponse({'items': items})
         
+    except MongoUnavailable as e:
+        return JsonResponse({'error': str(e)}, status=503)
     except Exception as e:
         logger.error(f"Error searching items in MongoDB: {e}")
         return JsonResponse({'error': str(e)}, status=500)
@@ -325,3 +324,44 @@ def analytics_mongodb(request):
         logger.error(f"Error in analytics_mongodb: {e}")
         messages.error(request, f"Error loading analytics: {str(e)}")
         return render(request, 'grocery_app/analytics.html', {'using_mongodb': True})
+
+
+@login_required
+@require_http_methods(["POST"])
+def bulk_items_mongodb(request):
+    """Apply many inserts, updates and deletes to MongoDB in batched round trips"""
+    try:
+        data = json.loads(request.body)
+        operations = data.get('operations', [])
+
+        if not operations or not isinstance(operations, list):
+            return JsonResponse({'success': False, 'error': 'operations list required'}, status=400)
+
+        batch_size = data.get('batch_size')
+        if batch_size is not None:
+            batch_size = max(1, min(int(batch_size), MongoGroceryItem.BULK_BATCH_SIZE))
+
+        grocery_model = MongoGroceryItem()
+
+        # Scope every operation to the current user
+        result = grocery_model.bulk_write_items(
+            operations,
+            user_id=str(request.user.id),
+            batch_size=batch_size
+        )
+
+        logger.info(f"User {request.user.username} bulk wrote {result['successful']} items")
+
+        return JsonResponse({
+            'success': True,
+            'message': f"Successfully processed {result['successful']} out of {len(operations)} operations",
+            **result
+        })
+
+    except (ValueError, TypeError) as e:
+        return JsonResponse({'success': False, 'error': f'Invalid data: {str(e)}'}, status=400)
+    except MongoUnavailable as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=503)
+    except Exception as e:
+        logger.error(f"Error in MongoDB bulk write: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
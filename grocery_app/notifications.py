@@ -0,0 +1,161 @@
+"""
+Inventory notifications for Smart Grocery Tracker
+
+Every item that needs attention is classified in a single query: CASE
+expressions put each row into at most one expiry bucket (urgent: expires
+today, warning: within the user's warning window) and flag it as low stock
+and/or stale (not purchased for STALE_AFTER_DAYS).  The WHERE clause is an OR
+of index-backed ranges, so only candidate rows are read.  Thresholds come
+from the user's EssentialSettings.  The classification runs in the alert
+scanner (alerts.py); get_notifications() reads its InventoryAlert rows.
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from django.db.models import BooleanField, Case, CharField, Q, Value, When
+from django.utils import timezone
+
+from accounts.models import EssentialSettings
+
+from .django_models import GroceryItem
+
+logger = logging.getLogger('grocery_app')
+
+URGENT = 'urgent'
+WARNING = 'warning'
+LOW_STOCK = 'low_stock'
+STALE = 'stale'
+
+# Used for anonymous requests and users without EssentialSettings: the same
+# defaults a freshly saved EssentialSettings row gets
+DEFAULT_LOW_STOCK_THRESHOLD = EssentialSettings._meta.get_field('low_stock_threshold').default
+DEFAULT_EXPIRY_WARNING_DAYS = EssentialSettings._meta.get_field('expiry_warning_days').default
+STALE_AFTER_DAYS = 30
+
+NOTIFICATION_FIELDS = ('id', 'name', 'quantity', 'unit', 'expiry_date')
+
+
+def user_thresholds(user=None) -> Tuple[int, int]:
+    """(low_stock_threshold, expiry_warning_days) from the user's EssentialSettings"""
+    if user is None or not user.is_authenticated:
+        return DEFAULT_LOW_STOCK_THRESHOLD, DEFAULT_EXPIRY_WARNING_DAYS
+
+    try:
+        essential = user.essentialsettings
+    except EssentialSettings.DoesNotExist:
+        return DEFAULT_LOW_STOCK_THRESHOLD, DEFAULT_EXPIRY_WARNING_DAYS
+    return essential.low_stock_threshold, essential.expiry_warning_days
+
+
+def notification_queryset(low_stock_threshold: int = DEFAULT_LOW_STOCK_THRESHOLD,
+                          expiry_warning_days: int = DEFAULT_EXPIRY_WARNING_DAYS,
+                          now: Optional[datetime] = None, stale_days: int = STALE_AFTER_DAYS):
+    """
+    Items needing attention, annotated with expiry_bucket, low_stock and stale
+
+    Unordered on purpose: an ORDER BY would steer the planner to a full
+    index scan instead of one range lookup per OR branch.
+    """
+    now = now or timezone.now()
+    end_of_today = timezone.make_aware(datetime.combine(timezone.localdate(now) + timedelta(days=1), time.min))
+
+    urgent = Q(expiry_date__gte=now, expiry_date__lt=end_of_today)
+    warning = Q(expiry_date__gte=end_of_today, expiry_date__lte=now + timedelta(days=expiry_warning_days))
+    low_stock = Q(quantity__lte=low_stock_threshold)
+    stale = Q(last_purchased__lt=now - timedelta(days=stale_days))
+
+    return GroceryItem.objects.filter(urgent | warning | low_stock | stale).annotate(
+        expiry_bucket=Case(
+            When(urgent, then=Value(URGENT)),
+            When(warning, then=Value(WARNING)),
+            default=Value(''),
+            output_field=CharField(),
+        ),
+        low_stock=Case(When(low_stock, then=Value(True)), default=Value(False), output_field=BooleanField()),
+        stale=Case(When(stale, then=Value(True)), default=Value(False), output_field=BooleanField()),
+    ).order_by()
+
+
+def classify_items(low_stock_threshold: int = DEFAULT_LOW_STOCK_THRESHOLD,
+                   expiry_warning_days: int = DEFAULT_EXPIRY_WARNING_DAYS,
+                   now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Bucket the inventory for notifications with one query
+
+    Returns:
+        {'urgent': [...], 'warning': [...], 'low_stock': [...], 'stale': [...]}
+        of slim row dictionaries; each id appears at most once per bucket
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {URGENT: [], WARNING: [], LOW_STOCK: [], STALE: []}
+    seen = {bucket: set() for bucket in buckets}
+
+    rows = notification_queryset(low_stock_threshold, expiry_warning_days, now).values(
+        *NOTIFICATION_FIELDS, 'expiry_bucket', 'low_stock', 'stale'
+    )
+    for row in sorted(rows, key=lambda row: (row['name'], row['id'])):
+        for bucket, applies in ((row['expiry_bucket'], bool(row['expiry_bucket'])),
+                                (LOW_STOCK, row['low_stock']), (STALE, row['stale'])):
+            if applies and row['id'] not in seen[bucket]:
+                seen[bucket].add(row['id'])
+                buckets[bucket].append(row)
+    return buckets
+
+
+def build_notifications(buckets: Dict[str, List[Dict[str, Any]]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Notification dictionaries for the notifications API"""
+    today = timezone.localdate(now or timezone.now())
+    notifications = []
+
+    for item in buckets[URGENT]:
+        notifications.append({
+            'type': 'urgent',
+            'title': 'Item Expiring Today!',
+            'message': f'{item["name"]} expires today',
+            'item_id': str(item['id']),
+            'action': 'use_now'
+        })
+
+    for item in buckets[WARNING]:
+        days = (timezone.localdate(item['expiry_date']) - today).days
+        notifications.append({
+            'type': 'warning',
+            'title': 'Item Expiring Soon',
+            'message': f'{item["name"]} expires in {days} days',
+            'item_id': str(item['id']),
+            'action': 'plan_usage'
+        })
+
+    for item in buckets[LOW_STOCK]:
+        notifications.append({
+            'type': 'info',
+            'title': 'Low Stock Alert',
+            'message': f'Only {item["quantity"]} {item["unit"]} of {item["name"]} remaining',
+            'item_id': str(item['id']),
+            'action': 'restock'
+        })
+
+    if buckets[STALE]:
+        notifications.append({
+            'type': 'suggestion',
+            'title': 'Restock Suggestion',
+            'message': f'{len(buckets[STALE])} items haven\'t been purchased in {STALE_AFTER_DAYS}+ days',
+            'action': 'review_list'
+        })
+
+    return notifications
+
+
+def get_notifications(user=None) -> Dict[str, Any]:
+    """Notifications for a user from the precomputed alerts, with the thresholds that produced them"""
+    from .alerts import alert_buckets
+
+    low_stock_threshold, expiry_warning_days = user_thresholds(user)
+    notifications = build_notifications(alert_buckets(user))
+    return {
+        'notifications': notifications,
+        'count': len(notifications),
+        'low_stock_threshold': low_stock_threshold,
+        'expiry_warning_days': expiry_warning_days,
+    }
@@ -0,0 +1,282 @@
+"""
+Keyset (cursor) pagination for Smart Grocery Tracker
+
+Offset pagination makes every page pay for the whole table.  Keyset
+pagination remembers the sort key of the last row served and asks the
+database for the rows after it, so each request fetches exactly one page.
+Cursors are opaque, URL-safe tokens that encode the boundary row's sort key
+and the paging direction.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import base64
+import json
+import logging
+
+from django.db.models import Q
+try:
+    from bson import ObjectId
+except ImportError:
+    ObjectId = None
+
+logger = logging.getLogger('grocery_app')
+
+DEFAULT_PAGE_SIZE = 12
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values: Sequence[Any], direction: str = 'next') -> str:
+    """
+    Encode a boundary sort key into an opaque cursor token
+
+    Args:
+        values: Sort key values of the boundary row
+        direction: 'next' to page forward, 'prev' to page backward
+
+    Returns:
+        URL-safe cursor string
+    """
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({'dt': value.isoformat()})
+        elif ObjectId is not None and isinstance(value, ObjectId):
+            encoded.append({'oid': str(value)})
+        else:
+            encoded.append(value)
+    payload = json.dumps({'k': encoded, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor token
+
+    Returns:
+        Dictionary with 'values' and 'direction', or None for an empty or malformed token
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        values = []
+        for value in payload['k']:
+            if isinstance(value, dict) and 'dt' in value:
+                values.append(datetime.fromisoformat(value['dt']))
+            elif isinstance(value, dict) and 'oid' in value and ObjectId is not None:
+                values.append(ObjectId(value['oid']))
+            else:
+                values.append(value)
+        direction = payload.get('d', 'next')
+        if direction not in ('next', 'prev'):
+            return None
+        return {'values': values, 'direction': direction}
+    except Exception as e:
+        logger.warning(f"Ignoring invalid pagination cursor: {e}")
+        return None
+
+
+def parse_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE) -> int:
+    """Parse a page size parameter, clamped to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """
+    One page of keyset-paginated results
+
+    Iterable like a Paginator page; exposes opaque next/previous cursors
+    instead of page numbers.  total_count is only set when requested.
+    """
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str] = None,
+                 previous_cursor: Optional[str] = None, total_count: Optional[int] = None):
+        self.object_list = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total_count = total_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Pagination metadata for JSON responses"""
+        return {
+            'next_cursor': self.next_cursor,
+            'previous_cursor': self.previous_cursor,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'total_count': self.total_count,
+        }
+
+
+def _keyset_filter(fields: Sequence[str], values: Sequence[Any], forward: bool) -> Q:
+    """
+    Build the row-value comparison (f1, f2, ...) > (v1, v2, ...) as a Q object
+
+    Fields prefixed with '-' sort descending, which flips their comparison.
+    The OR of per-field comparisons is also bounded by a plain range on the
+    first field, so the database can seek an index on it instead of scanning.
+    """
+    condition = Q()
+    equal = Q()
+    bound = Q()
+    for position, (field, value) in enumerate(zip(fields, values)):
+        descending = field.startswith('-')
+        name = field.lstrip('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+        if position == 0 and len(fields) > 1 and value is not None:
+            bound = Q(**{f'{name}__{lookup}e': value})
+    return bound & condition
+
+
+def paginate_queryset(queryset, cursor: Optional[str] = None, ordering: Sequence[str] = ('name', 'id'),
+                      page_size: int = DEFAULT_PAGE_SIZE, with_total: bool = False,
+                      serializer=None) -> KeysetPage:
+    """
+    Fetch one page of a queryset using keyset pagination
+
+    Args:
+        queryset: Filtered queryset to paginate
+        cursor: Opaque cursor from a previous page (None for the first page)
+        ordering: Sort fields; the last one must be unique (usually 'id')
+        page_size: Rows per page
+        with_total: Also run a COUNT query for the total number of rows
+        serializer: Callable converting a model instance for output (default: to_dict)
+
+    Returns:
+        KeysetPage with serialized items and next/previous cursors
+    """
+    serializer = serializer or (lambda obj: obj.to_dict())
+    decoded, backward, page_queryset = _page_queryset(queryset, cursor, ordering, page_size)
+
+    rows = list(page_queryset)
+    total_count = queryset.count() if with_total else None
+    return _build_page(rows, ordering, page_size, decoded, backward, total_count, serializer)
+
+
+async def apaginate_queryset(queryset, cursor: Optional[str] = None, ordering: Sequence[str] = ('name', 'id'),
+                             page_size: int = DEFAULT_PAGE_SIZE, with_total: bool = False,
+                             serializer=None) -> KeysetPage:
+    """Async variant of paginate_queryset using the async ORM interface"""
+    serializer = serializer or (lambda obj: obj.to_dict())
+    decoded, backward, page_queryset = _page_queryset(queryset, cursor, ordering, page_size)
+
+    rows = [obj async for obj in page_queryset]
+    total_count = await queryset.acount() if with_total else None
+    return _build_page(rows, ordering, page_size, decoded, backward, total_count, serializer)
+
+
+def _page_queryset(queryset, cursor, ordering, page_size):
+    """Decode the cursor and build the (unevaluated) query for one page plus a lookahead row"""
+    decoded = decode_cursor(cursor)
+    backward = bool(decoded and decoded['direction'] == 'prev')
+
+    if backward:
+        page_ordering = [f[1:] if f.startswith('-') else f'-{f}' for f in ordering]
+    else:
+        page_ordering = list(ordering)
+
+    page_queryset = queryset
+    if decoded and len(decoded['values']) == len(ordering):
+        page_queryset = page_queryset.filter(_keyset_filter(ordering, decoded['values'], forward=not backward))
+
+    # Fetch one extra row to learn whether another page exists
+    return decoded, backward, page_queryset.order_by(*page_ordering)[:page_size + 1]
+
+
+def _build_page(rows, ordering, page_size, decoded, backward, total_count, serializer) -> KeysetPage:
+    """Trim the lookahead row, restore display order and attach cursors"""
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backward:
+        rows.reverse()
+
+    def key_of(obj):
+        return [getattr(obj, f.lstrip('-')) for f in ordering]
+
+    next_cursor, previous_cursor = _page_cursors(rows, key_of, decoded, backward, has_more)
+    return KeysetPage([serializer(obj) for obj in rows], next_cursor, previous_cursor, total_count)
+
+
+def _page_cursors(rows, key_of, decoded, backward, has_more):
+    """Build the next/previous cursors for a fetched page"""
+    if not rows:
+        return None, None
+    if backward:
+        # We came back from a later page, so one always follows
+        next_cursor = encode_cursor(key_of(rows[-1]), 'next')
+        previous_cursor = encode_cursor(key_of(rows[0]), 'prev') if has_more else None
+    else:
+        next_cursor = encode_cursor(key_of(rows[-1]), 'next') if has_more else None
+        previous_cursor = encode_cursor(key_of(rows[0]), 'prev') if decoded else None
+    return next_cursor, previous_cursor
+
+
+def paginate_collection(collection, query: Dict[str, Any], cursor: Optional[str] = None,
+                        sort: Sequence = (('updated_at', -1), ('_id', -1)),
+                        page_size: int = DEFAULT_PAGE_SIZE, projection: Optional[Dict[str, Any]] = None,
+                        with_total: bool = False) -> KeysetPage:
+    """
+    Fetch one page of a MongoDB collection using keyset pagination
+
+    Args:
+        collection: PyMongo collection
+        query: Base filter document
+        cursor: Opaque cursor from a previous page (None for the first page)
+        sort: (field, direction) pairs; the last one must be unique (usually '_id')
+        page_size: Documents per page
+        projection: Optional projection passed to find()
+        with_total: Also count matching documents
+
+    Returns:
+        KeysetPage of raw documents (with '_id' still present)
+    """
+    decoded = decode_cursor(cursor)
+    backward = bool(decoded and decoded['direction'] == 'prev')
+    page_sort = [(field, -direction) for field, direction in sort] if backward else list(sort)
+
+    page_query = dict(query)
+    if decoded and len(decoded['values']) == len(sort):
+        branches = []
+        equal: Dict[str, Any] = {}
+        for (field, direction), value in zip(sort, decoded['values']):
+            ascending = (direction == 1) != backward
+            branches.append({**equal, field: {'$gt' if ascending else '$lt': value}})
+            equal[field] = value
+        page_query = {'$and': [query, {'$or': branches}]} if query else {'$or': branches}
+
+    documents = list(collection.find(page_query, projection).sort(page_sort).limit(page_size + 1))
+    has_more = len(documents) > page_size
+    documents = documents[:page_size]
+    if backward:
+        documents.reverse()
+
+    def key_of(document):
+        return [document.get(field) for field, _ in sort]
+
+    next_cursor, previous_cursor = _page_cursors(documents, key_of, decoded, backward, has_more)
+    total_count = collection.count_documents(query) if with_total else None
+    return KeysetPage(documents, next_cursor, previous_cursor, total_count)
@@ -0,0 +1,256 @@
+"""
+Materialized analytics rollups for Smart Grocery Tracker
+
+CategoryRollup holds running per-category inventory totals and
+DailySpendRollup holds spending per category and purchase day.  Every item
+write through GroceryItemManager turns the item's old and new state into
+deltas and applies them with F() increments in the same transaction, so the
+dashboard and analytics read O(categories x days) rows instead of the whole
+inventory.  Writes that bypass the manager can be repaired with
+``manage.py rebuild_rollups``.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger('grocery_app')
+
+# GroceryItem columns that feed the rollups
+ROLLUP_FIELDS = ('id', 'category', 'price', 'quantity', 'last_purchased')
+
+CATEGORY_COUNTERS = ('item_count', 'total_quantity', 'priced_count', 'active_count',
+                     'zero_quantity_count', 'total_value', 'active_value')
+SPEND_COUNTERS = ('purchase_count', 'total_spent')
+
+ItemState = Dict[str, Any]
+
+
+def _models():
+    from .django_models import CategoryRollup, DailySpendRollup, GroceryItem
+    return GroceryItem, CategoryRollup, DailySpendRollup
+
+
+def item_state(item) -> ItemState:
+    """The rollup-relevant fields of a GroceryItem instance"""
+    return {field: getattr(item, field) for field in ROLLUP_FIELDS}
+
+
+def fetch_item_states(ids: Iterable[int]) -> Dict[int, ItemState]:
+    """Rollup-relevant fields for many items, keyed by id, in one query"""
+    GroceryItem, _, _ = _models()
+    return {row['id']: row for row in GroceryItem.objects.filter(id__in=ids).values(*ROLLUP_FIELDS)}
+
+
+def _price(state: ItemState) -> Optional[Decimal]:
+    """Item price as a Decimal (unsaved instances may still hold floats or strings)"""
+    price = state['price']
+    if price is None or price == '':
+        return None
+    return Decimal(str(price))
+
+
+def _category_contribution(state: ItemState) -> Dict[str, Any]:
+    """What one item adds to its category row (same rules as calculate_inventory_statistics)"""
+    price = _price(state)
+    quantity = int(state['quantity'] or 0)
+    priced = price is not None and price > 0
+    value = price * quantity if priced else Decimal('0')
+    return {
+        'item_count': 1,
+        'total_quantity': quantity,
+        'priced_count': int(priced),
+        'active_count': int(priced and quantity > 0),
+        'zero_quantity_count': int(quantity <= 0),
+        'total_value': value,
+        'active_value': value if quantity > 0 else Decimal('0'),
+    }
+
+
+def _spend_contribution(state: ItemState) -> Optional[Tuple[Tuple[str, Any], Dict[str, Any]]]:
+    """((category, day), deltas) for a purchased, priced item; None otherwise"""
+    price = _price(state)
+    # Same rule as utils.calculate_spending_analytics: free items are not purchases
+    if state['last_purchased'] is None or price is None or price <= 0:
+        return None
+    purchased = state['last_purchased']
+    if timezone.is_naive(purchased):
+        # Saved naive datetimes are stored as the default time zone
+        purchased = timezone.make_aware(purchased)
+    day = timezone.localtime(purchased).date()
+    return (state['category'], day), {
+        'purchase_count': 1,
+        'total_spent': price * int(state['quantity'] or 0),
+    }
+
+
+def _accumulate(target: Dict[str, Any], deltas: Dict[str, Any], sign: int) -> None:
+    for field, value in deltas.items():
+        target[field] = target.get(field, 0) + sign * value
+
+
+def _apply(model, lookup: Dict[str, Any], deltas: Dict[str, Any]) -> None:
+    """Add deltas to one rollup row, creating it if needed"""
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    increments = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**lookup).update(updated_at=timezone.now(), **increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another writer created the row first
+        model.objects.filter(**lookup).update(updated_at=timezone.now(), **increments)
+
+
+def apply_item_changes(changes: Iterable[Tuple[Optional[ItemState], Optional[ItemState]]], user=None) -> None:
+    """
+    Apply (old state, new state) pairs to the rollups
+
+    Use None as the old state for a created item and as the new state for a
+    deleted one.  Call inside the transaction that wrote the items.
+    """
+    _, CategoryRollup, DailySpendRollup = _models()
+    category_deltas: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    spend_deltas: Dict[Tuple[str, Any], Dict[str, Any]] = defaultdict(dict)
+
+    for old, new in changes:
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            _accumulate(category_deltas[state['category']], _category_contribution(state), sign)
+            spend = _spend_contribution(state)
+            if spend is not None:
+                key, deltas = spend
+                _accumulate(spend_deltas[key], deltas, sign)
+
+    for category, deltas in category_deltas.items():
+        _apply(CategoryRollup, {'user': user, 'category': category}, deltas)
+    for (category, day), deltas in spend_deltas.items():
+        _apply(DailySpendRollup, {'user': user, 'category': category, 'day': day}, deltas)
+
+
+def rebuild_rollups(item_model=None, category_model=None, spend_model=None) -> Tuple[int, int]:
+    """
+    Recompute the shared inventory's rollups from the GroceryItem table
+
+    The model arguments let migrations pass historical models.
+
+    Returns:
+        (category rows, daily spend rows) written
+    """
+    if item_model is None:
+        item_model, category_model, spend_model = _models()
+
+    value = ExpressionWrapper(F('price') * F('quantity'), output_field=DecimalField(max_digits=20, decimal_places=2))
+    priced = Q(price__gt=0)
+
+    category_rows = item_model.objects.order_by().values('category').annotate(
+        item_count=Count('id'),
+        total_quantity=Sum('quantity'),
+        priced_count=Count('id', filter=priced),
+        active_count=Count('id', filter=priced & Q(quantity__gt=0)),
+        zero_quantity_count=Count('id', filter=Q(quantity__lte=0)),
+        total_value=Sum(value, filter=priced),
+        active_value=Sum(value, filter=priced & Q(quantity__gt=0)),
+    )
+    spend_rows = item_model.objects.filter(
+        last_purchased__isnull=False, price__gt=0
+    ).order_by().annotate(day=TruncDate('last_purchased')).values('category', 'day').annotate(
+        purchase_count=Count('id'),
+        total_spent=Sum(value),
+    )
+
+    with transaction.atomic():
+        category_model.objects.filter(user__isnull=True).delete()
+        spend_model.objects.filter(user__isnull=True).delete()
+        categories = category_model.objects.bulk_create([
+            category_model(user=None, **{field: row[field] or 0 for field in CATEGORY_COUNTERS},
+                           category=row['category'])
+            for row in category_rows
+        ])
+        days = spend_model.objects.bulk_create([
+            spend_model(user=None, category=row['category'], day=row['day'],
+                        **{field: row[field] or 0 for field in SPEND_COUNTERS})
+            for row in spend_rows
+        ])
+    logger.info(f"Rebuilt analytics rollups: {len(categories)} categories, {len(days)} category-days")
+    return len(categories), len(days)
+
+
+def category_stats(user=None) -> List[Dict[str, Any]]:
+    """Per-category counts, same shape as GroceryItemManager.get_categories_stats()"""
+    _, CategoryRollup, _ = _models()
+    return [
+        {'category': row.category, 'count': row.item_count, 'total_quantity': row.total_quantity}
+        for row in CategoryRollup.objects.filter(user=user, item_count__gt=0)
+    ]
+
+
+def consumption_by_category(user=None) -> Dict[str, Dict[str, Any]]:
+    """Average quantity and item count per category"""
+    _, CategoryRollup, _ = _models()
+    return {
+        row.category: {
+            'avg_quantity': round(row.total_quantity / row.item_count, 2),
+            'item_count': row.item_count,
+        }
+        for row in CategoryRollup.objects.filter(user=user, item_count__gt=0)
+    }
+
+
+def inventory_statistics(user=None) -> Dict[str, Any]:
+    """Inventory statistics, same dictionary as utils.calculate_inventory_statistics()"""
+    _, CategoryRollup, _ = _models()
+    totals = defaultdict(int)
+    categories = 0
+    for row in CategoryRollup.objects.filter(user=user, item_count__gt=0):
+        for field in CATEGORY_COUNTERS:
+            totals[field] += getattr(row, field)
+        if row.category:
+            categories += 1
+
+    active_value = float(totals['active_value'])
+    return {
+        'total_items': totals['item_count'],
+        'active_items': totals['active_count'],
+        'total_value': round(float(totals['total_value']), 2),
+        'active_value': round(active_value, 2),
+        'items_with_price': totals['priced_count'],
+        'items_without_price': totals['item_count'] - totals['priced_count'],
+        'zero_quantity_items': totals['zero_quantity_count'],
+        'categories': categories,
+        'average_item_value': round(active_value / totals['active_count'], 2) if totals['active_count'] else 0.0,
+    }
+
+
+def spending_by_category(days: int = 30, user=None) -> List[Dict[str, Any]]:
+    """
+    Spending per category over the last N days, highest first
+
+    Day granularity: the whole first day of the window is included.
+    """
+    _, _, DailySpendRollup = _models()
+    start_day = timezone.localdate() - timedelta(days=days)
+    rows = DailySpendRollup.objects.filter(user=user, day__gte=start_day).order_by().values('category').annotate(
+        spent=Sum('total_spent'),
+        purchases=Sum('purchase_count'),
+    ).filter(purchases__gt=0).order_by('-spent')
+    return [
+        {
+            'total_spent': float(row['spent'] or 0),
+            'item_count': row['purchases'],
+            'avg_price': round(float(row['spent'] or 0) / row['purchases'], 2),
+            'category_name': row['category'],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,262 @@
+"""
+In-memory trigram search index for Smart Grocery Tracker
+
+Every searchable field is broken into trigrams (three-character shingles of
+each word, padded so word starts weigh more) and kept in an inverted index.
+A query is answered by counting shared trigrams over the posting lists of
+its own trigrams, so cost depends on the query and the matches rather than
+on the size of the inventory, and misspellings still share most trigrams
+with the word they were meant to be.
+
+The Django inventory has no owner column, so there is one process-wide
+index for it.  It is built on first use and kept current by applying only
+the rows changed since the last sync whenever the inventory version moves.
+Because the version lives in the database, writes from other processes are
+picked up too.  Deleted rows are found through GroceryItemTombstone, and a
+row count check catches deletes that bypassed GroceryItemManager (admin,
+shell), in which case the index is rebuilt.
+"""
+
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import logging
+import re
+import threading
+
+from django.utils import timezone
+
+from .inventory_cache import get_inventory_version
+
+logger = logging.getLogger('grocery_app')
+
+# Relative importance of a match in each field
+FIELD_WEIGHTS = {
+    'name': 1.0,
+    'brand': 0.8,
+    'category': 0.6,
+    'notes': 0.5,
+}
+
+# Extra credit when the item name itself matches the whole query
+EXACT_NAME_BONUS = 0.5
+PREFIX_NAME_BONUS = 0.3
+SUBSTRING_NAME_BONUS = 0.15
+MAX_SCORE = 1.0 + EXACT_NAME_BONUS
+
+# Share of the query's trigrams a field must contain to count as a match
+MIN_SIMILARITY = 0.3
+
+# Rows updated this close to the last sync are re-read to tolerate clock skew
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones are kept this long; an index last synced before that is rebuilt
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize(text: Any) -> str:
+    """Lowercase and reduce punctuation to single spaces"""
+    if not text:
+        return ''
+    return _NON_WORD.sub(' ', str(text).lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of every word in already-normalized text"""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over documents with a few text fields
+    """
+
+    def __init__(self, fields: Optional[Dict[str, float]] = None):
+        self.fields = fields or FIELD_WEIGHTS
+        self._postings: Dict[str, Set[Any]] = defaultdict(set)
+        self._documents: Dict[Any, Dict[str, Tuple[str, Set[str]]]] = {}
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._documents
+
+    def add(self, doc_id: Any, values: Dict[str, Any]) -> None:
+        """Index a document, replacing any previous version of it"""
+        self.remove(doc_id)
+        document = {}
+        for field in self.fields:
+            text = normalize(values.get(field))
+            grams = trigrams(text)
+            document[field] = (text, grams)
+            for gram in grams:
+                self._postings[gram].add(doc_id)
+        self._documents[doc_id] = document
+
+    def remove(self, doc_id: Any) -> None:
+        """Drop a document from the index"""
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        for _, grams in document.values():
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(doc_id)
+                    if not posting:
+                        del self._postings[gram]
+
+    def doc_ids(self) -> Set[Any]:
+        return set(self._documents)
+
+    def search(self, query: str, limit: int = 10, category: Optional[str] = None,
+               min_similarity: float = MIN_SIMILARITY) -> List[Tuple[Any, float]]:
+        """
+        Rank documents against a query
+
+        Args:
+            query: Search text; typos are tolerated
+            limit: Number of results to return
+            category: Only return documents whose category equals this (case-insensitive)
+            min_similarity: Minimum share of query trigrams a field must contain
+
+        Returns:
+            (doc_id, relevance) pairs, best first; relevance runs from 0 to 100
+        """
+        text = normalize(query)
+        query_grams = trigrams(text)
+        if not query_grams:
+            return []
+
+        # Count shared trigrams per candidate using only the query's posting lists
+        hits = Counter()
+        for gram in query_grams:
+            hits.update(self._postings.get(gram, ()))
+
+        wanted_category = normalize(category) if category else None
+        needed = len(query_grams) * min_similarity
+        scored = []
+        for doc_id, shared in hits.items():
+            if shared < needed:
+                continue
+            document = self._documents[doc_id]
+            if wanted_category is not None and document.get('category', ('', set()))[0] != wanted_category:
+                continue
+            score = self._score(document, text, query_grams, min_similarity)
+            if score > 0:
+                scored.append((score, doc_id))
+
+        best = heapq.nlargest(limit, scored, key=lambda pair: pair[0])
+        return [(doc_id, round(min(score / MAX_SCORE, 1.0) * 100, 1)) for score, doc_id in best]
+
+    def _score(self, document, text, query_grams, min_similarity) -> float:
+        """Best weighted field similarity plus name bonuses"""
+        score = 0.0
+        for field, weight in self.fields.items():
+            field_text, field_grams = document[field]
+            if not field_grams:
+                continue
+            shared = len(query_grams & field_grams)
+            coverage = shared / len(query_grams)
+            if coverage < min_similarity:
+                continue
+            # Mostly "how much of the query is here", partly "how little else is"
+            similarity = 0.7 * coverage + 0.3 * shared / len(query_grams | field_grams)
+            score = max(score, weight * similarity)
+
+        name = document.get('name', ('', set()))[0]
+        if score and name:
+            if name == text:
+                score += EXACT_NAME_BONUS
+            elif name.startswith(text):
+                score += PREFIX_NAME_BONUS
+            elif text in name:
+                score += SUBSTRING_NAME_BONUS
+        return score
+
+
+class GroceryItemSearchIndex:
+    """
+    Trigram index over the Django GroceryItem table, synced by inventory version
+    """
+
+    def __init__(self):
+        self.index = TrigramIndex()
+        self._lock = threading.Lock()
+        self._synced_version = None
+        self._synced_at = None
+
+    def _rows(self, queryset) -> Iterable[Dict[str, Any]]:
+        return queryset.values('id', *FIELD_WEIGHTS)
+
+    def _rebuild(self) -> None:
+        from .django_models import GroceryItem
+
+        index = TrigramIndex()
+        for row in self._rows(GroceryItem.objects.all()):
+            index.add(row['id'], row)
+        self.index = index
+        logger.info(f"Built search index over {len(self.index)} grocery items")
+
+    def _apply_changes(self, since) -> bool:
+        """Apply rows changed and deleted since a time; False if the index no longer matches the table"""
+        from .django_models import GroceryItem, GroceryItemTombstone
+
+        deleted = GroceryItemTombstone.objects.filter(deleted_at__gte=since).values_list('item_id', flat=True)
+        for doc_id in deleted:
+            self.index.remove(doc_id)
+        for row in self._rows(GroceryItem.objects.filter(updated_at__gte=since)):
+            self.index.add(row['id'], row)
+        # Every live row is either indexed already or was just re-read, so a
+        # size mismatch means rows were deleted without leaving a tombstone
+        return GroceryItem.objects.count() == len(self.index)
+
+    def ensure_fresh(self) -> None:
+        """Build the index on first use; afterwards apply rows changed since the last sync"""
+        from .django_models import GroceryItemTombstone
+
+        version = get_inventory_version()
+        if version == self._synced_version:
+            return
+
+        with self._lock:
+            if version == self._synced_version:
+                return
+            started = timezone.now()
+            expired = started - TOMBSTONE_RETENTION
+            if self._synced_at is None or self._synced_at - SYNC_OVERLAP < expired:
+                self._rebuild()
+            elif not self._apply_changes(self._synced_at - SYNC_OVERLAP):
+                logger.warning("Search index out of step with the grocery item table, rebuilding")
+                self._rebuild()
+            GroceryItemTombstone.objects.filter(deleted_at__lt=expired).delete()
+            self._synced_at = started
+            self._synced_version = version
+
+    def search(self, query: str, limit: int = 10, category: Optional[str] = None) -> List[Tuple[int, float]]:
+        """Ranked (item id, relevance) pairs for a query"""
+        self.ensure_fresh()
+        return self.index.search(query, limit=limit, category=category)
+
+
+_grocery_index = None
+_grocery_index_lock = threading.Lock()
+
+
+def get_grocery_search_index() -> GroceryItemSearchIndex:
+    """Get the process-wide GroceryItem search index"""
+    global _grocery_index
+    if _grocery_index is None:
+        with _grocery_index_lock:
+            if _grocery_index is None:
+                _grocery_index = GroceryItemSearchIndex()
+    return _grocery_index
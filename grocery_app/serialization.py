@@ -0,0 +1,122 @@
+"""
+Grocery item serialization for Smart Grocery Tracker
+
+GroceryItem.to_dict() needs a full model instance per row.  List endpoints
+only need a handful of columns, so serialize_values() reads exactly the
+columns of a named field profile with values_list() (one query, no model
+instances, no deferred-field loads) and computes the derived fields for the
+whole batch with a single "today".
+
+Profiles:
+    list    what list pages and APIs show
+    detail  everything to_dict() returns
+    export  stored columns only, for CSV/JSON Lines exports
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.utils import timezone
+
+DETAIL_FIELDS = (
+    'id', 'name', 'category', 'quantity', 'unit', 'price',
+    'expiry_date', 'last_purchased', 'created_at', 'updated_at',
+    'notes', 'barcode', 'brand', 'store', 'nutritional_info',
+    'days_until_expiry', 'is_expiring_soon', 'is_low_stock',
+)
+
+FIELD_PROFILES = {
+    'list': (
+        'id', 'name', 'category', 'quantity', 'unit', 'price', 'expiry_date', 'last_purchased', 'notes',
+        'days_until_expiry', 'is_expiring_soon', 'is_low_stock',
+    ),
+    'detail': DETAIL_FIELDS,
+    'export': (
+        'id', 'name', 'category', 'quantity', 'unit', 'price',
+        'expiry_date', 'last_purchased', 'created_at', 'updated_at',
+        'notes', 'barcode', 'brand', 'store', 'nutritional_info',
+    ),
+}
+
+# Derived fields and the stored columns they are computed from
+DERIVED_FIELDS = {
+    'days_until_expiry': 'expiry_date',
+    'is_expiring_soon': 'expiry_date',
+    'is_low_stock': 'quantity',
+}
+
+EXPIRING_SOON_DAYS = 7
+LOW_STOCK_QUANTITY = 3
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+# Output conversions matching GroceryItem.to_dict()
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    'id': str,
+    'price': lambda value: float(value) if value else None,
+    'expiry_date': _isoformat,
+    'last_purchased': _isoformat,
+    'created_at': _isoformat,
+    'updated_at': _isoformat,
+}
+
+
+def days_until(expiry_date, today: date) -> Optional[int]:
+    """Whole days from today to the expiry date (same rule as GroceryItem.days_until_expiry)"""
+    if expiry_date:
+        return (expiry_date.date() - today).days
+    return None
+
+
+def profile_columns(profile: str) -> Tuple[str, ...]:
+    """Database columns a profile reads, in values_list() order"""
+    columns: List[str] = []
+    for field in FIELD_PROFILES[profile]:
+        column = DERIVED_FIELDS.get(field, field)
+        if column not in columns:
+            columns.append(column)
+    return tuple(columns)
+
+
+def serialize_row(values: Dict[str, Any], fields: Sequence[str], today: date) -> Dict[str, Any]:
+    """Build one output dictionary from stored column values"""
+    data = {}
+    days = None
+    if 'days_until_expiry' in fields or 'is_expiring_soon' in fields:
+        days = days_until(values['expiry_date'], today)
+    for field in fields:
+        if field == 'days_until_expiry':
+            data[field] = days
+        elif field == 'is_expiring_soon':
+            data[field] = days is not None and days <= EXPIRING_SOON_DAYS
+        elif field == 'is_low_stock':
+            data[field] = values['quantity'] <= LOW_STOCK_QUANTITY
+        else:
+            converter = CONVERTERS.get(field)
+            data[field] = converter(values[field]) if converter else values[field]
+    return data
+
+
+def serialize_values(queryset, profile: str = 'list') -> List[Dict[str, Any]]:
+    """Serialize a GroceryItem queryset with one values_list() query"""
+    fields = FIELD_PROFILES[profile]
+    columns = profile_columns(profile)
+    today = timezone.now().date()
+    return [serialize_row(dict(zip(columns, row)), fields, today) for row in queryset.values_list(*columns)]
+
+
+def serialize_instance(item, profile: str = 'detail') -> Dict[str, Any]:
+    """Serialize a loaded GroceryItem (used by GroceryItem.to_dict)"""
+    values = {column: getattr(item, column) for column in profile_columns(profile)}
+    return serialize_row(values, FIELD_PROFILES[profile], timezone.now().date())
+
+
+def serialize_instances(items: Iterable[Any], profile: str = 'detail') -> List[Dict[str, Any]]:
+    """Serialize many loaded GroceryItems against the same reference date"""
+    fields = FIELD_PROFILES[profile]
+    columns = profile_columns(profile)
+    today = timezone.now().date()
+    return [serialize_row({column: getattr(item, column) for column in columns}, fields, today) for item in items]
@@ -1,3 +1,766 @@
-from django.test import TestCase
-
-# Create your tests here.
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from unittest import mock, skipUnless
+
+from accounts.models import EssentialSettings, UserActivityLog
+from bson import ObjectId
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
+
+from . import events, fulltext, json_response, rollups
+from .alert_scanner import start_scanner
+from .async_views import _event_stream
+from .alerts import EXPIRING, LOW_STOCK, alert_counts, alert_items, scan_all
+from .imports import ItemImporter, iter_rows
+from .inventory import InventorySnapshot, get_inventory_snapshot, invalidate_inventory_snapshot
+from .inventory_cache import bump_inventory_version, get_inventory_version
+from .inventory_frame import HAS_NUMPY, InventoryFrame
+from .models import GroceryItem as MongoGroceryItem
+from .mongo_pool import CircuitBreaker, MongoClientRegistry, MongoUnavailable
+from .notifications import user_thresholds
+from .django_models import (
+    AnalyticsModel, CategoryRollup, DailySpendRollup, GroceryItem, GroceryItemManager, InventoryAlert,
+    InventoryAlertScan,
+)
+from .pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, paginate_queryset, parse_page_size,
+)
+from .search_index import GroceryItemSearchIndex
+from .serialization import FIELD_PROFILES, serialize_values
+from .utils import calculate_inventory_statistics, calculate_spending_analytics, calculate_total_value
+
+
+def create_item(**fields):
+    """Create an item through the manager so rollups and caches are maintained"""
+    data = {'name': 'Item', 'category': 'Other', 'quantity': 1, 'unit': 'pieces'}
+    data.update(fields)
+    return int(GroceryItemManager.create(data))
+
+
+@skipUnless(HAS_NUMPY, 'numpy is not installed')
+class InventoryFrameParityTests(TestCase):
+    """The columnar statistics match the pure-Python helpers they replace"""
+
+    def setUp(self):
+        now = timezone.now()
+        create_item(name='Milk', category='Dairy', quantity=2, price=Decimal('1.50'), expiry_date=now + timedelta(days=2))
+        create_item(name='Cheese', category='Dairy', quantity=0, price=Decimal('4.25'))
+        create_item(name='Salt', category='Pantry', quantity=1)
+        create_item(name='Rice', category='Grains', quantity=5, price=Decimal('0.99'), expiry_date=now + timedelta(days=30))
+        self.items = GroceryItemManager.get_all()
+        self.frame = InventoryFrame.from_queryset(GroceryItem.objects.all())
+
+    def test_statistics_match(self):
+        self.assertEqual(self.frame.inventory_statistics(), calculate_inventory_statistics(self.items))
+        for include_zero in (False, True):
+            self.assertEqual(self.frame.total_value(include_zero), calculate_total_value(self.items, include_zero))
+
+    def test_counts_match_snapshot_lists(self):
+        snapshot = InventorySnapshot()
+        self.assertEqual(self.frame.expiring_count(snapshot.now, 7), len(snapshot.expiring(7)))
+        self.assertEqual(self.frame.low_stock_count(1), len(snapshot.low_stock(1)))
+        by_category = lambda stats: sorted(stats, key=lambda entry: entry['category'])
+        self.assertEqual(by_category(snapshot.categories_stats()), by_category(GroceryItemManager.get_categories_stats()))
+
+
+class RollupParityTests(TestCase):
+    """The rollup-backed analytics must agree with the Python reference implementations"""
+
+    def setUp(self):
+        purchased = timezone.now() - timedelta(days=2)
+        create_item(name='Milk', category='Dairy', price=Decimal('3.00'), quantity=2, last_purchased=purchased)
+        create_item(name='Sample', category='Dairy', price=Decimal('0'), quantity=1, last_purchased=purchased)
+        create_item(name='Bread', category='Bakery', price=Decimal('2.50'), quantity=1, last_purchased=purchased)
+        create_item(name='Salt', category='Other', price=None, quantity=1, last_purchased=purchased)
+
+    def reference(self, days=30):
+        return calculate_spending_analytics([item.to_dict() for item in GroceryItem.objects.all()], days)
+
+    def assert_matches_reference(self, days=30):
+        spending = AnalyticsModel.calculate_spending(days)
+        reference = self.reference(days)
+        for field in ('total_spent', 'items_purchased', 'avg_item_cost', 'avg_daily_spending'):
+            self.assertEqual(spending[field], reference[field], field)
+        self.assertEqual(
+            {row['category_name']: (row['total_spent'], row['item_count']) for row in spending['category_breakdown']},
+            {row['category_name']: (row['total_spent'], row['item_count']) for row in reference['category_breakdown']},
+        )
+
+    def test_spending_matches_reference(self):
+        spending = AnalyticsModel.calculate_spending(30)
+        self.assertEqual(spending['items_purchased'], 2)
+        self.assertEqual(spending['avg_item_cost'], 4.25)
+        self.assert_matches_reference()
+
+    def test_free_item_update_keeps_parity(self):
+        sample = GroceryItem.objects.get(name='Sample')
+        GroceryItemManager.update(sample.id, {'price': Decimal('1.25')})
+        self.assert_matches_reference()
+        GroceryItemManager.update(sample.id, {'price': Decimal('0')})
+        self.assert_matches_reference()
+
+    def test_rebuild_matches_incremental(self):
+        incremental = sorted(DailySpendRollup.objects.values_list('category', 'day', 'purchase_count', 'total_spent'))
+        rollups.rebuild_rollups()
+        rebuilt = sorted(DailySpendRollup.objects.values_list('category', 'day', 'purchase_count', 'total_spent'))
+        self.assertEqual(incremental, rebuilt)
+        self.assert_matches_reference()
+
+    def test_shared_rows_are_unique(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CategoryRollup.objects.create(user=None, category='Dairy')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailySpendRollup.objects.create(user=None, category='Bakery', day=timezone.localdate() - timedelta(days=2))
+
+
+def mongo_model(collection):
+    """A MongoDB GroceryItem model bound to the given (fake) collection, without connecting"""
+    model = MongoGroceryItem.__new__(MongoGroceryItem)
+    model.collection = collection
+    return model
+
+
+class BulkActionTests(TestCase):
+    """api_bulk_actions runs a fixed number of queries and reports every requested ID"""
+
+    url = '/api/bulk-actions/'
+
+    def post(self, payload):
+        return self.client.post(self.url, payload, content_type='application/json').json()
+
+    def test_results_follow_request_order(self):
+        kept, gone = create_item(name='Kept'), create_item(name='Gone')
+        response = self.post({'action': 'delete', 'item_ids': [str(gone), 'abc', str(gone + 100)]})
+        self.assertEqual([result['success'] for result in response['results']], [True, False, False])
+        self.assertEqual(list(GroceryItem.objects.values_list('id', flat=True)), [kept])
+
+    def test_query_count_does_not_grow_with_items(self):
+        def queries_for(count):
+            item_ids = [create_item(name=f'Bulk {index}', quantity=5) for index in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post({'action': 'update_quantity', 'item_ids': item_ids, 'quantity': 2})
+            self.assertEqual(response['message'], f'Successfully processed {count} out of {count} items')
+            return len(queries)
+
+        self.assertEqual(queries_for(2), queries_for(8))
+        self.assertFalse(GroceryItem.objects.exclude(quantity=2).exists())
+
+
+class MongoIndexBootstrapTests(SimpleTestCase):
+    """Index creation runs once per process and list reads project away heavy fields"""
+
+    def setUp(self):
+        patcher = mock.patch.object(MongoGroceryItem, '_indexes_ensured', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.collection = mock.Mock()
+
+    def test_creates_indexes_once(self):
+        self.collection.create_indexes.return_value = ['user_updated_idx']
+        self.assertEqual(MongoGroceryItem.ensure_indexes(self.collection), ['user_updated_idx'])
+        self.collection.create_indexes.assert_called_once_with(MongoGroceryItem.INDEXES)
+        self.assertTrue(MongoGroceryItem._indexes_ensured)
+
+    def test_conflicting_index_is_not_retried(self):
+        self.collection.create_indexes.side_effect = OperationFailure('Index with name already exists')
+        self.assertEqual(MongoGroceryItem.ensure_indexes(self.collection), [])
+        self.assertTrue(MongoGroceryItem._indexes_ensured)
+
+    def test_unreachable_server_is_retried(self):
+        self.collection.create_indexes.side_effect = ServerSelectionTimeoutError('down')
+        self.assertEqual(MongoGroceryItem.ensure_indexes(self.collection), [])
+        self.assertFalse(MongoGroceryItem._indexes_ensured)
+
+    def test_list_reads_use_projection(self):
+        self.collection.find.return_value.sort.return_value = []
+        mongo_model(self.collection).get_all(user_id='7')
+        query, projection = self.collection.find.call_args.args
+        self.assertEqual((query['user_id'], projection), ('7', MongoGroceryItem.LIST_PROJECTION))
+        self.assertNotIn('nutritional_info', projection)
+
+
+class MongoBulkWriteTests(TestCase):
+    """bulk_write_items reports exactly which operations were applied"""
+
+    def setUp(self):
+        self.owned = [ObjectId(), ObjectId()]
+        self.collection = mock.Mock()
+        self.collection.find.return_value = [{'_id': self.owned[0]}]
+        self.collection.bulk_write.return_value = mock.Mock(bulk_api_result={'nRemoved': 1})
+
+    def test_only_missing_deletes_fail(self):
+        result = mongo_model(self.collection).bulk_write_items(
+            [{'op': 'delete', 'item_id': str(item_id)} for item_id in self.owned], user_id='7')
+        self.assertEqual([op['success'] for op in result['results']], [True, False])
+        self.assertEqual((result['successful'], result['deleted']), (1, 1))
+        self.assertEqual(self.collection.find.call_args.args[0], {'_id': {'$in': self.owned}, 'user_id': '7'})
+        requests = self.collection.bulk_write.call_args.args[0]
+        self.assertEqual(len(requests), 1)
+
+    def test_non_object_operation_is_reported(self):
+        result = mongo_model(self.collection).bulk_write_items(
+            ['delete', {'op': 'delete', 'item_id': str(self.owned[0])}], user_id='7')
+        self.assertEqual(result['results'][0]['error'], 'Operation must be an object')
+        self.assertTrue(result['results'][1]['success'])
+
+
+class MongoVersionTests(TestCase):
+    """MongoDB writes invalidate only the owning user's caches"""
+
+    def setUp(self):
+        self.item_id = str(ObjectId())
+        self.collection = mock.Mock()
+        self.collection.find_one_and_update.return_value = {'_id': ObjectId(self.item_id), 'user_id': '7'}
+        self.collection.find_one_and_delete.return_value = {'_id': ObjectId(self.item_id), 'user_id': '7'}
+
+    def assert_bumps_owner(self, write):
+        shared, owner = get_inventory_version(), get_inventory_version('7')
+        self.assertTrue(write(mongo_model(self.collection)))
+        self.assertEqual((get_inventory_version(), get_inventory_version('7')), (shared, owner + 1))
+
+    def test_update_bumps_owner_version(self):
+        self.assert_bumps_owner(lambda model: model.update(self.item_id, {'quantity': 2}))
+
+    def test_delete_bumps_owner_version(self):
+        self.assert_bumps_owner(lambda model: model.delete(self.item_id))
+
+    def test_missing_item_bumps_nothing(self):
+        self.collection.find_one_and_delete.return_value = None
+        shared = get_inventory_version()
+        self.assertFalse(mongo_model(self.collection).delete(self.item_id))
+        self.assertEqual(get_inventory_version(), shared)
+
+
+class MongoTextSearchTests(SimpleTestCase):
+    """User input reaches $text as plain words, and prefix matches survive a failed text search"""
+
+    def setUp(self):
+        self.collection = mock.Mock()
+        self.apple = {'_id': ObjectId(), 'name': 'Apple juice', 'score': 1.0}
+        self.collection.find.return_value.sort.return_value.limit.return_value = [self.apple]
+
+    def test_operators_are_stripped(self):
+        model = mongo_model(self.collection)
+        model.search_items('-apple "green tea" --', mode='text')
+        query = self.collection.find.call_args.args[0]
+        self.assertEqual(query['$text'], {'$search': 'apple green tea'})
+
+    def test_only_operators_searches_nothing(self):
+        self.assertEqual(mongo_model(self.collection).search_items('"-"', mode='text'), [])
+        self.collection.find.assert_not_called()
+
+    def test_failed_text_search_keeps_prefix_matches(self):
+        model = mongo_model(self.collection)
+        with mock.patch.object(model, '_text_search', side_effect=OperationFailure('text index required')):
+            items = model.search_items('app')
+        self.assertEqual([item['name'] for item in items], ['Apple juice'])
+
+
+class MealSuggestionTests(TestCase):
+    """Meal suggestions read the request's inventory snapshot like the other views"""
+
+    def test_uses_inventory_snapshot(self):
+        create_item(name='Eggs', category='Dairy', quantity=6)
+        with mock.patch.object(GroceryItemManager, 'get_all') as get_all:
+            response = self.client.get('/api/meal-suggestions/')
+        get_all.assert_not_called()
+        self.assertTrue(response.json()['success'])
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """An open breaker admits exactly one probe at a time once the recovery timeout has passed"""
+
+    def setUp(self):
+        self.registry = MongoClientRegistry()
+        self.registry._breaker = self.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0)
+        self.client = mock.Mock()
+
+    def open_breaker(self):
+        self.breaker.record_failure('down')
+        self.breaker.record_failure('down')
+
+    def test_half_open_admits_single_probe(self):
+        self.open_breaker()
+        self.assertEqual(self.breaker.acquire(), CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(MongoUnavailable):
+            self.breaker.acquire()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.acquire(), CircuitBreaker.CLOSED)
+
+    def test_failed_probe_reopens(self):
+        self.open_breaker()
+        self.client.admin.command.side_effect = ServerSelectionTimeoutError('still down')
+        with self.assertRaises(MongoUnavailable):
+            self.registry.ensure_available(self.client)
+        self.assertEqual(self.breaker.stats()['last_error'], 'still down')
+        self.assertEqual(self.breaker.acquire(), CircuitBreaker.HALF_OPEN)
+
+    def test_unexpected_probe_error_releases_probe(self):
+        self.open_breaker()
+        self.client.admin.command.side_effect = ValueError('bad reply')
+        with self.assertRaises(ValueError):
+            self.registry.ensure_available(self.client)
+        self.assertEqual(self.breaker.acquire(), CircuitBreaker.HALF_OPEN)
+
+    def test_successful_probe_closes(self):
+        self.open_breaker()
+        self.registry.ensure_available(self.client)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class InventorySnapshotTests(TestCase):
+    """One snapshot per request, loaded with a single query however often it is read"""
+
+    def test_snapshot_is_memoized_per_request(self):
+        create_item(name='Eggs', quantity=1)
+        request = RequestFactory().get('/')
+        snapshot = get_inventory_snapshot(request)
+        self.assertIs(get_inventory_snapshot(request), snapshot)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(snapshot.all()), 1)
+            self.assertEqual(len(snapshot.low_stock()), 1)
+            self.assertEqual(snapshot.count(), 1)
+        invalidate_inventory_snapshot(request)
+        self.assertIsNot(get_inventory_snapshot(request), snapshot)
+
+
+class PoolStatsAccessTests(TestCase):
+    """MongoDB pool stats expose connection details, so only staff may read them"""
+
+    url = '/status/mongo-pool/'
+
+    def test_regular_user_is_forbidden(self):
+        self.client.force_login(User.objects.create_user('member'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_staff_can_read(self):
+        self.client.force_login(User.objects.create_user('operator', is_staff=True))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('circuit_breaker', response.json()['pool'])
+
+
+class SerializationTests(TestCase):
+    """List rows come from one values_list() query and match GroceryItem.to_dict()"""
+
+    def setUp(self):
+        now = timezone.now()
+        create_item(name='Milk', category='Dairy', quantity=3, price=Decimal('2.49'), expiry_date=now + timedelta(days=7))
+        create_item(name='Sample', quantity=4, price=Decimal('0'), expiry_date=now - timedelta(days=1))
+        create_item(name='Rice', quantity=0, notes='Basmati', last_purchased=now)
+
+    def test_get_all_is_one_query(self):
+        with self.assertNumQueries(1):
+            items = GroceryItemManager.get_all()
+        self.assertEqual(len(items), 3)
+        with self.assertNumQueries(1):
+            GroceryItemManager.get_all({'category': 'Dairy', 'name': 'mil'})
+
+    def test_list_profile_matches_to_dict(self):
+        fields = FIELD_PROFILES['list']
+        expected = [{field: item.to_dict()[field] for field in fields} for item in GroceryItem.objects.all()]
+        self.assertEqual(GroceryItemManager.get_all(), expected)
+
+    def test_detail_profile_matches_to_dict(self):
+        self.assertEqual(serialize_values(GroceryItem.objects.all(), 'detail'),
+                         [item.to_dict() for item in GroceryItem.objects.all()])
+
+
+class JsonResponseTests(SimpleTestCase):
+    """Every JSON backend encodes our payload types the way the stdlib fallback does"""
+
+    def test_matches_stdlib_encoding(self):
+        payload = {
+            'when': timezone.now(), 'day': timezone.now().date(), 'price': Decimal('2.50'),
+            'oid': ObjectId(), 'uuid': uuid.uuid4(), 'tags': {'fresh'}, 7: 'int key', 'name': 'Café',
+        }
+        expected = json.dumps(payload, default=json_response._default)
+        self.assertEqual(json.loads(json_response.dumps(payload)), json.loads(expected))
+
+    def test_safe_rejects_non_dict(self):
+        with self.assertRaises(TypeError):
+            json_response.JsonResponse([1, 2])
+        response = json_response.JsonResponse([1, 2], safe=False)
+        self.assertEqual((response['Content-Type'], json.loads(response.content)), ('application/json', [1, 2]))
+
+
+class QueryPlanTests(TestCase):
+    """manage.py explain_queries must pass against the migrated schema"""
+
+    def test_hot_queries_use_an_index(self):
+        output = StringIO()
+        call_command('explain_queries', stdout=output)
+        self.assertIn('All GroceryItemManager queries use an index', output.getvalue())
+
+    def test_keyset_pages_cover_every_item_once(self):
+        for index in range(7):
+            create_item(name=f'Item {index % 3}')
+        seen, cursor = [], None
+        while True:
+            page = GroceryItemManager.get_page(cursor=cursor, page_size=3)
+            seen.extend(item['id'] for item in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        expected = [str(item_id) for item_id in GroceryItem.objects.order_by('name', 'id').values_list('id', flat=True)]
+        self.assertEqual(seen, expected)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursors page forward and back over ties without skipping or repeating rows"""
+
+    def setUp(self):
+        for index in range(5):
+            create_item(name='Same', quantity=index)
+        self.queryset = GroceryItem.objects.all()
+
+    def ids(self, page):
+        return [item['id'] for item in page]
+
+    def test_previous_cursor_returns_the_earlier_page(self):
+        first = paginate_queryset(self.queryset, ordering=('-quantity', 'id'), page_size=2)
+        second = paginate_queryset(self.queryset, cursor=first.next_cursor, ordering=('-quantity', 'id'), page_size=2)
+        back = paginate_queryset(self.queryset, cursor=second.previous_cursor, ordering=('-quantity', 'id'), page_size=2)
+        self.assertEqual([item['quantity'] for item in first], [4, 3])
+        self.assertEqual([item['quantity'] for item in second], [2, 1])
+        self.assertEqual(self.ids(back), self.ids(first))
+        self.assertFalse(first.has_previous)
+        self.assertFalse(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_invalid_cursor_starts_over(self):
+        self.assertIsNone(decode_cursor('not-a-cursor'))
+        page = paginate_queryset(self.queryset, cursor='not-a-cursor', page_size=2)
+        self.assertEqual(self.ids(page), self.ids(paginate_queryset(self.queryset, page_size=2)))
+
+    def test_cursor_round_trips_dates_and_object_ids(self):
+        values = [timezone.now(), ObjectId(), 'Milk', 7]
+        self.assertEqual(decode_cursor(encode_cursor(values, 'prev')), {'values': values, 'direction': 'prev'})
+
+    def test_page_size_is_clamped(self):
+        self.assertEqual(parse_page_size('0'), 1)
+        self.assertEqual(parse_page_size('100000'), MAX_PAGE_SIZE)
+        self.assertEqual(parse_page_size('many'), DEFAULT_PAGE_SIZE)
+
+
+class ImportDedupeTests(TestCase):
+    """Bulk imports skip names already in the inventory regardless of case"""
+
+    def run_import(self, text):
+        return ItemImporter(target='sqlite', batch_size=2).run(iter_rows(StringIO(text), 'jsonl'))
+
+    def test_existing_name_matches_case_insensitively(self):
+        create_item(name='Milk', category='Dairy')
+        report = self.run_import('{"name": "milk", "category": "Dairy", "quantity": 1, "unit": "liters"}\n'
+                                 '{"name": "Eggs", "category": "Dairy", "quantity": 12, "unit": "pieces"}\n')
+        self.assertEqual((report['imported'], report['duplicates']), (1, 1))
+        self.assertEqual(sorted(GroceryItem.objects.values_list('name', flat=True)), ['Eggs', 'Milk'])
+
+    def test_duplicates_within_file_across_batches(self):
+        report = self.run_import('{"name": "Bread", "category": "Bakery", "quantity": 1, "unit": "pieces"}\n'
+                                 '{"name": "Rice", "category": "Grains", "quantity": 1, "unit": "kg"}\n'
+                                 '{"name": " BREAD ", "category": "Bakery", "quantity": 2, "unit": "pieces"}\n')
+        self.assertEqual((report['imported'], report['duplicates']), (2, 1))
+
+
+class ImportPipelineTests(TestCase):
+    """Uploads and the import_items command report rejected rows by line and write the rest"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('importer', password='pw-12345678')
+        self.client.force_login(self.user)
+
+    def test_csv_upload_reports_rejected_lines(self):
+        upload = SimpleUploadedFile('receipt.csv', '\ufeffname,category,quantity,unit,price,expiry_date\n'
+                                                   'Milk,Dairy,2,liters,1.99,2030-01-05\n'
+                                                   'Bread,Bakery,lots,pieces,,\n'
+                                                   'Rice,Grains,1,kg,,\n'.encode())
+        response = self.client.post('/api/import/', {'file': upload})
+        report = response.json()['report']
+        self.assertEqual((report['processed'], report['imported'], report['rejected_count']), (3, 2, 1))
+        self.assertEqual(report['rejected'][0]['line'], 3)
+        milk = GroceryItem.objects.get(name='Milk')
+        self.assertEqual((milk.price, milk.expiry_date.year), (Decimal('1.99'), 2030))
+        self.assertTrue(timezone.is_aware(milk.expiry_date))
+        self.assertTrue(UserActivityLog.objects.filter(user=self.user, action='items_imported').exists())
+
+    def test_jsonl_body_rejects_malformed_lines(self):
+        body = '{"name": "Tea", "category": "Beverages", "quantity": 1, "unit": "boxes"}\n[1, 2]\n{oops\n'
+        response = self.client.post('/api/import/?format=jsonl', body, content_type='application/x-ndjson')
+        report = response.json()['report']
+        self.assertEqual((report['imported'], [row['line'] for row in report['rejected']]), (1, [2, 3]))
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.post('/api/import/?format=xml', '<items/>', content_type='application/xml')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(GroceryItem.objects.exists())
+
+    def test_command_imports_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('{"name": "Oats", "category": "Grains", "quantity": 3, "unit": "kg"}\n')
+        self.addCleanup(os.unlink, handle.name)
+        output = StringIO()
+        call_command('import_items', handle.name, stdout=output)
+        self.assertIn('Imported 1 items', output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('import_items', handle.name, target='mongodb')
+
+
+class ConditionalGetTests(TestCase):
+    """Polled inventory APIs answer unchanged requests with 304"""
+
+    url = '/api/notifications/'
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_user('poller', password='pw-12345678'))
+        create_item(name='Milk', quantity=1, expiry_date=timezone.now() + timedelta(days=1))
+
+    def test_unchanged_inventory_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        create_item(name='Eggs')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_validators_do_not_depend_on_the_cache(self):
+        # Another worker process starts with an empty local cache
+        response = self.client.get(self.url)
+        cache.clear()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        create_item(name='Eggs')
+        cache.clear()
+        revalidated = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 200)
+
+
+class AsyncConditionalGetTests(TestCase):
+    """The async analytics view shares the sync view's validators"""
+
+    async def test_async_analytics_not_modified(self):
+        response = await self.async_client.get('/api/analytics/')
+        revalidated = await self.async_client.get('/api/async/analytics/', headers={'if-none-match': response['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+
+
+class EventBusOverflowTests(TestCase):
+    """A subscriber that falls behind drops events and is told to resync"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('laggard')
+
+    async def test_full_queue_flags_overflow(self):
+        subscription = events.bus.subscribe(self.user.id, max_queued=2)
+        self.addCleanup(events.bus.unsubscribe, subscription)
+        for number in range(3):
+            events.bus.publish(events.ITEM_CHANGED, {'number': number}, self.user.id)
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual([event['data']['number'] for event in subscription.drain()], [0, 1])
+
+    async def test_stream_sends_resync_after_overflow(self):
+        config = {**events.event_settings(), 'max_queued': 1, 'long_poll_seconds': 5}
+        with mock.patch.object(events, 'event_settings', return_value=config):
+            stream = _event_stream(self.user, streaming=False)
+            chunks = [await anext(stream), await anext(stream)]
+            for number in range(3):
+                events.bus.publish(events.ITEM_CHANGED, {'number': number}, self.user.id)
+            chunks += [chunk async for chunk in stream]
+        body = b''.join(chunks).decode()
+        self.assertEqual(body.count('event: item'), 1)
+        self.assertIn('event: resync', body)
+        self.assertEqual(events.bus.stats()['subscribers'], 0)
+
+
+class LiveUpdatesTests(TestCase):
+    """Pages only stream events under ASGI; WSGI pages poll the badge counters"""
+
+    # Any page extending base.html carries the live updates flag
+    page = '/accounts/dashboard/'
+
+    def setUp(self):
+        self.user = User.objects.create_user('watcher', password='pw-12345678')
+
+    def test_wsgi_page_polls_badges(self):
+        client = Client()
+        client.force_login(self.user)
+        self.assertContains(client.get(self.page), 'data-live-updates="poll"')
+        response = client.get('/api/badges/')
+        self.assertEqual(response.json()['counts']['total_items_count'], 0)
+        self.assertEqual(client.get('/api/badges/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        create_item(name='Tea')
+        self.assertEqual(client.get('/api/badges/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    async def test_asgi_page_streams(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        self.assertContains(await client.get(self.page), 'data-live-updates="stream"')
+
+
+class ExportStreamingTests(TestCase):
+    """Exports stream under both WSGI and ASGI without buffering the whole file"""
+
+    url = '/export/?dataset=items&format=jsonl'
+
+    def setUp(self):
+        self.user = User.objects.create_user('exporter', password='pw-12345678')
+        for index in range(3):
+            create_item(name=f'Item {index}')
+
+    def test_wsgi_export(self):
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(self.url)
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 3)
+
+    async def test_asgi_export_is_async(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        response = await client.get(self.url)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(b''.join(chunks).splitlines()), 3)
+
+
+class SearchIndexSyncTests(TestCase):
+    """The search index follows writes without re-reading every item ID"""
+
+    def setUp(self):
+        self.milk = create_item(name='Milk', category='Dairy')
+        self.bread = create_item(name='Bread', category='Bakery')
+        self.index = GroceryItemSearchIndex()
+        self.index.ensure_fresh()
+
+    def names(self, query):
+        ids = [doc_id for doc_id, _ in self.index.search(query)]
+        return sorted(GroceryItem.objects.filter(id__in=ids).values_list('name', flat=True))
+
+    def test_deletes_are_applied_from_tombstones(self):
+        GroceryItemManager.bulk_delete([self.milk])
+        create_item(name='Oat Milk', category='Dairy')
+        # Version, tombstones, changed rows, row count and tombstone pruning
+        with self.assertNumQueries(5):
+            self.index.ensure_fresh()
+        self.assertEqual(self.names('milk'), ['Oat Milk'])
+
+    def test_untracked_delete_rebuilds(self):
+        GroceryItem.objects.filter(id=self.bread).delete()
+        bump_inventory_version()
+        self.assertEqual(self.names('bread'), [])
+        self.assertEqual(len(self.index.index), 1)
+
+
+class FullTextTriggerTests(TestCase):
+    """FTS5 sync triggers dropped by a table rebuild are recreated on first use"""
+
+    def setUp(self):
+        if not fulltext.fts_available():
+            self.skipTest('SQLite build without FTS5')
+        self.addCleanup(fulltext._available.clear)
+
+    def test_missing_triggers_are_recreated(self):
+        with connection.cursor() as cursor:
+            for name in fulltext.FTS_TRIGGERS:
+                cursor.execute(f'DROP TRIGGER {name}')
+        item_id = create_item(name='Sourdough')
+        fulltext._available.clear()
+
+        self.assertTrue(fulltext.fts_available())
+        self.assertEqual(fulltext.ensure_fts_triggers(), [])
+        self.assertEqual([item_id for item_id, _ in fulltext.fts_search('sourd')], [item_id])
+
+
+class NotificationThresholdTests(TestCase):
+    """Users without saved settings are notified exactly like users with the defaults"""
+
+    def test_missing_settings_match_saved_defaults(self):
+        saved = User.objects.create_user('saved')
+        missing = User.objects.create_user('missing')
+        EssentialSettings.objects.filter(user=missing).delete()
+        missing = User.objects.get(pk=missing.pk)
+        self.assertEqual(user_thresholds(missing), user_thresholds(saved))
+        self.assertEqual(user_thresholds(None), user_thresholds(saved))
+
+
+class InventoryAlertTests(TestCase):
+    """Alerts are stored once per threshold set and refreshed when the inventory changes"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.default_users = [User.objects.create_user(f'user{index}') for index in range(3)]
+        self.custom_user = User.objects.create_user('custom')
+        EssentialSettings.objects.filter(user=self.custom_user).update(low_stock_threshold=5, expiry_warning_days=7)
+        self.custom_user = User.objects.get(pk=self.custom_user.pk)
+        create_item(name='Yogurt', quantity=4, expiry_date=now + timedelta(days=2, hours=1))
+        create_item(name='Cheese', quantity=9, expiry_date=now + timedelta(days=6, hours=1))
+        create_item(name='Rice', quantity=1)
+
+    def test_alerts_are_shared_per_threshold_set(self):
+        result = scan_all()
+        # The defaults (5, 3), shared by anonymous users and saved settings, and the custom (5, 7)
+        self.assertEqual((result['users'], result['threshold_sets']), (4, 2))
+        self.assertEqual(InventoryAlertScan.objects.count(), 2)
+        self.assertEqual(InventoryAlert.objects.count(), 3 + 4)
+        # Stamp check (scan row, inventory version) and one read, no rescan
+        with self.assertNumQueries(3):
+            self.assertEqual(alert_counts(self.default_users[0])['expiring'], 1)
+        self.assertEqual([item['name'] for item in alert_items(self.custom_user, EXPIRING)], ['Cheese', 'Yogurt'])
+        self.assertEqual([item['name'] for item in alert_items(self.custom_user, [LOW_STOCK])], ['Rice', 'Yogurt'])
+
+    def test_write_refreshes_alerts(self):
+        scan_all()
+        create_item(name='Butter', quantity=0)
+        self.assertEqual(alert_counts(self.default_users[1])[LOW_STOCK], 3)
+
+    def test_next_day_rescan_updates_days(self):
+        scan_all()
+        scan_all(timezone.now() + timedelta(days=1))
+        days = InventoryAlert.objects.filter(item__name='Yogurt', kind__in=EXPIRING).values_list(
+            'days_until_expiry', flat=True)
+        self.assertEqual(set(days), {1})
+
+    def test_unused_threshold_sets_are_dropped(self):
+        scan_all()
+        EssentialSettings.objects.filter(user=self.custom_user).update(expiry_warning_days=3)
+        self.assertEqual(scan_all()['threshold_sets'], 1)
+        self.assertEqual(InventoryAlertScan.objects.count(), 1)
+
+    def test_scanner_is_off_by_default(self):
+        self.assertFalse(start_scanner())
+
+
+class ServerEntryPointTests(SimpleTestCase):
+    """wsgi.py and asgi.py import before DJANGO_SETTINGS_MODULE is set, as servers do"""
+
+    def assert_imports(self, module):
+        env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        result = subprocess.run([sys.executable, '-c', f'import {module}'], env=env, capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent.parent, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_wsgi_imports(self):
+        self.assert_imports('smart_grocery_tracker.wsgi')
+
+    def test_asgi_imports(self):
+        self.assert_imports('smart_grocery_tracker.asgi')
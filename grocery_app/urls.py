@@ -5,7 +5,7 @@ This module defines all the URL patterns for the grocery tracking application.
 """
 
 from django.urls import path
-from . import views, mongodb_views
+from . import views, mongodb_views, async_views
 
 urlpatterns = [
     # Main pages
@@ -20,6 +20,7 @@ urlpatterns = [
     path('mongodb/get/<str:item_id>/', mongodb_views.get_item_mongodb, name='get_item_mongodb'),
     path('mongodb/search/', mongodb_views.search_items_mongodb, name='search_items_mongodb'),
     path('mongodb/analytics/', mongodb_views.analytics_mongodb, name='analytics_mongodb'),
+    path('mongodb/bulk/', mongodb_views.bulk_items_mongodb, name='bulk_items_mongodb'),
 
     # CRUD operations (Original SQLite)
     path('add/', views.add_item, name='add_item'),
@@ -35,13 +36,24 @@ urlpatterns = [
     path('api/meal-suggestions/', views.api_meal_suggestions, name='api_meal_suggestions'),
     path('api/price-comparison/', views.api_price_comparison, name='api_price_comparison'),
 
+    # Async (ASGI) variants of the read-heavy API endpoints
+    path('api/async/search/', async_views.api_search_items_async, name='api_search_async'),
+    path('api/async/suggestions/', async_views.api_get_suggestions_async, name='api_suggestions_async'),
+    path('api/async/analytics/', async_views.api_analytics_async, name='api_analytics_async'),
+    path('api/async/notifications/', async_views.api_notifications_async, name='api_notifications_async'),
+
+    # Live inventory events (server-sent events)
+    path('api/events/', async_views.api_events_stream, name='api_events_stream'),
+
     # Interactive API endpoints
     path('api/quick-edit/<str:item_id>/', views.api_quick_edit, name='api_quick_edit'),
     path('api/quick-delete/<str:item_id>/', views.api_quick_delete, name='api_quick_delete'),
     path('api/bulk-actions/', views.api_bulk_actions, name='api_bulk_actions'),
+    path('api/import/', views.api_import_items, name='api_import_items'),
     path('api/mark-purchased/<str:item_id>/', views.api_mark_purchased, name='api_mark_purchased'),
     path('api/shopping-list/', views.api_shopping_list, name='api_shopping_list'),
     path('api/notifications/', views.api_notifications, name='api_notifications'),
+    path('api/badges/', views.api_badge_counts, name='api_badge_counts'),
 
     # AI-powered features
     path('meal-planner/', views.meal_planner, name='meal_planner'),
@@ -51,6 +63,8 @@ urlpatterns = [
     # Analytics and reports
     path('analytics/', views.analytics, name='analytics'),
     path('reports/', views.reports, name='reports'),
+    path('export/', views.export_data, name='export_data'),
     path('sustainability/', views.sustainability, name='sustainability'),
     path('status/', views.status, name='status'),
+    path('status/mongo-pool/', views.api_mongo_pool_stats, name='api_mongo_pool_stats'),
 ]
@@ -9,6 +9,8 @@ from datetime import datetime, date, timedelta
 from typing import Optional, Union, Dict, Any
 import logging
 
+from .inventory_frame import HAS_NUMPY, InventoryFrame
+
 logger = logging.getLogger('grocery_app')
 
 
@@ -240,6 +242,9 @@ def calculate_total_value(items: list, include_zero_quantity: bool = False) -> f
         Total value as float, rounded to 2 decimal places
     """
     try:
+        if HAS_NUMPY:
+            return InventoryFrame.from_items(items).total_value(include_zero_quantity)
+
         total = 0.0
 
         for item in items:
@@ -291,6 +296,9 @@ def calculate_inventory_statistics(items: list) -> dict:
         Dictionary with inventory statistics
     """
     try:
+        if HAS_NUMPY:
+            return InventoryFrame.from_items(items).inventory_statistics()
+
         stats = {
             'total_items': 0,
             'active_items': 0,
@@ -608,36 +616,100 @@ def validate_grocery_item(item_data: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+def validate_grocery_items(items: list) -> list:
+    """
+    Validate many grocery items at once
+
+    Same rules and messages as validate_grocery_item, applied column by
+    column: each field is read once for the whole batch and repeated date
+    strings (common in receipt dumps) are parsed only once.
+
+    Args:
+        items: List of item dictionaries
+
+    Returns:
+        List of validation results, one per item, in the same order
+    """
+    errors = [[] for _ in items]
+    warnings = [[] for _ in items]
+
+    for field in ('name', 'category', 'quantity', 'unit'):
+        message = f"{field.title()} is required"
+        for index, item in enumerate(items):
+            if not item.get(field):
+                errors[index].append(message)
+
+    for index, item in enumerate(items):
+        try:
+            if int(item.get('quantity', 0)) <= 0:
+                errors[index].append("Quantity must be greater than 0")
+        except (ValueError, TypeError):
+            errors[index].append("Quantity must be a valid number")
+
+    for index, item in enumerate(items):
+        price = item.get('price')
+        if price:
+            try:
+                if float(price) < 0:
+                    errors[index].append("Price cannot be negative")
+            except (ValueError, TypeError):
+                errors[index].append("Price must be a valid number")
+
+    today = date.today()
+    parsed_dates: Dict[str, Optional[datetime]] = {}
+    for index, item in enumerate(items):
+        value = item.get('expiry_date')
+        if not value:
+            continue
+        key = str(value)
+        if key not in parsed_dates:
+            try:
+                parsed_dates[key] = datetime.fromisoformat(key)
+            except (ValueError, TypeError):
+                parsed_dates[key] = None
+        expiry_date = parsed_dates[key]
+        if expiry_date is None:
+            errors[index].append("Invalid expiry date format")
+        elif expiry_date.date() < today:
+            warnings[index].append("Expiry date is in the past")
+
+    return [
+        {'is_valid': not item_errors, 'errors': item_errors, 'warnings': item_warnings}
+        for item_errors, item_warnings in zip(errors, warnings)
+    ]
+
+
 def search_items_fuzzy(items: list, search_term: str, fields: list = None) -> list:
     """
     Perform fuzzy search on grocery items
 
+    Builds a throwaway trigram index over the given items, so misspelled
+    terms still match and results come back best match first.
+
     Args:
         items: List of grocery items
         search_term: Search term
-        fields: Fields to search in (default: name, category, brand)
+        fields: Fields to search in (default: name, brand, category, notes)
 
     Returns:
-        Filtered list of items
+        Matching items ordered by relevance
     """
+    from .search_index import FIELD_WEIGHTS, TrigramIndex
+
     try:
         if not search_term:
             return items
 
         if fields is None:
-            fields = ['name', 'category', 'brand', 'notes']
-
-        search_term = search_term.lower()
-        filtered_items = []
+            weights = FIELD_WEIGHTS
+        else:
+            weights = {field: FIELD_WEIGHTS.get(field, 0.5) for field in fields}
 
-        for item in items:
-            for field in fields:
-                field_value = str(item.get(field, '')).lower()
-                if search_term in field_value:
-                    filtered_items.append(item)
-                    break
+        index = TrigramIndex(weights)
+        for position, item in enumerate(items):
+            index.add(position, item)
 
-        return filtered_items
+        return [items[position] for position, _ in index.search(search_term, limit=len(items))]
 
     except Exception as e:
         logger.error(f"Error in fuzzy search: {e}")
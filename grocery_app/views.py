@@ -6,18 +6,26 @@ Includes CRUD operations, AI-powered features, and analytics.
 """
 
 from django.shortcuts import render, redirect
-from django.http import JsonResponse, HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.handlers.asgi import ASGIRequest
+from django.utils import timezone
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any
 
 from .django_models import GroceryItemManager, AnalyticsModel
+from .alerts import EXPIRING, alert_counts, alert_items, alert_vary_on, cached_badge_counts, ensure_alerts
+from .conditional import inventory_condition
+from .inventory import get_inventory_snapshot
+from .json_response import JsonResponse
+from .notifications import LOW_STOCK, STALE, get_notifications
+from . import rollups
+from .pagination import KeysetPage, paginate_queryset, parse_page_size
 from .ai_features import SmartSuggestions, MealPlanner
 from .utils import format_date, calculate_days_until_expiry
 
@@ -46,14 +54,13 @@ def home(request):
         if show_expiring:
             filters['expiring_soon'] = True
 
-        # Get grocery items with optimized queries
-
-        if search_query:
-            items = GroceryItemManager.search_items(search_query)
-            if category_filter:
-                items = [item for item in items if item.get('category') == category_filter]
-        else:
-            items = GroceryItemManager.get_all(filters=filters)
+        # Fetch only the requested page using keyset pagination
+        page_obj = GroceryItemManager.get_page(
+            filters=filters,
+            cursor=request.GET.get('cursor'),
+            page_size=12,  # Show 12 items per page
+            with_total=True
+        )
 
         # Get categories for filter dropdown
         from .django_models import GroceryItem
@@ -62,21 +69,15 @@ def home(request):
         # Get category statistics
         category_stats = GroceryItemManager.get_categories_stats()
 
-        # Get expiring items count
-        expiring_items = GroceryItemManager.get_expiring_items(days=7)
-        expiring_count = len(expiring_items)
-
-        # Get low stock items
-        low_stock_items = GroceryItemManager.get_low_stock_items(threshold=5)
-        low_stock_count = len(low_stock_items)
-
-        # Pagination
-        paginator = Paginator(items, 12)  # Show 12 items per page
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        # Get expiring and low stock counts from the precomputed alerts
+        counts = alert_counts(request.user)
+        expiring_count = counts['expiring']
+        low_stock_count = counts[LOW_STOCK]
 
         context = {
             'items': page_obj,
+            'next_cursor': page_obj.next_cursor,
+            'previous_cursor': page_obj.previous_cursor,
             'categories': categories,
             'category_stats': category_stats,
             'search_query': search_query,
@@ -84,7 +85,7 @@ def home(request):
             'show_expiring': show_expiring,
             'expiring_count': expiring_count,
             'low_stock_count': low_stock_count,
-            'total_items': len(items)
+            'total_items': page_obj.total_count
         }
 
         return render(request, 'grocery_app/home.html', context)
@@ -249,30 +250,22 @@ def dashboard(request):
     Analytics dashboard with AI-powered insights
     """
     try:
-        # Using GroceryItemManager
         analytics_model = AnalyticsModel()
 
-        # Get basic statistics
-        all_items = GroceryItemManager.get_all()
-        total_items = len(all_items)
-
-        # Get expiring items
-        expiring_items = GroceryItemManager.get_expiring_items(days=7)
+        # Get basic statistics from the analytics rollups
+        inventory_stats = rollups.inventory_statistics()
+        total_items = inventory_stats['total_items']
 
-        # Get low stock items
-        low_stock_items = GroceryItemManager.get_low_stock_items(threshold=5)
+        # Get expiring and low stock items from the precomputed alerts
+        expiring_items = alert_items(request.user, EXPIRING)
+        low_stock_items = alert_items(request.user, [LOW_STOCK])
 
         # Get category statistics
-        category_stats = GroceryItemManager.get_categories_stats()
+        category_stats = rollups.category_stats()
 
         # Get spending analytics
         spending_analytics = analytics_model.get_spending_analytics(days=30)
 
-        # Calculate total value of inventory using improved function
-        from .utils import calculate_total_value, calculate_inventory_statistics
-
-        # Get comprehensive inventory statistics
-        inventory_stats = calculate_inventory_statistics(all_items)
         total_value = inventory_stats['active_value']  # Only count active inventory
 
         # Log inventory statistics for debugging (commented out for production)
@@ -311,30 +304,27 @@ def dashboard(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@inventory_condition()
 def api_analytics(request):
     """
     API endpoint for analytics data
     """
     try:
-        # Using GroceryItemManager
+        # Using the shared request inventory snapshot
         analytics_model = AnalyticsModel()
+        inventory = get_inventory_snapshot(request)
 
-        # Get basic stats
-        all_items = GroceryItemManager.get_all()
-        category_stats = GroceryItemManager.get_categories_stats()
+        # Get basic stats from the analytics rollups
+        category_stats = rollups.category_stats()
         spending_analytics = analytics_model.get_spending_analytics(days=30)
 
-        # Get expiring items by timeframe
-        expiring_today = GroceryItemManager.get_expiring_items(days=0)
-        expiring_week = GroceryItemManager.get_expiring_items(days=7)
-
         return JsonResponse({
             'success': True,
-            'total_items': len(all_items),
+            'total_items': sum(entry['count'] for entry in category_stats),
             'category_stats': category_stats,
             'spending_analytics': spending_analytics,
-            'expiring_today': len(expiring_today),
-            'expiring_week': len(expiring_week)
+            'expiring_today': inventory.expiring_count(days=0),
+            'expiring_week': inventory.expiring_count(days=7)
         })
 
     except Exception as e:
@@ -344,6 +334,7 @@ def api_analytics(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@inventory_condition()
 def api_spending_analytics(request):
     """
     API endpoint for spending analytics with configurable time periods
@@ -356,10 +347,8 @@ def api_spending_analytics(request):
         if days < 1 or days > 365:
             return JsonResponse({'success': False, 'error': 'Days must be between 1 and 365'}, status=400)
 
-        # Get all items and calculate spending analytics
-        from .utils import calculate_spending_analytics
-        all_items = GroceryItemManager.get_all()
-        spending_data = calculate_spending_analytics(all_items, days=days)
+        # Aggregate spending analytics in the database
+        spending_data = AnalyticsModel.calculate_spending(days=days)
 
         return JsonResponse({
             'success': True,
@@ -385,7 +374,7 @@ def api_meal_suggestions(request):
         meal_planner = MealPlanner()
 
         # Get available items
-        available_items = GroceryItemManager.get_all()
+        available_items = get_inventory_snapshot(request).all()
         available_items = [item for item in available_items if item.get('quantity', 0) > 0]
 
         # Get meal suggestions
@@ -441,7 +430,7 @@ def meal_planner(request):
         meal_planner_engine = MealPlanner()
 
         # Get available items
-        available_items = GroceryItemManager.get_all()
+        available_items = get_inventory_snapshot(request).all()
         available_items = [item for item in available_items if item.get('quantity', 0) > 0]
 
         # Get meal suggestions
@@ -471,7 +460,7 @@ def price_comparison(request):
         price_engine = PriceComparison()
 
         # Get all items for comparison
-        all_items = GroceryItemManager.get_all()
+        all_items = get_inventory_snapshot(request).all()
 
         # Get best deals
         deals = price_engine.get_best_deals(all_items)
@@ -499,7 +488,7 @@ def smart_suggestions(request):
         suggestions_engine = SmartSuggestions()
 
         # Get user's data
-        all_items = GroceryItemManager.get_all()
+        all_items = get_inventory_snapshot(request).all()
         current_inventory = [item for item in all_items if item.get('quantity', 0) > 0]
 
         # Generate different types of suggestions
@@ -535,34 +524,30 @@ def analytics(request):
     Advanced analytics page
     """
     try:
-        # Using GroceryItemManager
         analytics_model = AnalyticsModel()
 
-        # Get comprehensive analytics
-        all_items = GroceryItemManager.get_all()
-        category_stats = GroceryItemManager.get_categories_stats()
+        # Get comprehensive analytics from the rollups
+        category_stats = rollups.category_stats()
         spending_analytics = analytics_model.get_spending_analytics(days=30)
 
-        # Calculate additional metrics using improved function
-        from .utils import calculate_total_value, calculate_inventory_statistics
-        inventory_stats = calculate_inventory_statistics(all_items)
+        # Calculate additional metrics
+        inventory_stats = rollups.inventory_statistics()
         total_value = inventory_stats['active_value']
 
         # Get consumption patterns
         from .django_models import GroceryItem
+        consumption = rollups.consumption_by_category()
         consumption_data = []
         for category in [choice[1] for choice in GroceryItem.CATEGORY_CHOICES]:
-            category_items = [item for item in all_items if item.get('category') == category]
-            if category_items:
-                avg_quantity = sum(item.get('quantity', 0) for item in category_items) / len(category_items)
+            if category in consumption:
                 consumption_data.append({
                     'category': category,
-                    'avg_quantity': round(avg_quantity, 2),
-                    'item_count': len(category_items)
+                    'avg_quantity': consumption[category]['avg_quantity'],
+                    'item_count': consumption[category]['item_count']
                 })
 
         context = {
-            'total_items': len(all_items),
+            'total_items': inventory_stats['total_items'],
             'total_value': round(total_value, 2),
             'category_stats': category_stats,
             'spending_analytics': spending_analytics,
@@ -606,7 +591,7 @@ def status(request):
         # Using GroceryItemManager
 
         # Get basic stats for status page
-        all_items = GroceryItemManager.get_all()
+        all_items = get_inventory_snapshot(request).all()
         total_items = len(all_items)
 
         context = {
@@ -625,6 +610,26 @@ def status(request):
         return render(request, 'grocery_app/status.html', context)
 
 
+@login_required
+@require_http_methods(["GET"])
+def api_mongo_pool_stats(request):
+    """
+    MongoDB connection pool configuration and counters for monitoring
+
+    Staff only: the payload includes the breaker's last error text and the
+    (password-redacted) connection URIs with the MongoDB username.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': 'Staff access required'}, status=403)
+
+    try:
+        from .mongo_pool import pool_stats
+        return JsonResponse({'success': True, 'pool': pool_stats()})
+    except Exception as e:
+        logger.error(f"Error getting MongoDB pool stats: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
 # Interactive API Endpoints for Enhanced Functionality
 
 @csrf_exempt
@@ -705,6 +710,110 @@ def api_quick_delete(request, item_id):
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def export_data(request):
+    """
+    Stream the inventory or the user's activity log as CSV or JSON Lines
+
+    Query parameters: dataset=items|activity, format=csv|jsonl,
+    source=sqlite|mongodb (items only).
+    """
+    from .exports import (
+        ACTIVITY_EXPORT_FIELDS, EXPORT_FORMATS, ITEM_EXPORT_FIELDS,
+        activity_rows, aiter_encoded, django_item_rows, encode_rows, mongo_item_rows,
+    )
+
+    dataset = request.GET.get('dataset', 'items')
+    export_format = request.GET.get('format', 'csv')
+    source = request.GET.get('source', 'sqlite')
+
+    if dataset not in ('items', 'activity'):
+        return JsonResponse({'success': False, 'error': 'dataset must be items or activity'}, status=400)
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({'success': False, 'error': 'format must be csv or jsonl'}, status=400)
+    if source not in ('sqlite', 'mongodb'):
+        return JsonResponse({'success': False, 'error': 'source must be sqlite or mongodb'}, status=400)
+
+    try:
+        if dataset == 'activity':
+            rows, fields = activity_rows(request.user), ACTIVITY_EXPORT_FIELDS
+        elif source == 'mongodb':
+            from .models import GroceryItem as MongoGroceryItem
+            # Connect before streaming so connection errors still get a proper status
+            collection = MongoGroceryItem().collection
+            rows, fields = mongo_item_rows(collection, str(request.user.id)), ITEM_EXPORT_FIELDS
+        else:
+            rows, fields = django_item_rows(), ITEM_EXPORT_FIELDS
+    except Exception as e:
+        logger.error(f"Error starting export: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=503)
+
+    from accounts.activity import log_activity
+    log_activity(
+        user=request.user,
+        action='export_data',
+        description=f'Exported {dataset} as {export_format}',
+        metadata={'dataset': dataset, 'format': export_format, 'source': source}
+    )
+
+    filename = f"{dataset}-{timezone.now().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    content = encode_rows(rows, fields, export_format)
+    if isinstance(request, ASGIRequest):
+        # ASGI buffers synchronous iterators; stream chunk by chunk instead
+        content = aiter_encoded(content)
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@csrf_exempt
+@login_required
+@require_http_methods(["POST"])
+def api_import_items(request):
+    """
+    Bulk import grocery items from CSV or JSON Lines
+
+    Send the file as multipart field "file" or as the raw request body.
+    Query/form parameters: format=csv|jsonl (guessed from the file name when
+    omitted), target=sqlite|mongodb, batch_size.
+    """
+    from .imports import DEFAULT_BATCH_SIZE, ItemImporter, detect_format, iter_rows
+
+    upload = request.FILES.get('file')
+    params = request.GET.copy()
+    params.update(request.POST)
+    import_format = params.get('format') or detect_format(upload.name if upload else '')
+    target = params.get('target', 'sqlite')
+
+    if import_format not in ('csv', 'jsonl'):
+        return JsonResponse({'success': False, 'error': 'format must be csv or jsonl'}, status=400)
+    if target not in ('sqlite', 'mongodb'):
+        return JsonResponse({'success': False, 'error': 'target must be sqlite or mongodb'}, status=400)
+    try:
+        batch_size = int(params.get('batch_size', DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'batch_size must be an integer'}, status=400)
+
+    try:
+        importer = ItemImporter(target=target, user_id=str(request.user.id), batch_size=batch_size)
+        report = importer.run(iter_rows(upload.file if upload else request, import_format))
+    except Exception as e:
+        logger.error(f"Error importing items: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    from accounts.activity import log_activity
+    log_activity(
+        user=request.user,
+        action='items_imported',
+        description=f"Imported {report['imported']} items from {import_format}",
+        metadata={'format': import_format, 'target': target, 'imported': report['imported'],
+                  'rejected': report['rejected_count'], 'duplicates': report['duplicates']}
+    )
+
+    return JsonResponse({'success': True, 'report': report})
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def api_bulk_actions(request):
@@ -723,23 +832,14 @@ def api_bulk_actions(request):
         results = []
 
         if action == 'delete':
-            for item_id in item_ids:
-                success = GroceryItemManager.delete(item_id)
-                results.append({'item_id': item_id, 'success': success})
+            results = GroceryItemManager.bulk_delete(item_ids)
 
         elif action == 'mark_purchased':
-            for item_id in item_ids:
-                success = GroceryItemManager.update(item_id, {
-                    'last_purchased': datetime.utcnow(),
-                    'quantity': 0  # Mark as consumed
-                })
-                results.append({'item_id': item_id, 'success': success})
+            results = GroceryItemManager.bulk_mark_purchased(item_ids)
 
         elif action == 'update_quantity':
             new_quantity = data.get('quantity', 0)
-            for item_id in item_ids:
-                success = GroceryItemManager.update(item_id, {'quantity': new_quantity})
-                results.append({'item_id': item_id, 'success': success})
+            results = GroceryItemManager.bulk_update(item_ids, {'quantity': new_quantity})
 
         else:
             return JsonResponse({'success': False, 'error': 'Invalid action'}, status=400)
@@ -804,19 +904,27 @@ def api_shopping_list(request):
         # Using GroceryItemManager
 
         if request.method == 'GET':
-            # Get shopping list (items with quantity > 0)
-            all_items = GroceryItemManager.get_all()
-            shopping_list = [item for item in all_items if item.get('quantity', 0) > 0]
-
-            # Calculate total estimated cost
-            total_cost = sum(item.get('price', 0) * item.get('quantity', 0)
-                           for item in shopping_list if item.get('price'))
+            # Get one page of the shopping list (items with quantity > 0)
+            page = GroceryItemManager.get_page(
+                filters={'in_stock': True},
+                cursor=request.GET.get('cursor'),
+                page_size=parse_page_size(request.GET.get('limit'), default=50)
+            )
+
+            # Calculate totals for the whole list in the database
+            from django.db.models import Count, F, FloatField, Sum
+            from .django_models import GroceryItem
+            totals = GroceryItem.objects.filter(quantity__gt=0).aggregate(
+                total_items=Count('id'),
+                estimated_cost=Sum(F('price') * F('quantity'), output_field=FloatField())
+            )
 
             return JsonResponse({
                 'success': True,
-                'shopping_list': shopping_list,
-                'total_items': len(shopping_list),
-                'estimated_cost': round(total_cost, 2)
+                'shopping_list': page.object_list,
+                'total_items': totals['total_items'],
+                'estimated_cost': round(totals['estimated_cost'] or 0, 2),
+                'pagination': page.to_dict()
             })
 
         elif request.method == 'POST':
@@ -863,80 +971,76 @@ def api_shopping_list(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@inventory_condition(vary_on=alert_vary_on)
 def api_notifications(request):
     """
     API endpoint for getting notifications (expiring items, low stock, etc.)
+
+    Thresholds come from the user's EssentialSettings.
     """
     try:
-        # Using GroceryItemManager
-
-        notifications = []
-
-        # Check for expiring items
-        expiring_today = GroceryItemManager.get_expiring_items(days=0)
-        expiring_soon = GroceryItemManager.get_expiring_items(days=3)
+        return JsonResponse({'success': True, **get_notifications(request.user)})
 
-        for item in expiring_today:
-            notifications.append({
-                'type': 'urgent',
-                'title': 'Item Expiring Today!',
-                'message': f'{item["name"]} expires today',
-                'item_id': item['id'],
-                'action': 'use_now'
-            })
+    except Exception as e:
+        logger.error(f"Error getting notifications: {e}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
-        for item in expiring_soon:
-            if item not in expiring_today:
-                notifications.append({
-                    'type': 'warning',
-                    'title': 'Item Expiring Soon',
-                    'message': f'{item["name"]} expires in {calculate_days_until_expiry(item.get("expiry_date"))} days',
-                    'item_id': item['id'],
-                    'action': 'plan_usage'
-                })
 
-        # Check for low stock items
-        low_stock_items = GroceryItemManager.get_low_stock_items(threshold=2)
-        for item in low_stock_items:
-            notifications.append({
-                'type': 'info',
-                'title': 'Low Stock Alert',
-                'message': f'Only {item["quantity"]} {item["unit"]} of {item["name"]} remaining',
-                'item_id': item['id'],
-                'action': 'restock'
-            })
+@require_http_methods(["GET"])
+@inventory_condition(vary_on=alert_vary_on)
+def api_badge_counts(request):
+    """
+    Navbar badge counters
 
-        # Check for items not purchased in a while
-        all_items = GroceryItemManager.get_all()
-        stale_items = []
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-
-        for item in all_items:
-            last_purchased = item.get('last_purchased')
-            if last_purchased and last_purchased < thirty_days_ago:
-                stale_items.append(item)
-
-        if stale_items:
-            notifications.append({
-                'type': 'suggestion',
-                'title': 'Restock Suggestion',
-                'message': f'{len(stale_items)} items haven\'t been purchased in 30+ days',
-                'action': 'review_list'
-            })
+    Polled by smooth-navbar.js when the page was not served over ASGI and
+    /api/events/ cannot stream; a changed ETag tells the page to resync.
+    """
+    try:
+        if not request.user.is_authenticated:
+            return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
 
-        return JsonResponse({
-            'success': True,
-            'notifications': notifications,
-            'count': len(notifications)
-        })
+        ensure_alerts(request.user)
+        return JsonResponse({'success': True, 'counts': cached_badge_counts(request.user)})
 
     except Exception as e:
-        logger.error(f"Error getting notifications: {e}")
+        logger.error(f"Error getting badge counts: {e}")
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
 # Helper functions for enhanced functionality
 
+def build_suggestions(low_stock_items, stale_items, limit=10):
+    """Top shopping suggestions for the suggestions API (shared by the sync and async views)"""
+    suggestions = []
+
+    for item in low_stock_items:
+        suggestions.append({
+            'name': item['name'],
+            'category': item['category'],
+            'suggested_quantity': max(5, item.get('quantity', 1) * 2),
+            'unit': item['unit'],
+            'reason': f'Running low (only {item.get("quantity", 0)} left)',
+            'priority': 'high'
+        })
+
+    for item in stale_items:
+        suggestions.append({
+            'name': item['name'],
+            'category': item['category'],
+            'suggested_quantity': item.get('quantity', 1),
+            'unit': item['unit'],
+            'reason': 'Haven\'t purchased in 30+ days',
+            'priority': 'medium'
+        })
+
+    # Suggest seasonal items
+    suggestions.extend(get_seasonal_suggestions())
+
+    # Sort by priority and limit results
+    priority_order = {'high': 3, 'medium': 2, 'low': 1}
+    suggestions.sort(key=lambda x: priority_order.get(x.get('priority', 'low'), 1), reverse=True)
+    return suggestions[:limit]
+
 def calculate_days_until_expiry(expiry_date):
     """Calculate days until expiry date"""
     if not expiry_date:
@@ -976,43 +1080,33 @@ def api_search_items(request):
     try:
         query = request.GET.get('q', '').strip()
         category = request.GET.get('category', '')
-        limit = int(request.GET.get('limit', 10))
-
-        # Using GroceryItemManager
+        limit = parse_page_size(request.GET.get('limit'), default=10)
 
-        if not query and not category:
-            # Return all items if no search criteria
-            items = GroceryItemManager.get_all()
-        elif not query:
-            # Filter by category only
-            items = GroceryItemManager.get_all()
-            items = [item for item in items if item.get('category', '').lower() == category.lower()]
+        if query:
+            # Ranked top matches from the search index
+            items = GroceryItemManager.search_items(query, limit=limit, category=category or None)
+            page = KeysetPage(items, total_count=len(items) if request.GET.get('with_total') == '1' else None)
         else:
-            # Search items
-            items = GroceryItemManager.search_items(query)
-
-            # Filter by category if specified
+            # Using GroceryItemManager - filter in the database and fetch a single page
+            queryset = GroceryItemManager.filter_queryset()
             if category:
-                items = [item for item in items if item.get('category', '').lower() == category.lower()]
+                queryset = queryset.filter(category__iexact=category)
 
-        # Limit results
-        items = items[:limit]
-
-        # Add relevance scoring only if there's a query
-        if query:
-            for item in items:
-                item['relevance'] = calculate_relevance(item['name'], query)
-            # Sort by relevance
-            items.sort(key=lambda x: x.get('relevance', 0), reverse=True)
-        else:
-            # Sort by name if no query
-            items.sort(key=lambda x: x.get('name', '').lower())
+            page = paginate_queryset(
+                queryset,
+                cursor=request.GET.get('cursor'),
+                ordering=('name', 'id'),
+                page_size=limit,
+                with_total=request.GET.get('with_total') == '1'
+            )
+            items = page.object_list
 
         return JsonResponse({
             'success': True,
             'items': items,
             'count': len(items),
-            'query': query
+            'query': query,
+            'pagination': page.to_dict()
         })
 
     except Exception as e:
@@ -1020,34 +1114,6 @@ def api_search_items(request):
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
-def calculate_relevance(item_name, query):
-    """Calculate relevance score for search results"""
-    item_name_lower = item_name.lower()
-    query_lower = query.lower()
-
-    # Exact match gets highest score
-    if item_name_lower == query_lower:
-        return 100
-
-    # Starts with query gets high score
-    if item_name_lower.startswith(query_lower):
-        return 80
-
-    # Contains query gets medium score
-    if query_lower in item_name_lower:
-        return 60
-
-    # Word match gets lower score
-    query_words = query_lower.split()
-    item_words = item_name_lower.split()
-
-    matches = sum(1 for word in query_words if any(word in item_word for item_word in item_words))
-    if matches > 0:
-        return 40 + (matches * 10)
-
-    return 0
-
-
 @csrf_exempt
 @require_http_methods(["GET"])
 def api_get_suggestions(request):
@@ -1055,50 +1121,12 @@ def api_get_suggestions(request):
     Enhanced suggestions API with AI-powered recommendations
     """
     try:
-        # Using GroceryItemManager
-
-        # Get all items for analysis
-        all_items = GroceryItemManager.get_all()
-
-        suggestions = []
-
-        # Suggest items that are running low
-        low_stock_items = GroceryItemManager.get_low_stock_items(threshold=3)
-        for item in low_stock_items:
-            suggestions.append({
-                'name': item['name'],
-                'category': item['category'],
-                'suggested_quantity': max(5, item.get('quantity', 1) * 2),
-                'unit': item['unit'],
-                'reason': f'Running low (only {item.get("quantity", 0)} left)',
-                'priority': 'high'
-            })
-
-        # Suggest items that haven't been purchased recently
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        for item in all_items:
-            last_purchased = item.get('last_purchased')
-            if last_purchased and last_purchased < thirty_days_ago:
-                suggestions.append({
-                    'name': item['name'],
-                    'category': item['category'],
-                    'suggested_quantity': item.get('quantity', 1),
-                    'unit': item['unit'],
-                    'reason': 'Haven\'t purchased in 30+ days',
-                    'priority': 'medium'
-                })
-
-        # Suggest seasonal items
-        seasonal_suggestions = get_seasonal_suggestions()
-        suggestions.extend(seasonal_suggestions)
-
-        # Sort by priority and limit results
-        priority_order = {'high': 3, 'medium': 2, 'low': 1}
-        suggestions.sort(key=lambda x: priority_order.get(x.get('priority', 'low'), 1), reverse=True)
+        # Suggest items that are running low or haven't been purchased recently
+        suggestions = build_suggestions(alert_items(request.user, [LOW_STOCK]), alert_items(request.user, [STALE]))
 
         return JsonResponse({
             'success': True,
-            'suggestions': suggestions[:10]  # Limit to top 10
+            'suggestions': suggestions
         })
 
     except Exception as e:
@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from grocery_app.alert_scanner import start_scanner
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'smart_grocery_tracker.settings')
 
 application = get_asgi_application()
+
+# Precompute inventory alerts in the background when enabled (see grocery_app.alert_scanner)
+start_scanner()
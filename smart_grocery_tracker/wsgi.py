@@ -11,6 +11,23 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from grocery_app.alert_scanner import start_scanner
+from grocery_app.mongo_pool import reset_after_fork
+
+try:
+    from uwsgidecorators import postfork
+except ImportError:
+    postfork = None
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'smart_grocery_tracker.settings')
 
 application = get_wsgi_application()
+
+# Precompute inventory alerts in the background when enabled (see grocery_app.alert_scanner)
+start_scanner()
+
+# uWSGI forks workers from C, which skips os.register_at_fork handlers, so
+# drop MongoDB clients inherited from the master explicitly.  (gunicorn uses
+# os.fork and is covered by grocery_app.mongo_pool itself.)
+if postfork is not None:
+    postfork(reset_after_fork)
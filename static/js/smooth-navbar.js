@@ -35,6 +35,7 @@ class SmoothNavbar {
         this.setupDropdownThemeToggle();
         this.setupFloatingLogout();
         this.setupSettingsNavigation();
+        this.setupLiveUpdates();
 
         // Set initial active tab
         this.setActiveTab();
@@ -691,7 +692,83 @@ class SmoothNavbar {
         });
     }
 
+    setupLiveUpdates() {
+        // Live inventory updates: pushed over server-sent events when the page was
+        // served over ASGI, otherwise polled (a WSGI worker can't hold a stream open)
+        if (!document.querySelector('.user-dropdown')) return;
+
+        if (document.body.dataset.liveUpdates === 'stream' && window.EventSource) {
+            this.streamLiveUpdates();
+        } else {
+            this.pollLiveUpdates(parseInt(document.body.dataset.liveUpdatesPollMs, 10) || 60000);
+        }
+    }
+
+    applyBadgeCounts(counts) {
+        Object.entries(counts).forEach(([name, count]) => {
+            document.querySelectorAll(`[data-badge="${name}"]`).forEach(badge => {
+                if (badge.textContent.trim() !== String(count)) {
+                    SmoothNavUtils.updateBadgeCount(badge, count);
+                }
+            });
+        });
+    }
+
+    streamLiveUpdates() {
+        this.eventSource = new EventSource('/api/events/');
+
+        // Badge counters
+        this.eventSource.addEventListener('badges', (e) => {
+            this.applyBadgeCounts(JSON.parse(e.data).counts);
+        });
+
+        // Re-dispatch item changes, expiry alerts and resync requests for page scripts
+        ['item', 'expiry', 'resync'].forEach(type => {
+            this.eventSource.addEventListener(type, (e) => {
+                window.dispatchEvent(new CustomEvent(`inventory:${type}`, { detail: JSON.parse(e.data) }));
+            });
+        });
+
+        window.addEventListener('beforeunload', () => this.eventSource.close());
+    }
+
+    pollLiveUpdates(interval) {
+        // /api/badges/ answers 304 while the inventory is unchanged; a new ETag
+        // means something changed, so page scripts are told to resync
+        let etag = null;
+        const poll = async () => {
+            if (document.hidden) return;
+            try {
+                const response = await fetch('/api/badges/', {
+                    headers: etag ? { 'If-None-Match': etag } : {},
+                    cache: 'no-store'
+                });
+                if (response.status !== 200) return;
+
+                const data = await response.json();
+                const changed = etag !== null;
+                etag = response.headers.get('ETag');
+                this.applyBadgeCounts(data.counts);
+                if (changed) {
+                    window.dispatchEvent(new CustomEvent('inventory:resync', { detail: {} }));
+                }
+            } catch (error) {
+                console.warn('Live update poll failed:', error);
+            }
+        };
+
+        poll();
+        this.pollTimer = setInterval(poll, interval);
+    }
+
     destroy() {
+        if (this.eventSource) {
+            this.eventSource.close();
+        }
+        if (this.pollTimer) {
+            clearInterval(this.pollTimer);
+        }
+
         // Clean up event listeners if needed
         this.navLinks.forEach(link => {
             link.replaceWith(link.cloneNode(true));
@@ -319,8 +319,14 @@ function setupGlobalErrorHandling() {
 }
 
 function initializeRealTimeFeatures() {
-    // Removed auto-refresh for better performance
-    // Data will refresh on user actions instead
+    // Refresh when the server pushes inventory changes (see smooth-navbar.js)
+    window.addEventListener('inventory:item', refreshPageData);
+    window.addEventListener('inventory:resync', refreshPageData);
+    window.addEventListener('inventory:expiry', (e) => {
+        if (WORKING_MODE.notifications) {
+            displayNotifications([e.detail]);
+        }
+    });
 }
 
 function refreshPageData() {